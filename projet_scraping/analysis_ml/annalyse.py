@@ -1,8 +1,11 @@
+import html
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
 from sklearn.linear_model import LinearRegression
+from forecasting import get_forecast_cache, counts_fingerprint
+from search_index import get_search_index
 
 # Configuration
 st.set_page_config(layout="wide", page_title="Dashboard du Marché de l'Emploi")
@@ -31,6 +34,9 @@ df.to_csv(cleaned_path, index=False)
 # 🔢 Nb d'offres par secteur et année
 annonces_par_annee = df.groupby(['Annee', 'Secteur']).size().reset_index(name='Nb_Annonces')
 
+# 🗃️ Cache des prédictions, conservé entre les réexécutions du script
+forecast_cache = get_forecast_cache()
+
 # 📊 Mise en page
 col1, col2 = st.columns([1.3, 1.2])
 
@@ -118,12 +124,18 @@ with col2:
 
         if st.button("Lancer la prédiction"):
             data_sec = annonces_par_annee[annonces_par_annee['Secteur'] == secteur_choisi]
-            X = data_sec[['Annee']]
-            y = data_sec['Nb_Annonces']
 
-            model = LinearRegression()
-            model.fit(X, y)
-            pred = model.predict([[annee_cible]])
+            # Prédiction servie par le cache tant que les données n'ont pas changé
+            version_donnees = counts_fingerprint(annonces_par_annee)
+            pred = forecast_cache.get(version_donnees, secteur_choisi, annee_cible, 'LinearRegression')
+            if pred is None:
+                X = data_sec[['Annee']]
+                y = data_sec['Nb_Annonces']
+
+                model = LinearRegression()
+                model.fit(X, y)
+                pred = model.predict([[annee_cible]])
+                forecast_cache.put(version_donnees, secteur_choisi, annee_cible, 'LinearRegression', pred)
             st.success(f"📈 Nombre d'offres prévues en {annee_cible} pour '{secteur_choisi}' : {int(pred[0])}")
 
             fig2, ax2 = plt.subplots(figsize=(6, 4))
@@ -147,33 +159,58 @@ st.subheader("🔎 Rechercher une offre d'emploi")
 
 search_term = st.text_input("Entrez un mot-clé du poste")
 if st.button("Rechercher des offres d'emploi"):
-    filtered_offres = df[df['Poste'].str.contains(search_term, case=False, na=False)] if search_term else df
-
-    if filtered_offres.empty:
+    # La recherche est mémorisée pour rester affichée lors du changement de page
+    st.session_state['recherche'] = search_term
+    st.session_state['page_resultats'] = 1
+
+if 'recherche' in st.session_state:
+    # Index inversé (poste, entreprise, compétences), reconstruit seulement si les données changent
+    search_index = get_search_index(df)
+    resultats_par_page = 20
+    positions, _, total = search_index.search(
+        st.session_state['recherche'],
+        page=st.session_state.get('page_resultats', 1),
+        per_page=resultats_par_page
+    )
+
+    if total == 0:
         st.info("Aucune offre trouvée pour cette recherche.")
     else:
-        st.write("### Résultats :")
-        st.markdown("""<style>
-            .offer-list {
+        nb_pages = (total - 1) // resultats_par_page + 1
+        st.write(f"### Résultats : {total:,} offre(s)")
+        # La page courante est celle du sélecteur ci-dessous (clé partagée avec la recherche)
+        st.number_input("Page", min_value=1, max_value=nb_pages, key='page_resultats')
+
+        # Une seule page de résultats, rendue en un seul appel
+        page_offres = df.iloc[positions]
+        items = ''.join(
+            f'<li class="offer-item">{html.escape(str(poste))}'
+            + (f' — <i>{html.escape(str(entreprise))}</i>' if pd.notna(entreprise) else '')
+            + '</li>'
+            for poste, entreprise in zip(
+                page_offres['Poste'],
+                page_offres['Entreprise'] if 'Entreprise' in page_offres.columns else [None] * len(page_offres)
+            )
+        )
+        st.markdown(f"""<style>
+            .offer-list {{
                 list-style-type: none;
                 padding: 0;
-            }
-            .offer-item {
+            }}
+            .offer-item {{
                 background-color: #f1f1f1;
                 padding: 10px;
                 border-radius: 5px;
                 margin-bottom: 5px;
                 font-size: 16px;
                 color: #333;
-            }
-            .offer-item:hover {
+            }}
+            .offer-item:hover {{
                 background-color: #e1e1e1;
-            }
-        </style>""", unsafe_allow_html=True)
-        st.markdown('<ul class="offer-list">', unsafe_allow_html=True)
-        for _, row in filtered_offres.iterrows():
-            st.markdown(f'<li class="offer-item">{row["Poste"]}</li>', unsafe_allow_html=True)
-        st.markdown('</ul>', unsafe_allow_html=True)
+            }}
+        </style>
+        <ul class="offer-list">{items}</ul>""", unsafe_allow_html=True)
 
+        filtered_offres = df.iloc[search_index.search_all(st.session_state['recherche'])]
         csv = filtered_offres.to_csv(index=False)
         st.download_button("📥 Télécharger les offres filtrées", csv, "filtered_jobs.csv")
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import pickle
+import hashlib
+import threading
+import numpy as np
+
+# Dossier des catalogues (profils, filières, base de compétences)
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalogs')
+
+# Version du format compilé (à incrémenter si la structure de Catalog change)
+CATALOG_VERSION = 1
+
+# Champ contenant les compétences de chaque entrée, par catalogue (None : l'entrée est la liste)
+SKILLS_FIELDS = {
+    'job_profiles': 'skills_required',
+    'university_programs': 'skills_developed',
+    'skills_database': None
+}
+
+# Catalogues déjà chargés dans ce processus
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+class Catalog:
+    """Catalogue compilé : données internées, vocabulaire de compétences et identifiants entiers"""
+
+    def __init__(self, name, data, signature):
+        self.name = name
+        self.signature = signature
+        self.data = _intern(data)
+
+        # Vocabulaire des compétences normalisées (ordre de première apparition) et identifiants
+        skills_field = SKILLS_FIELDS.get(name)
+        self.skill_ids = {}
+        self.entry_skill_ids = {}
+        for entry_name, entry in self.data.items():
+            skills = entry if skills_field is None else entry.get(skills_field, [])
+            ids = [
+                self.skill_ids.setdefault(skill, len(self.skill_ids))
+                for skill in dict.fromkeys(sys.intern(skill.lower()) for skill in skills)
+            ]
+            self.entry_skill_ids[entry_name] = np.array(ids, dtype=np.int32)
+        self.skill_vocabulary = list(self.skill_ids)
+
+    def copy_data(self):
+        """Copie des données propre à une instance : le catalogue partagé n'est jamais modifié
+        (les chaînes internées restent partagées, seuls les dictionnaires et listes sont copiés)"""
+        return _copy(self.data)
+
+
+def _intern(value):
+    """Interne récursivement les chaînes d'une structure JSON (clés et valeurs)"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    if isinstance(value, dict):
+        return {sys.intern(key): _intern(item) for key, item in value.items()}
+    return value
+
+
+def _copy(value):
+    """Copie récursive d'une structure JSON (dictionnaires et listes)"""
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+def get_catalog_paths(name):
+    """Retourne les chemins du catalogue source (JSON) et de sa forme compilée"""
+    return os.path.join(CATALOG_DIR, f'{name}.json'), os.path.join(CATALOG_DIR, f'{name}.bin')
+
+
+def compile_catalog(name):
+    """Compile un catalogue JSON en fichier binaire et retourne le catalogue compilé"""
+    json_path, compiled_path = get_catalog_paths(name)
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+
+    signature = hashlib.sha1(raw).hexdigest()
+    catalog = Catalog(name, json.loads(raw.decode('utf-8')), signature)
+
+    try:
+        tmp_path = compiled_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            payload = {'version': CATALOG_VERSION, 'stamp': _source_stamp(json_path), 'catalog': catalog}
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, compiled_path)
+    except OSError as e:
+        # La forme compilée n'est qu'un cache : le catalogue reste utilisable
+        print(f"Impossible d'écrire le catalogue compilé {compiled_path}: {e}")
+
+    return catalog
+
+
+def _source_stamp(json_path):
+    stat = os.stat(json_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_catalog(name):
+    """Charge un catalogue une seule fois par processus, recompilé si le JSON source a changé"""
+    json_path, compiled_path = get_catalog_paths(name)
+    stamp = _source_stamp(json_path)
+
+    with _catalogs_lock:
+        cached = _catalogs.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        catalog = None
+        if os.path.exists(compiled_path):
+            try:
+                with open(compiled_path, 'rb') as f:
+                    payload = pickle.load(f)
+                if payload.get('version') == CATALOG_VERSION:
+                    catalog = payload['catalog']
+                    # JSON touché depuis la compilation : ne recompiler que si son contenu a changé
+                    if tuple(payload.get('stamp', ())) != stamp:
+                        with open(json_path, 'rb') as f:
+                            if hashlib.sha1(f.read()).hexdigest() != catalog.signature:
+                                catalog = None
+            except Exception as e:
+                print(f"Catalogue compilé illisible, recompilation en cours: {e}")
+
+        if catalog is None:
+            catalog = compile_catalog(name)
+
+        _catalogs[name] = (stamp, catalog)
+        return catalog
+
+
+# Index dérivés des catalogues, partagés par toutes les instances d'une même classe
+_shared_states = {}
+
+
+def attach_shared_state(instance, catalog, build):
+    """Attache à une instance les attributs construits par `build`, calculés une seule fois
+    par classe et par version du catalogue (l'instanciation suivante est en O(1))"""
+    key = (type(instance).__name__, catalog.name, catalog.signature)
+    state = _shared_states.get(key)
+    if state is None:
+        before = set(vars(instance))
+        build(catalog)
+        state = {name: value for name, value in vars(instance).items() if name not in before}
+        with _catalogs_lock:
+            _shared_states[key] = state
+    else:
+        vars(instance).update(state)
@@ -0,0 +1,268 @@
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+
+# Version du format du magasin colonnaire (à incrémenter si le schéma change)
+STORE_VERSION = 1
+
+# Colonnes stockées en catégories (peu de valeurs distinctes, beaucoup de répétitions)
+CATEGORICAL_COLUMNS = ['Secteur', 'Ville', 'Contrat', 'Niveau_Etude']
+
+# Colonne contenant les compétences déjà découpées en liste
+SKILLS_LIST_COLUMN = 'Competences_Liste'
+
+# Colonnes identifiant une offre, comparées pour retrouver les lignes d'un sous-ensemble
+ROW_KEY_COLUMNS = ['Id', 'Lien', 'Competences']
+
+try:
+    import pyarrow  # noqa: F401
+    STORE_FORMAT = 'parquet'
+except ImportError:
+    # Sans pyarrow, on se rabat sur le format pickle natif de pandas
+    STORE_FORMAT = 'pickle'
+
+# Registre des jeux de données chargés : un seul exemplaire par processus,
+# partagé entre toutes les sessions Streamlit
+_dataset_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_store_paths(csv_path):
+    """Retourne les chemins du magasin colonnaire et de ses métadonnées pour un CSV source"""
+    base, _ = os.path.splitext(csv_path)
+    extension = '.parquet' if STORE_FORMAT == 'parquet' else '.pkl'
+    return base + extension, base + '.store.json'
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Calcule l'empreinte SHA-1 d'un fichier par blocs"""
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def source_signature(csv_path):
+    """Retourne la signature (mtime, taille) du fichier source"""
+    stat = os.stat(csv_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def split_skills(skills):
+    """Découpe la colonne des compétences en listes de compétences nettoyées"""
+    return skills.map(
+        lambda s: [skill.strip() for skill in s.split(',')] if isinstance(s, str) else []
+    )
+
+
+def prepare_dataframe(df):
+    """Applique le prétraitement typé des offres (nombres, dates, catégories, compétences)"""
+    df['Experience'] = pd.to_numeric(df['Experience'], errors='coerce')
+    df['Date_De_Publication'] = pd.to_datetime(df['Date_De_Publication'], errors='coerce')
+    df['Annee'] = df['Date_De_Publication'].dt.year
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    if 'Competences' in df.columns:
+        df[SKILLS_LIST_COLUMN] = split_skills(df['Competences'])
+
+    return df
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _read_store(store_path):
+    if STORE_FORMAT == 'parquet':
+        return pd.read_parquet(store_path)
+    return pd.read_pickle(store_path)
+
+
+def _write_store(df, store_path):
+    tmp_path = store_path + '.tmp'
+    if STORE_FORMAT == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, store_path)
+
+
+def build_store(csv_path):
+    """Construit le magasin colonnaire à partir du CSV source et retourne le DataFrame typé"""
+    store_path, meta_path = get_store_paths(csv_path)
+
+    df = prepare_dataframe(pd.read_csv(csv_path))
+
+    try:
+        _write_store(df, store_path)
+        meta = source_signature(csv_path)
+        meta.update({'sha1': file_hash(csv_path), 'version': STORE_VERSION, 'format': STORE_FORMAT})
+        _write_meta(meta_path, meta)
+    except OSError as e:
+        # Le magasin n'est qu'un cache : une erreur d'écriture ne doit pas bloquer le chargement
+        print(f"Impossible d'écrire le magasin colonnaire {store_path}: {e}")
+
+    return df
+
+
+def is_store_fresh(csv_path):
+    """Vérifie si le magasin colonnaire correspond encore au CSV source"""
+    store_path, meta_path = get_store_paths(csv_path)
+    meta = _read_meta(meta_path)
+
+    if meta is None or not os.path.exists(store_path):
+        return False
+    if meta.get('version') != STORE_VERSION or meta.get('format') != STORE_FORMAT:
+        return False
+
+    signature = source_signature(csv_path)
+    if meta.get('mtime_ns') == signature['mtime_ns'] and meta.get('size') == signature['size']:
+        return True
+
+    # Le fichier a été touché : on ne reconstruit que si son contenu a réellement changé
+    if meta.get('size') == signature['size'] and meta.get('sha1') == file_hash(csv_path):
+        meta.update(signature)
+        try:
+            _write_meta(meta_path, meta)
+        except OSError:
+            pass
+        return True
+
+    return False
+
+
+def load_store(csv_path):
+    """Charge les offres depuis le magasin colonnaire, reconstruit si le CSV source a changé"""
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+
+    if is_store_fresh(csv_path):
+        store_path, _ = get_store_paths(csv_path)
+        try:
+            return _read_store(store_path)
+        except Exception as e:
+            print(f"Magasin colonnaire illisible, reconstruction en cours: {e}")
+
+    return build_store(csv_path)
+
+
+def _dataset_version(csv_path):
+    """Construit l'identifiant de version d'un jeu de données à partir de sa source"""
+    try:
+        signature = source_signature(csv_path)
+    except FileNotFoundError:
+        return None
+    return f"{os.path.abspath(csv_path)}:{signature['mtime_ns']}:{signature['size']}"
+
+
+def get_dataset(csv_path, loader=load_store):
+    """Retourne une vue du jeu de données partagé, rechargé seulement si la source a changé"""
+    key = os.path.abspath(csv_path)
+    version = _dataset_version(csv_path)
+
+    with _registry_lock:
+        entry = _dataset_registry.get(key)
+        if entry is None or version is None or entry['version'] != version:
+            df = loader(csv_path)
+            # Le chargeur a pu (re)générer le fichier source : relire sa version
+            version = _dataset_version(csv_path)
+            df.attrs['dataset_version'] = version
+            entry = {'version': version, 'data': df, 'derived': {}}
+            _dataset_registry[key] = entry
+
+    # Copie superficielle : les pages peuvent ajouter des colonnes sans dupliquer les données partagées
+    return entry['data'].copy(deep=False)
+
+
+def get_dataset_version(df):
+    """Retourne la version du jeu de données partagé dont provient un DataFrame"""
+    return df.attrs.get('dataset_version')
+
+
+def invalidate_dataset(csv_path=None):
+    """Invalide un jeu de données du registre (ou tous si aucun chemin n'est donné)"""
+    with _registry_lock:
+        if csv_path is None:
+            _dataset_registry.clear()
+        else:
+            _dataset_registry.pop(os.path.abspath(csv_path), None)
+
+
+def _entry_for(df):
+    """Retourne l'entrée du registre correspondant à la version d'un DataFrame"""
+    version = get_dataset_version(df)
+    if version is None:
+        return None
+    with _registry_lock:
+        for entry in _dataset_registry.values():
+            if entry['version'] == version:
+                return entry
+    return None
+
+
+def get_derived(df, name, builder):
+    """Retourne un objet dérivé du jeu de données partagé, calculé une seule fois par version"""
+    entry = _entry_for(df)
+    if entry is None:
+        return None
+
+    derived = entry['derived']
+    if name not in derived:
+        value = builder(entry['data'])
+        with _registry_lock:
+            derived.setdefault(name, value)
+    return derived[name]
+
+
+def _row_hashes(entry, columns):
+    """Empreintes (une par ligne) des colonnes d'identification du jeu partagé, calculées une fois"""
+    key = ('row_hashes', tuple(columns))
+    derived = entry['derived']
+    if key not in derived:
+        value = pd.util.hash_pandas_object(entry['data'][columns], index=False).to_numpy()
+        with _registry_lock:
+            derived.setdefault(key, value)
+    return derived[key]
+
+
+def get_row_positions(df):
+    """Retourne les positions des lignes d'un DataFrame dans le jeu partagé dont il est extrait
+
+    L'index doit désigner des lignes du jeu partagé ; toutes les lignes sont vérifiées sur
+    leurs colonnes d'identification (un index réinitialisé ou réordonné donne None)."""
+    entry = _entry_for(df)
+    if entry is None or not pd.api.types.is_integer_dtype(df.index):
+        return None
+
+    base = entry['data']
+    positions = np.asarray(df.index, dtype=np.int64)
+    if len(positions) == 0:
+        return positions
+    if positions.min() < 0 or positions.max() >= len(base):
+        return None
+
+    columns = [col for col in ROW_KEY_COLUMNS if col in df.columns and col in base.columns]
+    if not columns:
+        return None
+    ours = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    if not np.array_equal(ours, _row_hashes(entry, columns)[positions]):
+        return None
+    return positions
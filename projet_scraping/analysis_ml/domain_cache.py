@@ -0,0 +1,119 @@
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def normalize_title(title):
+    """Normalise un titre de poste (minuscules, espaces compactés)"""
+    return ' '.join(str(title).lower().split())
+
+
+def vocabulary_hash(skills_database):
+    """Calcule l'empreinte de la base de compétences (invalide le cache si elle change)"""
+    payload = json.dumps(skills_database, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class DomainCache:
+    """Cache titre normalisé → domaine : LRU en mémoire et table SQLite persistante"""
+
+    def __init__(self, vocab_hash, path=None, max_size=100000):
+        self.vocab_hash = vocab_hash
+        self.path = path
+        self.max_size = max_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        # Compteurs pour suivre le taux de succès du cache
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS title_domains ("
+                "vocab_hash TEXT NOT NULL, title TEXT NOT NULL, domain TEXT NOT NULL, "
+                "PRIMARY KEY (vocab_hash, title))"
+            )
+            # Les entrées calculées avec une autre base de compétences ne sont plus valides
+            self._conn.execute("DELETE FROM title_domains WHERE vocab_hash != ?", (vocab_hash,))
+            self._conn.commit()
+
+    def _remember(self, title, domain):
+        self._memory[title] = domain
+        self._memory.move_to_end(title)
+        if len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, titles):
+        """Retourne les domaines connus pour une liste de titres normalisés"""
+        found = {}
+        missing = []
+
+        with self._lock:
+            for title in titles:
+                if title in self._memory:
+                    self._memory.move_to_end(title)
+                    found[title] = self._memory[title]
+                    self.memory_hits += 1
+                else:
+                    missing.append(title)
+
+            if self._conn is not None and missing:
+                still_missing = []
+                # Requêtes par paquets pour rester sous la limite de paramètres SQLite
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT title, domain FROM title_domains "
+                        f"WHERE vocab_hash = ? AND title IN ({placeholders})",
+                        [self.vocab_hash] + chunk
+                    ).fetchall()
+                    on_disk = dict(rows)
+                    for title in chunk:
+                        if title in on_disk:
+                            found[title] = on_disk[title]
+                            self._remember(title, on_disk[title])
+                            self.disk_hits += 1
+                        else:
+                            still_missing.append(title)
+                missing = still_missing
+
+            self.misses += len(missing)
+
+        return found
+
+    def put_many(self, mapping):
+        """Enregistre des associations titre normalisé → domaine"""
+        if not mapping:
+            return
+        with self._lock:
+            for title, domain in mapping.items():
+                self._remember(title, domain)
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO title_domains (vocab_hash, title, domain) VALUES (?, ?, ?)",
+                    [(self.vocab_hash, title, domain) for title, domain in mapping.items()]
+                )
+                self._conn.commit()
+
+    def stats(self):
+        """Retourne les compteurs de succès/échecs du cache"""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / total if total else 0.0
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
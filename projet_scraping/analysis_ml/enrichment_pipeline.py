@@ -0,0 +1,92 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from skills_generator import SkillsGenerator
+
+# Générateur propre à chaque processus de travail (matrice TF-IDF construite une seule fois)
+_worker_generator = None
+
+
+def _init_worker(cache_path, seed):
+    """Initialise le générateur de compétences d'un processus de travail"""
+    global _worker_generator
+    _worker_generator = SkillsGenerator(cache_path=cache_path, seed=seed)
+
+
+def _enrich_shard(shard_id, shard, job_title_col, sector_col, skills_col):
+    """Enrichit un lot d'offres dans un processus de travail"""
+    before = _worker_generator.domain_cache.stats()
+    start = time.perf_counter()
+    shard = _worker_generator.enrich_dataframe(shard, job_title_col, sector_col, skills_col)
+    elapsed = time.perf_counter() - start
+    after = _worker_generator.domain_cache.stats()
+
+    # Taux de succès du cache sur ce lot uniquement (les compteurs du processus sont cumulés)
+    hits = sum(after[k] - before[k] for k in ('memory_hits', 'disk_hits'))
+    lookups = hits + after['misses'] - before['misses']
+    return shard_id, shard, elapsed, {'hits': hits, 'lookups': lookups,
+                                      'hit_rate': hits / lookups if lookups else 0.0}
+
+
+def enrich_csv_sharded(input_path, output_path, chunksize=100000, workers=None, cache_path=None, seed=None,
+                       job_title_col='Poste', sector_col='Secteur', skills_col='Competences'):
+    """Enrichit un gros CSV par lots en parallèle et écrit le résultat dans l'ordre d'origine
+
+    Les lots sont lus en flux : au plus deux lots par processus sont en mémoire à la fois."""
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    tmp_path = output_path + '.tmp'
+
+    total_rows = 0
+    start = time.perf_counter()
+    shard_stats = []
+
+    def write(result):
+        nonlocal total_rows
+        shard_id, shard, elapsed, cache_stats = result
+        shard.to_csv(tmp_path, mode='w' if shard_id == 0 else 'a', header=shard_id == 0, index=False)
+        total_rows += len(shard)
+        throughput = len(shard) / elapsed if elapsed > 0 else float('inf')
+        shard_stats.append({'shard': shard_id, 'rows': len(shard), 'seconds': elapsed,
+                            'rows_per_second': throughput, 'cache_hit_rate': cache_stats['hit_rate']})
+        print(f"[INFO] Lot {shard_id} : {len(shard):,} offres en {elapsed:.2f}s "
+              f"({throughput:,.0f} offres/s, cache {cache_stats['hit_rate']:.0%})")
+
+    # Compétences lues comme texte : un lot sans aucune compétence serait sinon typé float64
+    reader = pd.read_csv(input_path, chunksize=chunksize, dtype={skills_col: object})
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path, seed)) as pool:
+            pending = deque()
+            for shard_id, shard in enumerate(reader):
+                pending.append(pool.submit(_enrich_shard, shard_id, shard, job_title_col, sector_col, skills_col))
+                # Écrire les lots terminés dans l'ordre pour borner la mémoire
+                if len(pending) >= max_in_flight:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    except BaseException:
+        # Pas de fichier partiel en cas d'échec
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if total_rows == 0:
+        # Fichier source vide : rien n'a été écrit
+        return {'rows': 0, 'seconds': 0.0, 'shards': []}
+
+    os.replace(tmp_path, output_path)
+    elapsed = time.perf_counter() - start
+    print(f"[OK] {total_rows:,} offres enrichies en {elapsed:.2f}s avec {workers} processus "
+          f"({total_rows / elapsed:,.0f} offres/s)")
+    return {'rows': total_rows, 'seconds': elapsed, 'shards': shard_stats}
+
+
+# Exemple d'utilisation
+if __name__ == "__main__":
+    input_path = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_cleaned.csv"
+    output_path = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_with_skills.csv"
+    cache_path = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\title_domains.sqlite"
+
+    enrich_csv_sharded(input_path, output_path, chunksize=100000, cache_path=cache_path)
@@ -0,0 +1,297 @@
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from data_store import get_dataset_version, get_row_positions
+
+
+def yearly_counts(df, by='Secteur'):
+    """Compte les offres par (année, groupe) en un seul regroupement"""
+    counts = df.groupby(['Annee', by], observed=True).size().reset_index(name='Nb_Annonces')
+    return counts.sort_values([by, 'Annee'], kind='stable').reset_index(drop=True)
+
+
+def fit_linear_trends(groups, x, y, n_groups):
+    """Ajuste par moindres carrés une droite y = a·x + b pour chaque groupe simultanément
+
+    `groups` contient le code du groupe de chaque point. Retourne (pentes, ordonnées, nombre
+    de points) ; la pente vaut NaN pour les groupes ayant moins de deux abscisses distinctes."""
+    n = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(groups, weights=x, minlength=n_groups) / n
+        mean_y = np.bincount(groups, weights=y, minlength=n_groups) / n
+
+        # Écarts aux moyennes de chaque groupe (meilleure stabilité numérique qu'avec les sommes brutes)
+        dx = x - mean_x[groups]
+        dy = y - mean_y[groups]
+        sxx = np.bincount(groups, weights=dx * dx, minlength=n_groups)
+        sxy = np.bincount(groups, weights=dx * dy, minlength=n_groups)
+
+        slopes = np.where(sxx > 0, sxy / sxx, np.nan)
+    intercepts = mean_y - slopes * mean_x
+    return slopes, intercepts, n.astype(np.int64)
+
+
+def forecast_sectors(df, target_years=(2025,), by='Secteur', min_years=2):
+    """Prévoit le nombre d'offres de tous les secteurs pour une ou plusieurs années cibles
+
+    Retourne une table indexée par secteur avec la tendance linéaire, le taux de croissance
+    annuel moyen (entre la première et la dernière année observées) et une colonne
+    'Prediction_<année>' par année cible. Les secteurs ayant moins de `min_years` années
+    de données sont exclus."""
+    if isinstance(target_years, (int, np.integer)):
+        target_years = [target_years]
+
+    counts = yearly_counts(df, by)
+    codes, sectors = pd.factorize(counts[by], sort=False)
+    years = counts['Annee'].to_numpy(dtype=np.float64)
+    values = counts['Nb_Annonces'].to_numpy(dtype=np.float64)
+
+    slopes, intercepts, n_years = fit_linear_trends(codes, years, values, len(sectors))
+
+    # Les comptes sont triés par année dans chaque secteur : premier et dernier point de chaque groupe
+    starts = np.searchsorted(codes, np.arange(len(sectors)), side='left')
+    ends = np.searchsorted(codes, np.arange(len(sectors)), side='right') - 1
+    first_year, last_year = years[starts], years[ends]
+    first_count, last_count = values[starts], values[ends]
+
+    # Taux de croissance annuel moyen, nul si le premier compte est nul ou une seule année observée
+    valid = (first_count > 0) & (last_year > first_year)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth = np.where(
+            valid,
+            ((last_count / first_count) ** (1 / np.where(valid, last_year - first_year, 1)) - 1) * 100,
+            0.0
+        )
+
+    table = pd.DataFrame({
+        'Nb_Annees': n_years,
+        'Premiere_Annee': first_year.astype(np.int64),
+        'Derniere_Annee': last_year.astype(np.int64),
+        'Dernier_Nombre': last_count.astype(np.int64),
+        'Pente': slopes,
+        'Ordonnee': intercepts,
+        'Taux_Croissance': growth
+    }, index=pd.Index(np.asarray(sectors), name=by))
+
+    for year in target_years:
+        table[f'Prediction_{int(year)}'] = slopes * year + intercepts
+
+    return table[table['Nb_Annees'] >= min_years]
+
+
+def forecast_leaderboard(df, target_year=2025, top_n=None):
+    """Classe les secteurs par taux de croissance annuel avec leur prévision pour l'année cible"""
+    table = forecast_sectors(df, [target_year])
+    prediction_col = f'Prediction_{int(target_year)}'
+
+    leaderboard = pd.DataFrame({
+        'Secteur': table.index,
+        'Dernière année': table['Derniere_Annee'].to_numpy(),
+        'Offres (dernière année)': table['Dernier_Nombre'].to_numpy(),
+        f'Prédiction {int(target_year)}': table[prediction_col].astype(int).to_numpy(),
+        'Croissance annuelle (%)': table['Taux_Croissance'].round(1).to_numpy()
+    })
+    leaderboard = leaderboard.sort_values('Croissance annuelle (%)', ascending=False, kind='stable')
+    if top_n is not None:
+        leaderboard = leaderboard.head(top_n)
+    return leaderboard.reset_index(drop=True)
+
+
+class ForecastCache:
+    """Cache LRU des prévisions, indexé par (version des données, secteur, année cible, modèle)
+
+    Plusieurs versions cohabitent (jeu partagé, sous-ensembles filtrés, tables de comptes
+    des autres pages) : les entrées d'une version périmée ne sont plus demandées et sortent
+    du cache par ordre d'utilisation, sans vider les prévisions des autres appelants."""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Compteurs pour suivre le taux de succès du cache
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, sector, target_year, model):
+        """Retourne la prévision mise en cache, ou None si elle doit être calculée"""
+        key = (version, sector, int(target_year), model)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, version, sector, target_year, model, forecast):
+        """Enregistre une prévision (en évinçant les moins récemment utilisées si le cache est plein)"""
+        key = (version, sector, int(target_year), model)
+        with self._lock:
+            self._entries[key] = forecast
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Retourne les compteurs de succès/échecs du cache"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+# Cache partagé par toutes les pages (et toutes les sessions) du processus
+_forecast_cache = ForecastCache()
+
+
+def get_forecast_cache():
+    """Retourne le cache de prévisions du processus"""
+    return _forecast_cache
+
+
+def forecast_version(df):
+    """Identifie la version des données d'une prévision (None si elle ne peut pas être mise en cache)
+
+    Un sous-ensemble du jeu partagé garde sa version : il est distingué par l'empreinte
+    des positions de ses lignes (deux filtres de même taille ne partagent pas leurs prévisions)."""
+    version = get_dataset_version(df)
+    positions = get_row_positions(df) if version is not None else None
+    if positions is None:
+        return None
+    return (version, hashlib.sha1(np.ascontiguousarray(positions).tobytes()).hexdigest())
+
+
+def counts_fingerprint(counts):
+    """Empreinte du contenu d'une table de comptes (version des données hors du jeu partagé)"""
+    return format(int(pd.util.hash_pandas_object(counts, index=False).sum()) & 0xFFFFFFFFFFFFFFFF, 'x')
+
+
+# Longueur de saison par granularité (un an de périodes)
+SEASON_LENGTHS = {'M': 12, 'W': 52}
+
+
+def period_matrix(df, freq='M', by='Secteur', date_col='Date_De_Publication'):
+    """Agrège les offres en une matrice secteurs × périodes (mois 'M' ou semaines 'W')
+
+    Les périodes sans offre entre la première et la dernière date sont comptées à zéro.
+    Retourne (matrice des comptes, secteurs, PeriodIndex des colonnes)."""
+    dates = pd.to_datetime(df[date_col], errors='coerce')
+    valid = (dates.notna() & df[by].notna()).to_numpy()
+    if not valid.any():
+        return np.zeros((0, 0)), pd.Index([], name=by), pd.PeriodIndex([], freq=freq)
+
+    ordinals = dates[valid].dt.to_period(freq).array.asi8
+    codes, sectors = pd.factorize(df[by][valid], sort=True)
+    start = ordinals.min()
+    n_periods = int(ordinals.max() - start) + 1
+
+    counts = np.bincount(codes * n_periods + (ordinals - start), minlength=len(sectors) * n_periods)
+    periods = pd.period_range(start=pd.Period(ordinal=int(start), freq=freq), periods=n_periods)
+    return counts.reshape(len(sectors), n_periods).astype(np.float64), pd.Index(np.asarray(sectors), name=by), periods
+
+
+def linear_trend_forecast(history, horizon, **kwargs):
+    """Prolonge la tendance linéaire de chaque ligne (moindres carrés sur l'indice de période)"""
+    n_periods = history.shape[1]
+    t = np.arange(n_periods, dtype=np.float64)
+    centred = t - t.mean()
+    denominator = centred @ centred
+    means = history.mean(axis=1)
+    slopes = (history - means[:, None]) @ centred / denominator if denominator > 0 else np.zeros(len(history))
+    future = np.arange(n_periods, n_periods + horizon) - t.mean()
+    return means[:, None] + slopes[:, None] * future[None, :]
+
+
+def exponential_smoothing_forecast(history, horizon, alpha=0.3, **kwargs):
+    """Lissage exponentiel simple de toutes les lignes à la fois (prévision constante au dernier niveau)"""
+    level = history[:, 0].copy()
+    for t in range(1, history.shape[1]):
+        level = alpha * history[:, t] + (1 - alpha) * level
+    return np.repeat(level[:, None], horizon, axis=1)
+
+
+def seasonal_naive_forecast(history, horizon, season=12, **kwargs):
+    """Répète la dernière saison observée (ou la dernière valeur si l'historique est trop court)"""
+    n_periods = history.shape[1]
+    if n_periods < season:
+        return np.repeat(history[:, -1:], horizon, axis=1)
+    columns = n_periods - season + (np.arange(horizon) % season)
+    return history[:, columns]
+
+
+# Modèles disponibles : chacun prévoit toutes les lignes de la matrice en un seul appel
+FORECAST_MODELS = {
+    'linear': linear_trend_forecast,
+    'exp_smoothing': exponential_smoothing_forecast,
+    'seasonal_naive': seasonal_naive_forecast
+}
+
+
+def backtest(history, horizon, models=None, folds=3, season=12):
+    """Évalue les modèles par origine glissante et retourne l'erreur absolue moyenne par ligne
+
+    Pour chaque repli, les `horizon` périodes suivant l'origine servent de test. Retourne un
+    dictionnaire modèle → vecteur des erreurs (NaN si l'historique est trop court)."""
+    models = models or list(FORECAST_MODELS)
+    errors = {name: [] for name in models}
+
+    for fold in range(1, folds + 1):
+        cut = history.shape[1] - fold * horizon
+        if cut < 2:
+            break
+        train, test = history[:, :cut], history[:, cut:cut + horizon]
+        for name in models:
+            predicted = np.clip(FORECAST_MODELS[name](train, test.shape[1], season=season), 0, None)
+            errors[name].append(np.abs(predicted - test).mean(axis=1))
+
+    return {
+        name: np.mean(values, axis=0) if values else np.full(len(history), np.nan)
+        for name, values in errors.items()
+    }
+
+
+def forecast_periods(df, freq='M', horizon=6, by='Secteur', models=None, folds=3):
+    """Prévoit les offres de tous les secteurs par mois ou par semaine avec plusieurs modèles
+
+    Retourne un dictionnaire contenant l'historique (secteurs × périodes), les prévisions de
+    chaque modèle, les erreurs de backtesting, le meilleur modèle de chaque secteur et la
+    prévision de ce meilleur modèle."""
+    models = models or list(FORECAST_MODELS)
+    season = SEASON_LENGTHS.get(freq, 12)
+
+    history, sectors, periods = period_matrix(df, freq, by)
+    if history.size == 0:
+        return None
+    future = pd.period_range(start=periods[-1] + 1, periods=horizon, freq=freq)
+
+    forecasts = {
+        name: pd.DataFrame(np.clip(FORECAST_MODELS[name](history, horizon, season=season), 0, None),
+                           index=sectors, columns=future)
+        for name in models
+    }
+
+    errors = pd.DataFrame(backtest(history, horizon, models, folds, season), index=sectors)
+    # Meilleur modèle par secteur (le premier de la liste à défaut de backtesting possible)
+    best_model = errors.fillna(np.inf).idxmin(axis=1)
+    best = np.stack([forecasts[name].to_numpy() for name in models])[
+        best_model.map(models.index).to_numpy(), np.arange(len(sectors))
+    ]
+
+    return {
+        'history': pd.DataFrame(history, index=sectors, columns=periods),
+        'forecasts': forecasts,
+        'errors': errors,
+        'best_model': best_model,
+        'best': pd.DataFrame(best, index=sectors, columns=future)
+    }
@@ -1,7 +1,8 @@
-import pandas as pd
 import numpy as np
 from collections import Counter
-import re
+from scipy import sparse
+from ranking import binary_skill_matrix, top_n_items, top_n_rows
+from catalog import load_catalog, attach_shared_state
 
 # Variable globale pour stocker l'instance du recommandeur
 _recommender_instance = None
@@ -11,163 +12,70 @@ job_profiles = {}
 
 class JobProfilesRecommender:
     def __init__(self):
-        # Définition des profils professionnels avec leurs compétences requises
-        self.job_profiles = {
-            # Profils Data
-            'Data Analyst': {
-                'description': 'Spécialiste de l\'analyse de données qui transforme les données brutes en insights exploitables pour les décisions d\'affaires.',
-                'skills_required': ['SQL', 'Excel', 'Tableau/Power BI', 'Python/R', 'Statistiques', 'Data Visualization', 'Business Intelligence'],
-                'education': ['Licence en informatique/statistiques', 'Master en Data Science/Analytics'],
-                'career_path': ['Junior Data Analyst', 'Data Analyst', 'Senior Data Analyst', 'Data Analytics Manager', 'Head of Analytics'],
-                'avg_salary': '45,000€ - 65,000€',
-                'sector': ['IT', 'Data']
-            },
-            'Data Scientist': {
-                'description': 'Expert en analyse avancée qui utilise des algorithmes de machine learning pour extraire des connaissances et faire des prédictions.',
-                'skills_required': ['Python', 'R', 'Machine Learning', 'Deep Learning', 'SQL', 'Statistiques avancées', 'NLP', 'Big Data'],
-                'education': ['Master en Data Science/IA', 'Doctorat en informatique/mathématiques'],
-                'career_path': ['Junior Data Scientist', 'Data Scientist', 'Senior Data Scientist', 'Lead Data Scientist', 'Chief Data Scientist'],
-                'avg_salary': '55,000€ - 85,000€',
-                'sector': ['IT', 'Data']
-            },
-            'Data Engineer': {
-                'description': 'Spécialiste qui conçoit et maintient l\'architecture de données et les pipelines pour assurer la disponibilité des données.',
-                'skills_required': ['SQL', 'Python', 'Spark', 'Hadoop', 'ETL', 'Cloud (AWS/Azure/GCP)', 'Docker/Kubernetes', 'NoSQL'],
-                'education': ['Master en informatique/génie logiciel', 'Formation spécialisée en Big Data'],
-                'career_path': ['Junior Data Engineer', 'Data Engineer', 'Senior Data Engineer', 'Data Architect', 'Chief Data Officer'],
-                'avg_salary': '50,000€ - 75,000€',
-                'sector': ['IT', 'Data']
-            },
-            
-            # Profils Développement
-            'Développeur Full Stack': {
-                'description': 'Développeur polyvalent capable de travailler sur le front-end et le back-end des applications web.',
-                'skills_required': ['JavaScript', 'HTML/CSS', 'React/Angular/Vue', 'Node.js/Django/Laravel', 'SQL', 'Git', 'REST API', 'Docker'],
-                'education': ['Licence/Master en informatique', 'Formation développeur web'],
-                'career_path': ['Junior Developer', 'Full Stack Developer', 'Senior Developer', 'Tech Lead', 'CTO'],
-                'avg_salary': '45,000€ - 70,000€',
-                'sector': ['IT', 'Développement']
-            },
-            'Développeur Backend': {
-                'description': 'Spécialiste du développement côté serveur, des API et des bases de données.',
-                'skills_required': ['Java/Python/C#/.NET', 'SQL/NoSQL', 'API Design', 'Cloud Services', 'Microservices', 'Docker/Kubernetes'],
-                'education': ['Licence/Master en informatique', 'Formation spécialisée backend'],
-                'career_path': ['Junior Backend Developer', 'Backend Developer', 'Senior Backend Developer', 'Backend Architect', 'Tech Lead'],
-                'avg_salary': '45,000€ - 70,000€',
-                'sector': ['IT', 'Développement']
-            },
-            'Développeur Frontend': {
-                'description': 'Expert en interfaces utilisateur et expérience utilisateur pour les applications web et mobiles.',
-                'skills_required': ['HTML/CSS', 'JavaScript', 'React/Angular/Vue', 'UI/UX Design', 'Responsive Design', 'SASS/LESS', 'Testing'],
-                'education': ['Licence en informatique', 'Formation développeur frontend'],
-                'career_path': ['Junior Frontend Developer', 'Frontend Developer', 'Senior Frontend Developer', 'UI/UX Lead', 'Frontend Architect'],
-                'sector': ['IT', 'Développement']
-            },
-            
-            # Profils Finance
-            'Analyste Financier': {
-                'description': 'Spécialiste qui analyse les données financières pour évaluer la performance et les perspectives d\'une entreprise ou d\'un secteur.',
-                'skills_required': ['Analyse financière', 'Excel avancé', 'Modélisation financière', 'Comptabilité', 'SQL', 'Bloomberg/Reuters', 'Power BI'],
-                'education': ['Master en finance/comptabilité', 'CFA (Chartered Financial Analyst)'],
-                'career_path': ['Analyste Junior', 'Analyste Financier', 'Analyste Senior', 'Responsable Analyse Financière', 'Directeur Financier'],
-                'avg_salary': '45,000€ - 70,000€',
-                'sector': ['Finance']
-            },
-            'Risk Manager': {
-                'description': 'Expert qui identifie, évalue et atténue les risques financiers et opérationnels d\'une organisation.',
-                'skills_required': ['Gestion des risques', 'Modélisation statistique', 'VaR', 'Réglementation financière', 'Python/R', 'Excel avancé', 'Stress Testing'],
-                'education': ['Master en finance/gestion des risques', 'FRM (Financial Risk Manager)', 'PRM (Professional Risk Manager)'],
-                'career_path': ['Analyste des risques', 'Risk Manager', 'Senior Risk Manager', 'Head of Risk', 'Chief Risk Officer'],
-                'avg_salary': '55,000€ - 90,000€',
-                'sector': ['Finance']
-            },
-            'Quant Analyst': {
-                'description': 'Spécialiste qui développe des modèles mathématiques et statistiques pour l\'analyse financière et la prise de décision.',
-                'skills_required': ['Mathématiques avancées', 'Statistiques', 'Python/R/C++', 'Machine Learning', 'Algorithmes financiers', 'Pricing d\'options', 'Séries temporelles'],
-                'education': ['Master/PhD en mathématiques/physique/finance quantitative'],
-                'career_path': ['Junior Quant', 'Quant Analyst', 'Senior Quant', 'Quant Researcher', 'Head of Quantitative Research'],
-                'avg_salary': '65,000€ - 120,000€',
-                'sector': ['Finance', 'Data']
-            },
-            'Conseiller en Investissement': {
-                'description': 'Professionnel qui conseille les clients sur les stratégies d\'investissement et la gestion de patrimoine.',
-                'skills_required': ['Connaissance des marchés financiers', 'Planification financière', 'Gestion de portefeuille', 'Réglementation financière', 'Communication client', 'CRM'],
-                'education': ['Master en finance/gestion de patrimoine', 'Certification AMF/CIF'],
-                'career_path': ['Conseiller Junior', 'Conseiller en Investissement', 'Conseiller Senior', 'Responsable d\'équipe', 'Directeur de la Gestion Privée'],
-                'avg_salary': '40,000€ - 80,000€',
-                'sector': ['Finance']
-            },
-            'Analyste Crédit': {
-                'description': 'Spécialiste qui évalue la solvabilité des emprunteurs et le risque de crédit pour les institutions financières.',
-                'skills_required': ['Analyse financière', 'Évaluation du risque de crédit', 'Modélisation de scoring', 'Réglementation bancaire', 'Excel avancé', 'SQL'],
-                'education': ['Master en finance/banque', 'Formation en analyse de crédit'],
-                'career_path': ['Analyste Crédit Junior', 'Analyste Crédit', 'Analyste Crédit Senior', 'Responsable Crédit', 'Directeur des Risques de Crédit'],
-                'avg_salary': '42,000€ - 65,000€',
-                'sector': ['Finance']
-            },
-            'Fintech Product Manager': {
-                'description': 'Responsable du développement et de la gestion de produits financiers innovants basés sur la technologie.',
-                'skills_required': ['Gestion de produit', 'Finance', 'UX/UI', 'Agile/Scrum', 'API bancaires', 'Réglementation fintech', 'Analyse de données'],
-                'education': ['Master en finance/technologie/gestion de produit', 'Formation en fintech'],
-                'career_path': ['Product Owner', 'Product Manager', 'Senior Product Manager', 'Head of Product', 'Chief Product Officer'],
-                'avg_salary': '55,000€ - 95,000€',
-                'sector': ['Finance', 'IT']
-            },
+        # Profils professionnels chargés depuis le catalogue compilé (catalogs/job_profiles.json)
+        catalog = load_catalog('job_profiles')
+        self.job_profiles = catalog.copy_data()
+        
+        # Index construits une seule fois pour éviter de parcourir tous les profils à chaque requête
+        attach_shared_state(self, catalog, self._build_indexes)
+    
+    def _build_indexes(self, catalog):
+        """Construit l'index inversé des compétences et les index de secteur et de parcours"""
+        self._profile_order = {name: i for i, name in enumerate(self.job_profiles)}
+        self._skill_index = {}
+        self._sector_index = {}
+        self._experience_index = {'junior': [], 'senior': [], 'manager': []}
+        self._profile_texts = []
+        self._sector_mentions = {}
+        
+        for profile_name, profile_data in self.job_profiles.items():
+            # Compétence normalisée → profils qui la requièrent
+            for skill in dict.fromkeys(skill.lower() for skill in profile_data['skills_required']):
+                self._skill_index.setdefault(skill, []).append(profile_name)
             
-            # Profils Cybersécurité
-            'Analyste en Cybersécurité': {
-                'description': 'Spécialiste qui surveille, détecte et répond aux menaces de sécurité informatique.',
-                'skills_required': ['Network Security', 'SIEM', 'Threat Intelligence', 'Incident Response', 'Security Controls', 'Risk Assessment'],
-                'education': ['Master en cybersécurité/sécurité informatique', 'Certifications (CISSP, Security+, CEH)'],
-                'career_path': ['Security Analyst', 'Senior Security Analyst', 'Security Engineer', 'Security Architect', 'CISO'],
-                'avg_salary': '50,000€ - 75,000€',
-                'sector': ['IT', 'Cybersécurité']
-            },
-            'Pentester': {
-                'description': 'Expert qui teste la sécurité des systèmes en simulant des attaques pour identifier les vulnérabilités.',
-                'skills_required': ['Penetration Testing', 'Ethical Hacking', 'Network Security', 'Web Application Security', 'Scripting', 'Social Engineering'],
-                'education': ['Formation en cybersécurité', 'Certifications (OSCP, CEH, GPEN)'],
-                'career_path': ['Junior Pentester', 'Penetration Tester', 'Senior Pentester', 'Red Team Lead', 'Security Consultant'],
-                'avg_salary': '45,000€ - 80,000€',
-                'sector': ['IT', 'Cybersécurité']
-            },
+            # Secteur normalisé → profils de ce secteur
+            for sector in dict.fromkeys(s.lower() for s in profile_data.get('sector', [])):
+                self._sector_index.setdefault(sector, set()).add(profile_name)
             
-            # Profils Cloud & DevOps
-            'Ingénieur DevOps': {
-                'description': 'Spécialiste qui combine le développement et les opérations IT pour optimiser le cycle de vie des applications.',
-                'skills_required': ['Docker', 'Kubernetes', 'CI/CD', 'Infrastructure as Code', 'Cloud (AWS/Azure/GCP)', 'Monitoring', 'Linux'],
-                'education': ['Master en informatique', 'Certifications cloud (AWS, Azure, GCP)'],
-                'career_path': ['DevOps Engineer', 'Senior DevOps Engineer', 'DevOps Architect', 'Head of DevOps', 'CTO'],
-                'avg_salary': '55,000€ - 80,000€',
-                'sector': ['IT', 'Cloud']
-            },
-            'Architecte Cloud': {
-                'description': 'Expert qui conçoit et implémente des solutions d\'infrastructure cloud robustes et évolutives.',
-                'skills_required': ['AWS/Azure/GCP', 'Infrastructure as Code', 'Networking', 'Security', 'Microservices', 'Serverless', 'Cost Optimization'],
-                'education': ['Master en informatique', 'Certifications avancées cloud'],
-                'career_path': ['Cloud Engineer', 'Senior Cloud Engineer', 'Cloud Architect', 'Enterprise Architect', 'CTO'],
-                'avg_salary': '65,000€ - 90,000€',
-                'sector': ['IT', 'Cloud']
-            },
+            # Niveau d'expérience → profils dont le parcours comporte ce niveau
+            career_text = ' '.join(profile_data['career_path']).lower()
+            if 'junior' in career_text:
+                self._experience_index['junior'].append(profile_name)
+            if 'senior' in career_text:
+                self._experience_index['senior'].append(profile_name)
+            if any(role in career_text for role in ['manager', 'lead', 'head', 'chief']):
+                self._experience_index['manager'].append(profile_name)
             
-            # Profils Finance & IT
-            'Analyste Financier IT': {
-                'description': 'Spécialiste qui combine expertise financière et compétences IT pour analyser les données financières.',
-                'skills_required': ['Financial Analysis', 'Excel avancé', 'SQL', 'BI Tools', 'ERP Systems', 'Modélisation financière', 'Python/R'],
-                'education': ['Master en finance/économie avec spécialisation IT', 'Formation en analyse de données'],
-                'career_path': ['Financial Analyst', 'Senior Financial Analyst', 'Finance Manager', 'Finance Director', 'CFO'],
-                'avg_salary': '50,000€ - 75,000€',
-                'sector': ['Finance', 'IT', 'Data']
-            },
-            'Consultant FinTech': {
-                'description': 'Expert qui conseille sur l\'implémentation de solutions technologiques dans le secteur financier.',
-                'skills_required': ['Finance Knowledge', 'Banking Systems', 'Payment Solutions', 'Blockchain', 'Regulatory Compliance', 'Project Management'],
-                'education': ['Master en finance/informatique', 'MBA avec spécialisation FinTech'],
-                'career_path': ['FinTech Consultant', 'Senior Consultant', 'Manager', 'Partner', 'FinTech Entrepreneur'],
-                'avg_salary': '60,000€ - 90,000€',
-                'sector': ['Finance', 'IT']
-            }
-        }
+            self._profile_texts.append((profile_name, profile_name.lower(), profile_data['description'].lower()))
+        
+        # Profils de repli (les plus populaires, dans l'ordre du catalogue)
+        self._profile_names = list(self.job_profiles)
+        
+        # Matrice creuse compétences × profils pour le calcul en lot
+        self._skill_ids = catalog.skill_ids
+        rows, cols = [], []
+        for profile_name, skill_ids in catalog.entry_skill_ids.items():
+            rows.extend(skill_ids.tolist())
+            cols.extend([self._profile_order[profile_name]] * len(skill_ids))
+        self._skill_profile_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self._skill_ids), len(self._profile_names))
+        )
+    
+    def _profiles_mentioning(self, sector_lower):
+        """Retourne les profils dont le nom ou la description mentionne un secteur (mémorisé)"""
+        # Mémo partagé entre instances et threads : le résultat est retourné depuis une variable
+        # locale, le mémo pouvant être vidé par un autre appel entre-temps
+        profiles = self._sector_mentions.get(sector_lower)
+        if profiles is None:
+            profiles = [
+                profile_name for profile_name, name_lower, description_lower in self._profile_texts
+                if sector_lower in name_lower or sector_lower in description_lower
+            ]
+            if len(self._sector_mentions) >= 1024:
+                self._sector_mentions.clear()
+            self._sector_mentions[sector_lower] = profiles
+        return profiles
     
     def get_all_profiles(self):
         """Retourne tous les profils professionnels disponibles"""
@@ -179,52 +87,71 @@ class JobProfilesRecommender:
     
     def recommend_profiles(self, skills=None, sector=None, experience_level=None, top_n=3):
         """Recommande des profils professionnels basés sur les compétences, le secteur et l'expérience"""
+        # Seuls les profils touchés par un index reçoivent un score (les autres restent à 0)
         scores = {}
         
-        for profile_name, profile_data in self.job_profiles.items():
-            score = 0
-            
-            # Score basé sur les compétences
-            if skills:
-                skills_list = [skill.lower() for skill in skills]
-                profile_skills = [skill.lower() for skill in profile_data['skills_required']]
-                
-                # Calculer l'intersection des compétences
-                common_skills = set(skills_list).intersection(set(profile_skills))
-                score += len(common_skills) * 2  # Pondération plus élevée pour les compétences
-            
-            # Score basé sur le secteur
-            if sector:
-                sector_lower = sector.lower()
-                # Vérifier si le secteur est dans la liste des secteurs du profil
-                if 'sector' in profile_data and any(s.lower() == sector_lower for s in profile_data['sector']):
-                    score += 3  # Pondération élevée pour correspondance exacte du secteur
-                # Vérifier si le secteur est mentionné dans la description ou le nom du profil
-                elif sector_lower in profile_name.lower() or sector_lower in profile_data['description'].lower():
-                    score += 1
-            
-            # Score basé sur le niveau d'expérience
-            if experience_level:
-                exp_level = experience_level.lower()
-                if exp_level == 'junior' and 'junior' in ' '.join(profile_data['career_path']).lower():
-                    score += 1
-                elif exp_level == 'senior' and 'senior' in ' '.join(profile_data['career_path']).lower():
-                    score += 1
-                elif exp_level == 'manager' and any(role in ' '.join(profile_data['career_path']).lower() for role in ['manager', 'lead', 'head', 'chief']):
-                    score += 1
-            
-            scores[profile_name] = score
+        # Score basé sur les compétences
+        if skills:
+            for skill in set(skill.lower() for skill in skills):
+                for profile_name in self._skill_index.get(skill, ()):
+                    scores[profile_name] = scores.get(profile_name, 0) + 2  # Pondération plus élevée pour les compétences
+        
+        # Score basé sur le secteur et le niveau d'expérience
+        for profile_name, bonus in self._context_scores(sector, experience_level).items():
+            scores[profile_name] = scores.get(profile_name, 0) + bonus
         
-        # Trier les profils par score et prendre les top_n
-        sorted_profiles = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        top_profiles = [profile for profile, score in sorted_profiles[:top_n] if score > 0]
+        # Sélectionner les top_n profils (à égalité, ordre du catalogue) sans trier tous les scores
+        top_profiles = top_n_items(scores, top_n, self._profile_order)
         
         # Si aucun profil n'a un score positif, retourner les 3 profils les plus populaires
         if not top_profiles:
-            top_profiles = list(self.job_profiles.keys())[:top_n]
+            top_profiles = self._profile_names[:top_n]
         
         return top_profiles
     
+    def _context_scores(self, sector=None, experience_level=None):
+        """Calcule les points liés au secteur et au niveau d'expérience pour les profils concernés"""
+        scores = {}
+        
+        # Score basé sur le secteur
+        if sector:
+            sector_lower = sector.lower()
+            # Vérifier si le secteur est dans la liste des secteurs du profil
+            exact_matches = self._sector_index.get(sector_lower, set())
+            for profile_name in exact_matches:
+                scores[profile_name] = scores.get(profile_name, 0) + 3  # Pondération élevée pour correspondance exacte du secteur
+            # Vérifier si le secteur est mentionné dans la description ou le nom du profil
+            for profile_name in self._profiles_mentioning(sector_lower):
+                if profile_name not in exact_matches:
+                    scores[profile_name] = scores.get(profile_name, 0) + 1
+        
+        # Score basé sur le niveau d'expérience
+        if experience_level:
+            for profile_name in self._experience_index.get(experience_level.lower(), ()):
+                scores[profile_name] = scores.get(profile_name, 0) + 1
+        
+        return scores
+    
+    def recommend_profiles_batch(self, skills_lists, sector=None, experience_level=None, top_n=3, batch_size=4096):
+        """Recommande des profils pour de nombreux candidats à la fois (produit de matrices creuses)
+        
+        Retourne une liste de recommandations par candidat, identique à recommend_profiles."""
+        # Points de secteur et d'expérience, communs à tous les candidats
+        context = np.zeros(len(self._profile_names), dtype=np.int64)
+        for profile_name, bonus in self._context_scores(sector, experience_level).items():
+            context[self._profile_order[profile_name]] = bonus
+        
+        fallback = self._profile_names[:top_n]
+        results = []
+        for start in range(0, len(skills_lists), batch_size):
+            candidates = binary_skill_matrix(skills_lists[start:start + batch_size], self._skill_ids)
+            # Nombre de compétences communes candidat × profil, pondéré comme pour un seul candidat
+            scores = 2 * (candidates @ self._skill_profile_matrix).toarray() + context
+            for top in top_n_rows(scores, top_n):
+                results.append([self._profile_names[i] for i in top] if top else list(fallback))
+        
+        return results
+    
     def get_required_skills_for_sector(self, sector):
         """Retourne les compétences les plus demandées pour un secteur spécifique"""
         all_skills = []
@@ -266,6 +193,12 @@ def recommend_profiles(skills=None, sector=None, experience=None, top_n=3):
     recommender = get_recommender_instance()
     return recommender.recommend_profiles(skills, sector, experience, top_n)
 
+# Fonction de niveau supérieur pour recommander des profils à toute une promotion
+def recommend_profiles_batch(skills_lists, sector=None, experience=None, top_n=3):
+    """Recommande des profils professionnels pour une liste de candidats"""
+    recommender = get_recommender_instance()
+    return recommender.recommend_profiles_batch(skills_lists, sector, experience, top_n)
+
 # Fonction pour accéder aux profils
 def get_profile_details(profile_name):
     """Retourne les détails d'un profil professionnel spécifique"""
@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from utils import load_data, extract_all_skills, predict_job_growth, display_metric_card
+from forecasting import forecast_leaderboard, forecast_periods
 
 def run_market_analysis():
     """Exécute l'analyse du marché du travail"""
@@ -121,6 +122,55 @@ def run_market_analysis():
             st.pyplot(fig3)
         else:
             st.info(f"Pas assez de données pour prédire l'évolution du secteur '{selected_sector}'")
+        
+        # Classement des prévisions de tous les secteurs (une seule régression groupée)
+        st.markdown('<div class="subsection-title">Classement des prévisions par secteur</div>', unsafe_allow_html=True)
+        leaderboard = forecast_leaderboard(df, 2025)
+        if not leaderboard.empty:
+            st.dataframe(leaderboard, use_container_width=True)
+        else:
+            st.info("Aucun secteur ne dispose d'au moins deux années de données")
+        
+        # Prévisions à granularité fine : tous les secteurs et tous les modèles en une passe
+        st.markdown('<div class="subsection-title">Prévisions mensuelles et hebdomadaires</div>', unsafe_allow_html=True)
+        
+        model_labels = {
+            'linear': 'Tendance linéaire',
+            'exp_smoothing': 'Lissage exponentiel',
+            'seasonal_naive': 'Saisonnier naïf'
+        }
+        col1, col2 = st.columns(2)
+        with col1:
+            granularite = st.radio("Granularité", ['Mensuelle', 'Hebdomadaire'], horizontal=True)
+        with col2:
+            horizon = st.slider("Horizon (périodes)", 1, 12, 6)
+        
+        period_forecasts = forecast_periods(df, 'M' if granularite == 'Mensuelle' else 'W', horizon)
+        
+        if period_forecasts is not None and selected_sector in period_forecasts['history'].index:
+            best_model = period_forecasts['best_model'][selected_sector]
+            history = period_forecasts['history'].loc[selected_sector]
+            forecast = period_forecasts['best'].loc[selected_sector]
+            
+            fig_p, ax_p = plt.subplots(figsize=(10, 5))
+            ax_p.plot(history.index.to_timestamp(), history.values, marker='o', label='Historique')
+            ax_p.plot(forecast.index.to_timestamp(), forecast.values, 'r--', marker='o',
+                      label=f"Prévision ({model_labels[best_model]})")
+            ax_p.set_title(f"Offres par période pour le secteur '{selected_sector}'", fontsize=14)
+            ax_p.set_ylabel("Nombre d'offres")
+            ax_p.legend()
+            st.pyplot(fig_p)
+            
+            # Erreur de backtesting de chaque modèle (moyenne sur tous les secteurs)
+            errors = period_forecasts['errors']
+            backtest_df = pd.DataFrame({
+                'Modèle': [model_labels[name] for name in errors.columns],
+                'Erreur absolue moyenne': errors.mean().round(2).values,
+                'Secteurs où il est le meilleur': [int((period_forecasts['best_model'] == name).sum()) for name in errors.columns]
+            })
+            st.dataframe(backtest_df, use_container_width=True)
+        else:
+            st.info("Pas assez de dates de publication pour les prévisions à granularité fine")
     else:
         st.info("Pas assez de données temporelles pour analyser l'évolution des offres d'emploi")
     
@@ -0,0 +1,278 @@
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from data_store import get_derived, get_dataset_version, get_row_positions
+from skills_matrix import SkillsMatrix
+
+# Dimensions du cube d'agrégats (filtres et répartitions de l'analyse du marché)
+CUBE_DIMENSIONS = ['Secteur', 'Annee', 'Contrat', 'Ville']
+
+# Colonnes agrégées dans le cube en plus des dimensions (empreinte des lignes déjà agrégées)
+CUBE_VALUE_COLUMNS = ['Experience', 'Competences']
+
+# Cubes construits par jeu de données source, conservés pour les mises à jour incrémentales
+_cubes = {}
+_cubes_lock = threading.Lock()
+
+
+class MarketCube:
+    """Cube d'agrégats des offres par (secteur, année, contrat, ville)
+
+    Chaque cellule contient le nombre d'offres, la somme et le nombre d'expériences
+    renseignées, ainsi qu'une ligne de la matrice creuse cellules × compétences.
+    Les valeurs manquantes d'une dimension forment une modalité à part (clé None)."""
+
+    def __init__(self, dimensions=None):
+        self.dimensions = list(dimensions or CUBE_DIMENSIONS)
+        # Modalités de chaque dimension, dans l'ordre de première apparition
+        self.labels = {dim: [] for dim in self.dimensions}
+        self.label_ids = {dim: {} for dim in self.dimensions}
+
+        self.cell_index = {}
+        self.cell_codes = np.empty((0, len(self.dimensions)), dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.experience_sums = np.empty(0, dtype=np.float64)
+        self.experience_counts = np.empty(0, dtype=np.int64)
+
+        self.vocabulary = []
+        self.skill_ids = {}
+        self.skill_counts = sparse.csr_matrix((0, 0), dtype=np.int64)
+
+        self.n_rows = 0
+        # Empreinte du contenu des lignes agrégées, dans l'ordre (colonnes du premier lot)
+        self._hash_columns = None
+        self._prefix_hash = hashlib.sha1()
+
+    @classmethod
+    def from_frame(cls, df, dimensions=None, skills=None):
+        """Construit le cube à partir des offres d'un DataFrame"""
+        cube = cls(dimensions)
+        cube.update(df, skills)
+        return cube
+
+    @staticmethod
+    def _label(dim, value):
+        if pd.isna(value):
+            return None
+        return int(value) if dim == 'Annee' else value
+
+    def _dimension_codes(self, dim, values):
+        """Code les valeurs d'une colonne avec les identifiants globaux de la dimension"""
+        local_codes, uniques = pd.factorize(values, sort=False, use_na_sentinel=True)
+        ids = self.label_ids[dim]
+        mapping = np.empty(len(uniques) + 1, dtype=np.int64)
+        for i, value in enumerate(list(uniques) + [None]):
+            label = self._label(dim, value)
+            if label not in ids:
+                ids[label] = len(self.labels[dim])
+                self.labels[dim].append(label)
+            mapping[i] = ids[label]
+        # Le code -1 (valeur manquante) pointe sur la dernière case : la modalité None
+        return mapping[local_codes]
+
+    def update(self, df, skills=None):
+        """Ajoute de nouvelles offres au cube sans recalculer les cellules existantes
+
+        `skills` est une SkillsMatrix déjà calculée pour les lignes de `df` (facultatif)."""
+        if df.empty:
+            return self
+
+        codes = np.column_stack([self._dimension_codes(dim, df[dim].to_numpy(dtype=object))
+                                 for dim in self.dimensions])
+
+        # Cellules touchées par ce lot, puis correspondance avec les cellules globales
+        unique_codes, row_cells = np.unique(codes, axis=0, return_inverse=True)
+        row_cells = row_cells.ravel()
+        cell_ids = np.empty(len(unique_codes), dtype=np.int64)
+        new_codes = []
+        for i, key in enumerate(map(tuple, unique_codes.tolist())):
+            cell = self.cell_index.get(key)
+            if cell is None:
+                cell = len(self.cell_index)
+                self.cell_index[key] = cell
+                new_codes.append(key)
+            cell_ids[i] = cell
+        row_cells = cell_ids[row_cells]
+
+        n_cells = len(self.cell_index)
+        if new_codes:
+            self.cell_codes = np.vstack([self.cell_codes, np.array(new_codes, dtype=np.int64)])
+        self.counts = self._grow(self.counts, n_cells)
+        self.experience_sums = self._grow(self.experience_sums, n_cells)
+        self.experience_counts = self._grow(self.experience_counts, n_cells)
+
+        self.counts += np.bincount(row_cells, minlength=n_cells)
+        if 'Experience' in df.columns:
+            experience = pd.to_numeric(df['Experience'], errors='coerce').to_numpy(dtype=np.float64)
+            known = ~np.isnan(experience)
+            self.experience_sums += np.bincount(row_cells[known], weights=experience[known], minlength=n_cells)
+            self.experience_counts += np.bincount(row_cells[known], minlength=n_cells)
+
+        if skills is not None or 'Competences' in df.columns:
+            if skills is None:
+                skills = SkillsMatrix.from_skills(df['Competences'])
+            self._add_skills(skills, row_cells, n_cells)
+
+        self._prefix_hash.update(self._rows_hash(df))
+        self.n_rows += len(df)
+        return self
+
+    @staticmethod
+    def _grow(values, size):
+        return np.concatenate([values, np.zeros(size - len(values), dtype=values.dtype)])
+
+    def _add_skills(self, batch, row_cells, n_cells):
+        # Vocabulaire global étendu avec les nouvelles compétences (ordre de première apparition)
+        columns = np.array([self.skill_ids.setdefault(skill, len(self.skill_ids)) for skill in batch.vocabulary],
+                           dtype=np.int64)
+        self.vocabulary = list(self.skill_ids)
+
+        indicator = sparse.csr_matrix(
+            (np.ones(len(row_cells), dtype=np.int64), (row_cells, np.arange(len(row_cells)))),
+            shape=(n_cells, len(row_cells))
+        )
+        grouped = (indicator @ batch.matrix).tocoo()
+        added = sparse.csr_matrix(
+            (grouped.data.astype(np.int64), (grouped.row, columns[grouped.col])),
+            shape=(n_cells, len(self.vocabulary))
+        )
+
+        current = self.skill_counts.tocoo()
+        self.skill_counts = sparse.csr_matrix(
+            (current.data, (current.row, current.col)), shape=(n_cells, len(self.vocabulary))
+        ) + added
+
+    def _rows_hash(self, df):
+        """Empreintes (une par ligne) des colonnes agrégées d'un lot d'offres"""
+        if self._hash_columns is None:
+            self._hash_columns = [c for c in self.dimensions + CUBE_VALUE_COLUMNS if c in df.columns]
+        return pd.util.hash_pandas_object(df[self._hash_columns], index=False).to_numpy().tobytes()
+
+    def extends(self, df):
+        """Vérifie qu'un DataFrame contient les offres déjà agrégées en tête, dans le même ordre
+
+        Tout le préfixe est comparé par empreinte : une offre modifiée, supprimée ou déplacée
+        parmi les lignes déjà agrégées impose une reconstruction."""
+        if len(df) < self.n_rows or self._hash_columns is None:
+            return self.n_rows == 0
+        if any(c not in df.columns for c in self._hash_columns):
+            return False
+        prefix = hashlib.sha1(self._rows_hash(df.iloc[:self.n_rows]))
+        return prefix.digest() == self._prefix_hash.digest()
+
+    def select(self, **filters):
+        """Retourne le masque des cellules correspondant aux filtres (dimension=valeur, None = tout)"""
+        mask = np.ones(len(self.cell_index), dtype=bool)
+        for dim, value in filters.items():
+            if value is None:
+                continue
+            axis = self.dimensions.index(dim)
+            code = self.label_ids[dim].get(self._label(dim, value))
+            if code is None:
+                return np.zeros(len(self.cell_index), dtype=bool)
+            mask &= self.cell_codes[:, axis] == code
+        return mask
+
+    def total(self, cells=None):
+        """Nombre d'offres d'une sélection de cellules"""
+        return int(self.counts.sum() if cells is None else self.counts[cells].sum())
+
+    def mean_experience(self, cells=None):
+        """Expérience moyenne (valeurs manquantes ignorées) d'une sélection de cellules"""
+        sums = self.experience_sums if cells is None else self.experience_sums[cells]
+        counts = self.experience_counts if cells is None else self.experience_counts[cells]
+        n = counts.sum()
+        return sums.sum() / n if n else float('nan')
+
+    def value_counts(self, dim, cells=None):
+        """Nombre d'offres par modalité d'une dimension (décroissant, valeurs manquantes exclues)"""
+        axis = self.dimensions.index(dim)
+        codes = self.cell_codes[:, axis] if cells is None else self.cell_codes[cells, axis]
+        counts = self.counts if cells is None else self.counts[cells]
+        totals = np.bincount(codes, weights=counts, minlength=len(self.labels[dim])).astype(np.int64)
+
+        labels = np.asarray(self.labels[dim], dtype=object)
+        present = np.flatnonzero((totals > 0) & (labels != None))  # noqa: E711
+        order = present[np.argsort(-totals[present], kind='stable')]
+        return pd.Series(totals[order], index=pd.Index(labels[order], name=dim), name='count')
+
+    def counts_by(self, dim, cells=None):
+        """Nombre d'offres par modalité d'une dimension, trié par modalité (comme un groupby)"""
+        counts = self.value_counts(dim, cells)
+        return counts.sort_index()
+
+    def max_label(self, dim, cells=None):
+        """Plus grande modalité présente dans une sélection (None si la sélection est vide)"""
+        counts = self.value_counts(dim, cells)
+        return counts.index.max() if len(counts) else None
+
+    def top_skills(self, n=10, cells=None):
+        """Retourne les n compétences les plus demandées d'une sélection sous forme de liste (compétence, nombre)"""
+        rows = self.skill_counts if cells is None else self.skill_counts[np.flatnonzero(cells)]
+        counts = np.asarray(rows.sum(axis=0)).ravel()
+        nonzero = np.flatnonzero(counts)
+        # À égalité, ordre d'apparition des compétences (comme SkillsMatrix.most_common)
+        order = nonzero[np.argsort(-counts[nonzero], kind='stable')][:n]
+        return [(self.vocabulary[i], int(counts[i])) for i in order]
+
+
+def get_market_cube(df):
+    """Retourne le cube d'agrégats d'un DataFrame
+
+    Pour le jeu de données partagé complet, le cube est calculé une fois par version ;
+    un sous-ensemble filtré (ou un DataFrame hors du jeu partagé) a son propre cube."""
+    positions = get_row_positions(df)
+    if positions is not None and np.array_equal(positions, np.arange(len(positions))):
+        cube = get_derived(df, 'market_cube', build_market_cube)
+        if cube is not None and cube.n_rows == len(df):
+            return cube
+    return MarketCube.from_frame(df)
+
+
+def build_market_cube(df):
+    """Construit le cube d'une version du jeu de données, incrémentalement si possible
+
+    Le cube est conservé par fichier source : quand la nouvelle version prolonge la
+    précédente (offres ajoutées en fin de fichier), seules les nouvelles offres sont
+    agrégées ; sinon le cube est reconstruit."""
+    version = get_dataset_version(df)
+    if version is None:
+        return MarketCube.from_frame(df)
+
+    source = version.rsplit(':', 2)[0]
+    with _cubes_lock:
+        cached = _cubes.get(source)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if cached is not None and cached[1].extends(df):
+            previous = cached[1]
+            print(f"Mise à jour incrémentale du cube : {len(df) - previous.n_rows} nouvelles offres")
+            # Les pages encore ouvertes sur l'ancienne version gardent leur cube : on met à jour une copie
+            cube = _copy_cube(previous).update(df.iloc[previous.n_rows:])
+        else:
+            # Reconstruction complète : la matrice de compétences de cette version est réutilisée
+            cube = MarketCube.from_frame(df, skills=get_derived(df, 'skills_matrix', SkillsMatrix.from_frame))
+
+        _cubes[source] = (version, cube)
+        return cube
+
+
+def _copy_cube(cube):
+    copy = MarketCube(cube.dimensions)
+    copy.labels = {dim: list(labels) for dim, labels in cube.labels.items()}
+    copy.label_ids = {dim: dict(ids) for dim, ids in cube.label_ids.items()}
+    copy.cell_index = dict(cube.cell_index)
+    copy.cell_codes = cube.cell_codes.copy()
+    copy.counts = cube.counts.copy()
+    copy.experience_sums = cube.experience_sums.copy()
+    copy.experience_counts = cube.experience_counts.copy()
+    copy.vocabulary = list(cube.vocabulary)
+    copy.skill_ids = dict(cube.skill_ids)
+    copy.skill_counts = cube.skill_counts.copy()
+    copy.n_rows = cube.n_rows
+    copy._hash_columns = cube._hash_columns
+    copy._prefix_hash = cube._prefix_hash.copy()
+    return copy
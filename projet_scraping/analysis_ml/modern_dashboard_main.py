@@ -13,6 +13,8 @@ import time
 from utils import load_data, create_custom_theme, display_metric_card, display_recommendation_card
 from job_profiles_recommender import recommend_profiles
 from university_recommender import UniversityRecommender
+from skills_matrix import count_skills
+from sector_classifier import get_sector_flags
 
 # Importer les fonctions des autres fichiers
 from modern_dashboard import create_animated_header, display_modern_metric, display_profile_card, create_interactive_chart
@@ -34,24 +36,10 @@ create_custom_theme()
 def show_comparative_analysis(df):
     st.markdown("<h2 class='section-title'>Analyse Comparative IT vs Finance</h2>", unsafe_allow_html=True)
     
-    # Filtrer les données pour IT et Finance
-    it_keywords = ['IT', 'Informatique', 'Développement', 'Software', 'Web', 'Data', 'Cloud', 'Cybersécurité']
-    finance_keywords = ['Finance', 'Banque', 'Comptabilité', 'Audit', 'Assurance', 'Trading', 'Investment']
-    
-    # Fonction pour vérifier si une offre appartient à un secteur
-    def is_in_sector(row, keywords):
-        secteur = str(row['Secteur']).lower()
-        poste = str(row['Poste']).lower() if 'Poste' in row else ''
-        description = str(row['Description_Poste']).lower() if 'Description_Poste' in row else ''
-        
-        for keyword in keywords:
-            if keyword.lower() in secteur or keyword.lower() in poste or keyword.lower() in description:
-                return True
-        return False
-    
-    # Créer des masques pour les secteurs
-    df['is_it'] = df.apply(lambda row: is_in_sector(row, it_keywords), axis=1)
-    df['is_finance'] = df.apply(lambda row: is_in_sector(row, finance_keywords), axis=1)
+    # Marquer les offres IT et Finance (mots-clés dans le secteur, le poste ou la description)
+    sector_flags = get_sector_flags(df)
+    df['is_it'] = sector_flags['is_it']
+    df['is_finance'] = sector_flags['is_finance']
     
     # Filtrer les dataframes
     it_df = df[df['is_it']]
@@ -84,13 +72,7 @@ def show_comparative_analysis(df):
             )
         
         # Top compétences IT
-        all_it_skills = []
-        for skills_str in it_df['Competences'].dropna():
-            skills = [skill.strip() for skill in skills_str.split(',')]
-            all_it_skills.extend(skills)
-        
-        from collections import Counter
-        it_skills_counter = Counter(all_it_skills)
+        it_skills_counter = count_skills(it_df)
         top_it_skills = pd.DataFrame(it_skills_counter.most_common(5), columns=['Compétence', 'Nombre'])
         
         st.markdown("<h5 style='margin-top: 20px;'>Top 5 Compétences IT</h5>", unsafe_allow_html=True)
@@ -127,12 +109,7 @@ def show_comparative_analysis(df):
             )
         
         # Top compétences Finance
-        all_finance_skills = []
-        for skills_str in finance_df['Competences'].dropna():
-            skills = [skill.strip() for skill in skills_str.split(',')]
-            all_finance_skills.extend(skills)
-        
-        finance_skills_counter = Counter(all_finance_skills)
+        finance_skills_counter = count_skills(finance_df)
         top_finance_skills = pd.DataFrame(finance_skills_counter.most_common(5), columns=['Compétence', 'Nombre'])
         
         st.markdown("<h5 style='margin-top: 20px;'>Top 5 Compétences Finance</h5>", unsafe_allow_html=True)
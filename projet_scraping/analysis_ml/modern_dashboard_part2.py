@@ -3,6 +3,7 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from market_cube import get_market_cube
 
 # Définition des fonctions nécessaires
 def display_modern_metric(icon, value, label, delta=None, color="#4361ee"):
@@ -82,28 +83,30 @@ def show_market_analysis(df):
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     col1, col2, col3 = st.columns(3)
     
+    # Cube d'agrégats (secteur, année, contrat, ville) : les filtres sont résolus sans parcourir les offres
+    cube = get_market_cube(df)
+    
     with col1:
-        secteurs = ['Tous'] + sorted(df['Secteur'].unique().tolist())
+        secteurs = ['Tous'] + sorted(cube.value_counts('Secteur').index.tolist())
         secteur = st.selectbox('Secteur', secteurs)
     
     with col2:
-        annees = ['Toutes'] + sorted(df['Annee'].dropna().unique().astype(int).astype(str).tolist())
+        annees = ['Toutes'] + [str(a) for a in sorted(cube.value_counts('Annee').index.tolist())]
         annee = st.selectbox('Année', annees)
     
     with col3:
-        contrats = ['Tous'] + sorted(df['Contrat'].unique().tolist())
+        contrats = ['Tous'] + sorted(cube.value_counts('Contrat').index.tolist())
         contrat = st.selectbox('Type de Contrat', contrats)
     
     st.markdown("</div>", unsafe_allow_html=True)
     
     # Filtrer les données selon les sélections
-    filtered_df = df.copy()
-    if secteur != 'Tous':
-        filtered_df = filtered_df[filtered_df['Secteur'] == secteur]
-    if annee != 'Toutes':
-        filtered_df = filtered_df[filtered_df['Annee'] == int(annee)]
-    if contrat != 'Tous':
-        filtered_df = filtered_df[filtered_df['Contrat'] == contrat]
+    cells = cube.select(
+        Secteur=secteur if secteur != 'Tous' else None,
+        Annee=int(annee) if annee != 'Toutes' else None,
+        Contrat=contrat if contrat != 'Tous' else None
+    )
+    nb_offres = cube.total(cells)
     
     # Métriques clés avec animation
     st.markdown("<h3 class='subsection-title'>Métriques Clés</h3>", unsafe_allow_html=True)
@@ -111,15 +114,18 @@ def show_market_analysis(df):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
+        annees_offres = cube.value_counts('Annee')
+        derniere_annee = cube.max_label('Annee', cells)
+        offres_avant = int(annees_offres[annees_offres.index < derniere_annee].sum()) if derniere_annee is not None else 0
         display_modern_metric(
             "fa-briefcase",
             "Offres d'Emploi",
-            f"{len(filtered_df):,}",
-            f"+{len(filtered_df) - len(df[df['Annee'] < filtered_df['Annee'].max()])}" if annee == 'Toutes' else None
+            f"{nb_offres:,}",
+            f"+{nb_offres - offres_avant}" if annee == 'Toutes' else None
         )
     
     with col2:
-        avg_exp = filtered_df['Experience'].mean()
+        avg_exp = cube.mean_experience(cells)
         display_modern_metric(
             "fa-chart-line",
             "Expérience Moyenne",
@@ -127,7 +133,8 @@ def show_market_analysis(df):
         )
     
     with col3:
-        top_secteur = filtered_df['Secteur'].value_counts().index[0] if not filtered_df.empty else "N/A"
+        secteurs_selection = cube.value_counts('Secteur', cells)
+        top_secteur = secteurs_selection.index[0] if len(secteurs_selection) else "N/A"
         display_modern_metric(
             "fa-industry",
             "Secteur Principal",
@@ -135,7 +142,8 @@ def show_market_analysis(df):
         )
     
     with col4:
-        top_ville = filtered_df['Ville'].value_counts().index[0] if not filtered_df.empty else "N/A"
+        villes_selection = cube.value_counts('Ville', cells)
+        top_ville = villes_selection.index[0] if len(villes_selection) else "N/A"
         display_modern_metric(
             "fa-map-marker-alt",
             "Ville Principale",
@@ -150,7 +158,7 @@ def show_market_analysis(df):
     
     with tab1:
         # Distribution des offres par secteur
-        secteur_counts = filtered_df['Secteur'].value_counts().reset_index()
+        secteur_counts = cube.value_counts('Secteur', cells).reset_index()
         secteur_counts.columns = ['Secteur', 'Nombre']
         secteur_counts = secteur_counts.sort_values('Nombre', ascending=False).head(10)
         
@@ -166,7 +174,7 @@ def show_market_analysis(df):
     with tab2:
         # Évolution temporelle des offres
         if annee == 'Toutes':
-            evolution_df = df.groupby('Annee').size().reset_index(name='Nombre')
+            evolution_df = cube.counts_by('Annee').reset_index(name='Nombre')
             fig = create_interactive_chart(
                 evolution_df,
                 'Annee',
@@ -180,14 +188,7 @@ def show_market_analysis(df):
     
     with tab3:
         # Extraction et visualisation des compétences
-        all_skills = []
-        for skills_str in filtered_df['Competences'].dropna():
-            skills = [skill.strip() for skill in skills_str.split(',')]
-            all_skills.extend(skills)
-        
-        from collections import Counter
-        skills_counter = Counter(all_skills)
-        top_skills = pd.DataFrame(skills_counter.most_common(10), columns=['Compétence', 'Nombre'])
+        top_skills = pd.DataFrame(cube.top_skills(10, cells), columns=['Compétence', 'Nombre'])
         
         fig = create_interactive_chart(
             top_skills,
@@ -200,7 +201,7 @@ def show_market_analysis(df):
     
     with tab4:
         # Répartition géographique
-        geo_df = filtered_df['Ville'].value_counts().reset_index()
+        geo_df = cube.value_counts('Ville', cells).reset_index()
         geo_df.columns = ['Ville', 'Nombre']
         
         fig = create_interactive_chart(
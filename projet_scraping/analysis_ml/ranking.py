@@ -0,0 +1,49 @@
+import heapq
+import numpy as np
+from scipy import sparse
+
+
+def binary_skill_matrix(skill_lists, skill_ids):
+    """Construit une matrice creuse binaire lignes × compétences à partir de listes de compétences
+
+    Les compétences sont comparées en minuscules et celles absentes du vocabulaire sont ignorées."""
+    rows, cols = [], []
+    for row, skills in enumerate(skill_lists):
+        for skill in set(skill.lower() for skill in (skills or [])):
+            skill_id = skill_ids.get(skill)
+            if skill_id is not None:
+                rows.append(row)
+                cols.append(skill_id)
+
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(skill_lists), len(skill_ids))
+    )
+
+
+def top_n_items(scores, top_n, order):
+    """Retourne les top_n clés de score positif d'un dictionnaire, sans trier tous les scores
+
+    Sélection par tas borné ; à score égal, la clé qui vient en premier dans `order` passe devant."""
+    positive = ((key, score) for key, score in scores.items() if score > 0)
+    return [key for key, _ in heapq.nsmallest(top_n, positive, key=lambda item: (-item[1], order[item[0]]))]
+
+
+def top_n_rows(scores, top_n):
+    """Retourne, pour chaque ligne d'une matrice de scores entiers, les indices des top_n scores positifs
+
+    À score égal, l'indice le plus petit (ordre du catalogue) passe en premier."""
+    n_cols = scores.shape[1]
+    top_n = min(top_n, n_cols)
+    if top_n <= 0:
+        return [[] for _ in range(scores.shape[0])]
+
+    # Clé composite unique par ligne : score décroissant puis indice croissant
+    keys = -scores.astype(np.int64) * n_cols + np.arange(n_cols)
+    if top_n < n_cols:
+        candidates = np.argpartition(keys, top_n - 1, axis=1)[:, :top_n]
+    else:
+        candidates = np.broadcast_to(np.arange(n_cols), keys.shape)
+    order = np.take_along_axis(candidates, np.argsort(np.take_along_axis(keys, candidates, axis=1), axis=1), axis=1)
+    top_scores = np.take_along_axis(scores, order, axis=1)
+    return [row[row_scores > 0].tolist() for row, row_scores in zip(order, top_scores)]
@@ -0,0 +1,185 @@
+import re
+import bisect
+import hashlib
+import threading
+import unicodedata
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from scipy import sparse
+
+# Champs indexés et poids de chaque champ dans le score
+SEARCH_FIELDS = {'Poste': 3.0, 'Entreprise': 1.5, 'Competences': 1.0}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+[+#]*')
+
+# Index déjà construits (les plus récents), par empreinte des colonnes indexées
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+MAX_INDEXES = 4
+
+
+def fold_text(text):
+    """Met un texte en minuscules et supprime les accents ('Développeur' → 'developpeur')"""
+    decomposed = unicodedata.normalize('NFKD', str(text).lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Découpe un texte en mots normalisés (sans accents, en minuscules)"""
+    return TOKEN_PATTERN.findall(fold_text(text))
+
+
+class SearchIndex:
+    """Index inversé mots → offres sur plusieurs champs, avec score pondéré (poids × idf)"""
+
+    def __init__(self, factorized, n_rows, fields=None):
+        fields = fields or SEARCH_FIELDS
+        self.n_rows = n_rows
+        token_ids = {}
+        matrices = []
+
+        for field, (codes, uniques) in factorized.items():
+            # Chaque valeur distincte d'un champ n'est découpée qu'une seule fois
+            value_rows, value_cols = [], []
+            for value_id, value in enumerate(uniques):
+                for token in set(tokenize(value)):
+                    value_rows.append(value_id)
+                    value_cols.append(token_ids.setdefault(token, len(token_ids)))
+            values = sparse.csr_matrix(
+                (np.full(len(value_rows), fields.get(field, 1.0)), (value_rows, value_cols)),
+                shape=(len(uniques), max(len(token_ids), 1))
+            )
+
+            valid = codes >= 0
+            rows = sparse.csr_matrix(
+                (np.ones(valid.sum()), (np.flatnonzero(valid), codes[valid])),
+                shape=(n_rows, len(uniques))
+            )
+            matrices.append(rows @ values)
+
+        n_tokens = max(len(token_ids), 1)
+        total = sparse.csr_matrix((n_rows, n_tokens))
+        for matrix in matrices:
+            matrix.resize((n_rows, n_tokens))
+            total = total + matrix
+
+        # Listes d'occurrences : une ligne par mot, offres triées par position
+        self.postings = total.T.tocsr()
+        self.postings.sort_indices()
+
+        document_frequency = np.diff(self.postings.indptr)
+        self.idf = np.log(1 + n_rows / np.maximum(document_frequency, 1))
+
+        # Vocabulaire trié pour la recherche par préfixe (dernier mot en cours de saisie)
+        self.vocabulary = sorted(token_ids)
+        self.vocabulary_ids = np.array([token_ids[token] for token in self.vocabulary], dtype=np.int64)
+        self.token_ids = token_ids
+
+    @classmethod
+    def from_frame(cls, df, fields=None):
+        """Construit l'index à partir des colonnes d'un DataFrame"""
+        return cls(factorize_fields(df, fields), len(df), fields)
+
+    def _matching_tokens(self, token, prefix=False):
+        if not prefix:
+            token_id = self.token_ids.get(token)
+            return np.array([] if token_id is None else [token_id], dtype=np.int64)
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + '\uffff')
+        return self.vocabulary_ids[start:end]
+
+    def _token_scores(self, token_ids):
+        """Offres contenant l'un des mots donnés et leur score cumulé (positions triées)"""
+        rows = self.postings[token_ids]
+        weights = rows.data * np.repeat(self.idf[token_ids], np.diff(rows.indptr))
+        positions, inverse = np.unique(rows.indices, return_inverse=True)
+        return positions, np.bincount(inverse, weights=weights, minlength=len(positions))
+
+    def search(self, query, page=1, per_page=20):
+        """Recherche les offres contenant tous les mots de la requête (le dernier comme préfixe)
+
+        Retourne (positions des offres de la page, scores, nombre total de résultats).
+        Les résultats sont classés par score décroissant puis par ordre des offres."""
+        tokens = tokenize(query)
+        if not tokens:
+            positions = np.arange(self.n_rows)
+            scores = np.zeros(self.n_rows)
+        else:
+            positions, scores = None, None
+            unique_tokens = list(dict.fromkeys(tokens))
+            for token in unique_tokens:
+                # Le dernier mot saisi est recherché comme préfixe (il peut être incomplet)
+                token_positions, token_scores = self._token_scores(
+                    self._matching_tokens(token, prefix=token == tokens[-1])
+                )
+                if positions is None:
+                    positions, scores = token_positions, token_scores
+                else:
+                    # Intersection des listes triées : seules les offres contenant tous les mots restent
+                    positions, ours, theirs = np.intersect1d(positions, token_positions,
+                                                             assume_unique=True, return_indices=True)
+                    scores = scores[ours] + token_scores[theirs]
+                if len(positions) == 0:
+                    break
+
+        total = len(positions)
+        start = max(page - 1, 0) * per_page
+        end = min(start + per_page, total)
+        if start >= total:
+            return np.array([], dtype=np.int64), np.array([]), total
+
+        if tokens:
+            if end < total:
+                # Sélection partielle des `end` meilleurs résultats avant le tri
+                cut = np.argpartition(-scores, end - 1)[:end]
+                threshold = scores[cut].min()
+                keep = np.flatnonzero(scores >= threshold)
+            else:
+                keep = np.arange(total)
+            order = keep[np.lexsort((positions[keep], -scores[keep]))][start:end]
+        else:
+            order = np.arange(start, end)
+        return positions[order], scores[order], total
+
+    def search_all(self, query):
+        """Retourne les positions de toutes les offres correspondant à la requête, classées"""
+        positions, _, _ = self.search(query, page=1, per_page=self.n_rows or 1)
+        return positions
+
+
+def factorize_fields(df, fields=None):
+    """Factorise les colonnes indexées (valeurs distinctes et codes des lignes)"""
+    fields = fields or SEARCH_FIELDS
+    return {
+        field: pd.factorize(df[field], sort=False)
+        for field in fields if field in df.columns
+    }
+
+
+def _fingerprint(factorized, n_rows):
+    sha = hashlib.sha1(str(n_rows).encode('utf-8'))
+    for field, (codes, uniques) in factorized.items():
+        sha.update(field.encode('utf-8'))
+        sha.update(np.ascontiguousarray(codes).tobytes())
+        sha.update('\x1f'.join(map(str, uniques)).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def get_search_index(df, fields=None):
+    """Retourne l'index de recherche d'un DataFrame, reconstruit seulement si les colonnes
+    indexées ont changé (le script Streamlit est réexécuté à chaque interaction)"""
+    factorized = factorize_fields(df, fields)
+    key = _fingerprint(factorized, len(df))
+
+    with _indexes_lock:
+        if key in _indexes:
+            _indexes.move_to_end(key)
+            return _indexes[key]
+
+    index = SearchIndex(factorized, len(df), fields)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
@@ -0,0 +1,65 @@
+import re
+import numpy as np
+import pandas as pd
+from data_store import get_derived, get_row_positions
+
+# Mots-clés définissant chaque secteur de l'analyse comparative
+SECTOR_KEYWORDS = {
+    'is_it': ['IT', 'Informatique', 'Développement', 'Software', 'Web', 'Data', 'Cloud', 'Cybersécurité'],
+    'is_finance': ['Finance', 'Banque', 'Comptabilité', 'Audit', 'Assurance', 'Trading', 'Investment']
+}
+
+# Colonnes dans lesquelles les mots-clés sont recherchés
+SECTOR_COLUMNS = ['Secteur', 'Poste', 'Description_Poste']
+
+
+def compile_keywords(keywords):
+    """Compile une liste de mots-clés en une seule expression régulière (recherche de sous-chaîne)"""
+    return re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords))
+
+
+def _contains_any(series, pattern):
+    """Teste le motif sur chaque valeur distincte d'une colonne, puis propage aux lignes"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, sort=False)
+
+    matches = np.fromiter(
+        (pattern.search(str(value).lower()) is not None for value in uniques),
+        dtype=bool, count=len(uniques)
+    )
+    # Les valeurs manquantes sont testées comme la chaîne 'nan', comme avec str(valeur)
+    nan_match = pattern.search('nan') is not None
+    return np.where(codes >= 0, matches[np.maximum(codes, 0)] if len(matches) else False, nan_match)
+
+
+def classify_sectors(df, sector_keywords=None):
+    """Marque l'appartenance de chaque offre aux secteurs en une passe par colonne
+
+    Une offre appartient à un secteur si l'un de ses mots-clés apparaît (sans tenir compte
+    de la casse) dans le secteur, l'intitulé du poste ou la description."""
+    sector_keywords = sector_keywords or SECTOR_KEYWORDS
+    columns = [col for col in SECTOR_COLUMNS if col in df.columns]
+
+    flags = {}
+    for flag, keywords in sector_keywords.items():
+        pattern = compile_keywords(keywords)
+        mask = np.zeros(len(df), dtype=bool)
+        for col in columns:
+            mask |= _contains_any(df[col], pattern)
+        flags[flag] = mask
+
+    return pd.DataFrame(flags, index=df.index)
+
+
+def get_sector_flags(df):
+    """Retourne les indicateurs de secteur d'un DataFrame, calculés une seule fois par version
+    du jeu de données partagé puis relus par position pour ses sous-ensembles"""
+    positions = get_row_positions(df)
+    if positions is not None:
+        flags = get_derived(df, 'sector_flags', classify_sectors)
+        if flags is not None:
+            return pd.DataFrame(flags.to_numpy()[positions], index=df.index, columns=flags.columns)
+    return classify_sectors(df)
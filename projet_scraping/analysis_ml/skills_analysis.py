@@ -4,56 +4,26 @@ import seaborn as sns
 import streamlit as st
 from collections import Counter
 import re
+from utils import load_data
+from skills_matrix import count_skills, grouped_skill_counts, counters_by_group
 
 def load_data_with_skills():
-    """Charge les données avec les compétences générées"""
-    try:
-        # Essayer d'abord de charger les données enrichies avec compétences
-        path = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_with_skills.csv"
-        df = pd.read_csv(path)
-        if 'Competences' not in df.columns:
-            raise FileNotFoundError("Le fichier existe mais ne contient pas de compétences")
-    except FileNotFoundError:
-        # Si le fichier n'existe pas, générer les compétences
-        print("Génération des compétences en cours...")
-        from skills_generator import SkillsGenerator
-        
-        # Charger les données originales
-        path_orig = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_cleaned.csv"
-        df = pd.read_csv(path_orig)
-        
-        # Générer les compétences
-        skills_gen = SkillsGenerator()
-        df = skills_gen.enrich_dataframe(df)
-        
-        # Sauvegarder pour utilisation future
-        df.to_csv(path, index=False)
-        print("Compétences générées et sauvegardées.")
-    
-    return df
+    """Charge les données avec les compétences générées (jeu de données partagé)"""
+    return load_data()
 
 def extract_skills_from_df(df):
     """Extrait toutes les compétences du DataFrame et compte leur fréquence"""
-    all_skills = []
-    
-    for skills_str in df['Competences'].dropna():
-        # Diviser la chaîne de compétences et nettoyer
-        skills = [skill.strip() for skill in skills_str.split(',')]
-        all_skills.extend(skills)
-    
-    # Compter les occurrences
-    skills_counter = Counter(all_skills)
-    
-    return skills_counter
+    # Somme des colonnes de la matrice creuse offres × compétences (calculée une seule fois)
+    return count_skills(df)
 
 def skills_by_sector(df):
     """Analyse les compétences les plus demandées par secteur"""
-    sectors = df['Secteur'].unique()
-    sector_skills = {}
+    table = grouped_skill_counts(df, 'Secteur')
+    sector_skills = counters_by_group(table, 'Secteur')
     
-    for sector in sectors:
-        sector_df = df[df['Secteur'] == sector]
-        sector_skills[sector] = extract_skills_from_df(sector_df)
+    # Conserver les secteurs sans compétences renseignées
+    for sector in df['Secteur'].dropna().unique():
+        sector_skills.setdefault(sector, Counter())
     
     return sector_skills
 
@@ -66,26 +36,25 @@ def skills_by_experience(df):
         labels=['Junior (0-2 ans)', 'Intermédiaire (3-5 ans)', 'Senior (6-10 ans)', 'Expert (10+ ans)']
     )
     
-    exp_categories = df['Experience_Cat'].dropna().unique()
-    exp_skills = {}
+    table = grouped_skill_counts(df, 'Experience_Cat')
+    exp_skills = counters_by_group(table, 'Experience_Cat')
     
-    for exp_cat in exp_categories:
-        exp_df = df[df['Experience_Cat'] == exp_cat]
-        exp_skills[exp_cat] = extract_skills_from_df(exp_df)
+    for exp_cat in df['Experience_Cat'].dropna().unique():
+        exp_skills.setdefault(exp_cat, Counter())
     
     return exp_skills
 
 def skills_evolution(df):
     """Analyse l'évolution des compétences au fil du temps"""
     df['Annee'] = pd.to_datetime(df['Date_De_Publication'], errors='coerce').dt.year
-    years = sorted(df['Annee'].dropna().unique())
     
-    year_skills = {}
-    for year in years:
-        year_df = df[df['Annee'] == year]
-        year_skills[year] = extract_skills_from_df(year_df)
+    table = grouped_skill_counts(df, 'Annee')
+    year_skills = counters_by_group(table, 'Annee')
+    
+    for year in df['Annee'].dropna().unique():
+        year_skills.setdefault(year, Counter())
     
-    return year_skills
+    return dict(sorted(year_skills.items()))
 
 def run_skills_analysis():
     """Exécute l'analyse des compétences et affiche les résultats dans Streamlit"""
@@ -1,117 +1,98 @@
 import pandas as pd
 import re
 import random
+import hashlib
+import numbers
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from catalog import load_catalog, attach_shared_state
+from domain_cache import DomainCache, normalize_title, vocabulary_hash
 
 class SkillsGenerator:
-    def __init__(self):
-        # Base de connaissances des compétences par domaine IT et Finance
-        self.skills_database = {
-            # Domaines Data
-            'data analyst': ['SQL', 'Excel', 'Tableau', 'Power BI', 'Python', 'R', 'Data Visualization', 
-                            'ETL', 'Statistical Analysis', 'Data Cleaning', 'Data Modeling', 'Business Intelligence'],
-            
-            'data scientist': ['Python', 'R', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 
-                              'Statistical Analysis', 'NLP', 'Computer Vision', 'Big Data', 'SQL', 'Data Mining',
-                              'Feature Engineering', 'Jupyter', 'Scikit-learn', 'Pandas', 'NumPy'],
-            
-            'data engineer': ['SQL', 'Python', 'Spark', 'Hadoop', 'ETL', 'Data Pipelines', 'AWS', 'Azure', 
-                             'GCP', 'Docker', 'Kubernetes', 'NoSQL', 'MongoDB', 'Cassandra', 'Kafka', 'Airflow'],
-            
-            # Domaines Cybersécurité
-            'cybersecurity': ['Network Security', 'Penetration Testing', 'SIEM', 'Firewall', 'IDS/IPS', 
-                             'Security Auditing', 'Risk Assessment', 'Cryptography', 'Ethical Hacking', 
-                             'Incident Response', 'Security+', 'CISSP', 'OSCP'],
-            
-            'security analyst': ['SIEM', 'Threat Intelligence', 'Vulnerability Assessment', 'Security Controls', 
-                                'Log Analysis', 'Incident Response', 'Compliance', 'Risk Management', 
-                                'Security Frameworks', 'Network Security'],
-            
-            # Domaines Développement
-            'software engineer': ['Java', 'Python', 'C#', 'JavaScript', 'Git', 'CI/CD', 'Agile', 'Scrum', 
-                                 'OOP', 'Design Patterns', 'REST API', 'Unit Testing', 'Microservices', 
-                                 'Cloud Computing', 'Linux'],
-            
-            'python developer': ['Python', 'Django', 'Flask', 'FastAPI', 'SQL', 'ORM', 'REST API', 
-                               'Unit Testing', 'Git', 'Docker', 'AWS', 'Pandas', 'NumPy'],
-            
-            'full stack developer': ['JavaScript', 'TypeScript', 'React', 'Angular', 'Vue.js', 'Node.js', 
-                                    'Express', 'HTML', 'CSS', 'SQL', 'NoSQL', 'Git', 'Docker', 'REST API', 
-                                    'Responsive Design', 'AWS/Azure/GCP'],
-            
-            # Domaines Cloud
-            'cloud engineer': ['AWS', 'Azure', 'GCP', 'Terraform', 'CloudFormation', 'Docker', 'Kubernetes', 
-                              'IaC', 'CI/CD', 'Networking', 'Security', 'Linux', 'Python', 'Bash'],
-            
-            'devops': ['Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'Terraform', 'Ansible', 
-                      'Prometheus', 'Grafana', 'ELK Stack', 'Linux', 'Bash', 'Python', 'AWS/Azure/GCP', 'CI/CD'],
-            
-            # Domaines Finance
-            'financial analyst': ['Financial Modeling', 'Excel', 'Financial Reporting', 'Budgeting', 
-                                 'Forecasting', 'Valuation', 'Bloomberg Terminal', 'Financial Statement Analysis', 
-                                 'Power BI', 'SQL', 'Risk Assessment'],
-            
-            'finance': ['Financial Analysis', 'Accounting', 'Excel', 'Financial Reporting', 'Budgeting', 
-                       'Forecasting', 'ERP Systems', 'SAP', 'Oracle Financials', 'Risk Management'],
-            
-            'accounting': ['General Ledger', 'Financial Reporting', 'GAAP', 'IFRS', 'Tax Accounting', 
-                          'Audit', 'ERP Systems', 'Excel', 'Financial Analysis', 'Reconciliation'],
-            
-            'risk management': ['Risk Assessment', 'Risk Modeling', 'Compliance', 'Regulatory Frameworks', 
-                               'Basel III', 'Stress Testing', 'Credit Risk', 'Market Risk', 'Operational Risk', 
-                               'Risk Mitigation Strategies'],
-            
-            # Domaines IT Management
-            'it manager': ['Project Management', 'Team Leadership', 'Budgeting', 'Strategic Planning', 
-                          'Vendor Management', 'ITIL', 'Service Delivery', 'Risk Management', 
-                          'Business Relationship Management', 'IT Governance'],
-            
-            'network engineer': ['Cisco', 'Routing', 'Switching', 'Firewalls', 'VPN', 'VLAN', 'TCP/IP', 
-                               'Network Security', 'Troubleshooting', 'Network Monitoring', 'WAN', 'LAN']
-        }
+    def __init__(self, cache_path=None, cache_size=100000, seed=None):
+        # Base de connaissances des compétences par domaine IT et Finance (catalogs/skills_database.json)
+        catalog = load_catalog('skills_database')
+        self.skills_database = catalog.copy_data()
         
+        # Vectorizer et matrice des domaines, construits une seule fois par version du catalogue
+        attach_shared_state(self, catalog, self._build_domain_matrix)
+        
+        # Graine optionnelle : si elle est fixée, les compétences d'une offre sont reproductibles
+        self.seed = seed
+        
+        # Cache titre → domaine (persistant si un chemin est fourni)
+        self.domain_cache = DomainCache(vocabulary_hash(self.skills_database), cache_path, cache_size)
+        
+    def _build_domain_matrix(self, catalog):
+        """Prépare le vectorizer TF-IDF et la matrice des domaines"""
         # Vectorizer pour la similarité textuelle
         self.vectorizer = TfidfVectorizer(stop_words='english')
         
         # Préparer les données pour la similarité
         self.domains = list(self.skills_database.keys())
         self.domain_matrix = self.vectorizer.fit_transform(self.domains)
-        
+    
     def find_closest_domain(self, job_title):
         """Trouve le domaine le plus proche du titre de poste"""
-        job_title = job_title.lower()
+        return self.find_closest_domains([job_title])[0]
+    
+    def find_closest_domains(self, job_titles, batch_size=10000):
+        """Trouve le domaine le plus proche pour une liste de titres de poste (en lot)"""
+        job_titles = [normalize_title(title) for title in job_titles]
+        
+        # Ne résoudre chaque titre distinct qu'une seule fois, en consultant d'abord le cache
+        unique_titles = list(dict.fromkeys(job_titles))
+        resolved = self.domain_cache.get_many(unique_titles)
+        computed = {}
+        remaining = []
         
         # Vérifier d'abord si un domaine exact est dans le titre
-        for domain in self.domains:
-            if domain in job_title:
-                return domain
-        
-        # Sinon, utiliser la similarité textuelle
-        job_vector = self.vectorizer.transform([job_title])
-        similarities = cosine_similarity(job_vector, self.domain_matrix).flatten()
-        closest_idx = np.argmax(similarities)
-        
-        # Retourner le domaine le plus similaire si la similarité est supérieure à un seuil
-        if similarities[closest_idx] > 0.2:  # Seuil de similarité
-            return self.domains[closest_idx]
-        else:
-            # Fallback à un domaine générique basé sur des mots-clés
-            if any(kw in job_title for kw in ['data', 'analyst', 'scientist', 'analytics']):
-                return 'data analyst'
-            elif any(kw in job_title for kw in ['develop', 'program', 'code', 'software']):
-                return 'software engineer'
-            elif any(kw in job_title for kw in ['cloud', 'aws', 'azure', 'gcp']):
-                return 'cloud engineer'
-            elif any(kw in job_title for kw in ['security', 'cyber', 'hack', 'threat']):
-                return 'cybersecurity'
-            elif any(kw in job_title for kw in ['finance', 'financial', 'account', 'accounting']):
-                return 'finance'
+        for title in unique_titles:
+            if title in resolved:
+                continue
+            for domain in self.domains:
+                if domain in title:
+                    computed[title] = domain
+                    break
             else:
-                return 'software engineer'  # Domaine par défaut
+                remaining.append(title)
+        
+        # Sinon, utiliser la similarité textuelle (une seule transformation TF-IDF par lot)
+        for start in range(0, len(remaining), batch_size):
+            batch = remaining[start:start + batch_size]
+            similarities = cosine_similarity(self.vectorizer.transform(batch), self.domain_matrix)
+            closest_idx = similarities.argmax(axis=1)
+            best_scores = similarities[np.arange(len(batch)), closest_idx]
+            
+            for title, idx, best in zip(batch, closest_idx, best_scores):
+                # Retourner le domaine le plus similaire si la similarité est supérieure à un seuil
+                if best > 0.2:  # Seuil de similarité
+                    computed[title] = self.domains[idx]
+                else:
+                    computed[title] = self._keyword_domain(title)
+        
+        self.domain_cache.put_many(computed)
+        resolved.update(computed)
+        
+        return [resolved[title] for title in job_titles]
+    
+    def _keyword_domain(self, job_title):
+        """Fallback à un domaine générique basé sur des mots-clés"""
+        if any(kw in job_title for kw in ['data', 'analyst', 'scientist', 'analytics']):
+            return 'data analyst'
+        elif any(kw in job_title for kw in ['develop', 'program', 'code', 'software']):
+            return 'software engineer'
+        elif any(kw in job_title for kw in ['cloud', 'aws', 'azure', 'gcp']):
+            return 'cloud engineer'
+        elif any(kw in job_title for kw in ['security', 'cyber', 'hack', 'threat']):
+            return 'cybersecurity'
+        elif any(kw in job_title for kw in ['finance', 'financial', 'account', 'accounting']):
+            return 'finance'
+        else:
+            return 'software engineer'  # Domaine par défaut
     
-    def generate_skills(self, job_title, sector, num_skills=5):
+    def generate_skills(self, job_title, sector, num_skills=5, posting_id=None):
         """Génère des compétences basées sur le titre du poste et le secteur"""
         # Normaliser les entrées
         job_title = job_title.lower() if job_title else ''
@@ -120,36 +101,81 @@ class SkillsGenerator:
         # Trouver le domaine le plus proche
         domain = self.find_closest_domain(job_title if job_title else sector)
         
+        return self.draw_skills(domain, num_skills, self.posting_rng(posting_id, job_title))
+    
+    def posting_rng(self, posting_id, job_title):
+        """Retourne le générateur aléatoire d'une offre (déterministe si une graine est fixée)"""
+        if self.seed is None:
+            return random
+        
+        # Graine stable entre processus et exécutions (contrairement à hash())
+        key = f"{self.seed}|{self.posting_key(posting_id)}|{job_title}"
+        digest = hashlib.sha256(key.encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+    
+    @staticmethod
+    def posting_key(posting_id):
+        """Forme canonique d'un identifiant d'offre (12, 12.0 et '12' donnent la même graine)"""
+        if posting_id is None or (pd.api.types.is_scalar(posting_id) and pd.isna(posting_id)):
+            return ''
+        if isinstance(posting_id, numbers.Real) and float(posting_id).is_integer():
+            # Identifiants entiers lus en float64 quand une valeur manque dans le lot
+            return str(int(posting_id))
+        return str(posting_id).strip()
+    
+    def draw_skills(self, domain, num_skills=5, rng=random):
+        """Tire au hasard des compétences pour un domaine donné"""
         # Obtenir les compétences pour ce domaine
         domain_skills = self.skills_database.get(domain, self.skills_database['software engineer'])
         
         # Sélectionner un nombre aléatoire de compétences (entre num_skills et num_skills+3)
-        num_to_select = random.randint(num_skills, min(num_skills+3, len(domain_skills)))
-        selected_skills = random.sample(domain_skills, num_to_select)
+        num_to_select = rng.randint(num_skills, min(num_skills+3, len(domain_skills)))
+        selected_skills = rng.sample(domain_skills, num_to_select)
         
         # Ajouter quelques compétences génériques si nécessaire
         generic_skills = ['Communication', 'Problem Solving', 'Teamwork', 'Analytical Thinking', 
                          'Project Management', 'Time Management', 'Attention to Detail']
         
-        if random.random() < 0.7:  # 70% de chance d'ajouter des compétences génériques
-            num_generic = random.randint(1, 3)
-            selected_skills.extend(random.sample(generic_skills, num_generic))
+        if rng.random() < 0.7:  # 70% de chance d'ajouter des compétences génériques
+            num_generic = rng.randint(1, 3)
+            selected_skills.extend(rng.sample(generic_skills, num_generic))
         
         return selected_skills
     
-    def enrich_dataframe(self, df, job_title_col='Poste', sector_col='Secteur', skills_col='Competences'):
-        """Enrichit un DataFrame avec des compétences générées"""
+    def enrich_dataframe(self, df, job_title_col='Poste', sector_col='Secteur', skills_col='Competences', id_col='Id'):
+        """Enrichit un DataFrame avec des compétences générées (traitement en lot)"""
         if skills_col not in df.columns:
             df[skills_col] = None
+        elif pd.api.types.is_numeric_dtype(df[skills_col]):
+            # Colonne entièrement vide lue comme float64 : la passer en texte avant d'y écrire
+            df[skills_col] = df[skills_col].astype(object)
+        
+        # Ne générer des compétences que si la colonne est vide
+        missing = df[skills_col].isna() | (df[skills_col] == '')
+        if not missing.any():
+            return df
         
-        for idx, row in df.iterrows():
-            # Ne générer des compétences que si la colonne est vide
-            if pd.isna(row[skills_col]) or row[skills_col] == '' or row[skills_col] is None:
-                job_title = row[job_title_col] if job_title_col in df.columns and not pd.isna(row[job_title_col]) else ''
-                sector = row[sector_col] if sector_col in df.columns and not pd.isna(row[sector_col]) else ''
-                
-                skills = self.generate_skills(job_title, sector)
-                df.at[idx, skills_col] = ', '.join(skills)
+        def text_column(col):
+            if col not in df.columns:
+                return pd.Series('', index=df.index[missing])
+            return df.loc[missing, col].fillna('').astype(str)
+        
+        # Le titre du poste sert de requête, le secteur prend le relais s'il est vide
+        job_titles = text_column(job_title_col)
+        sectors = text_column(sector_col)
+        queries = job_titles.where(job_titles != '', sectors)
+        
+        domains = self.find_closest_domains(queries.tolist())
+        
+        if self.seed is None:
+            df.loc[missing, skills_col] = [', '.join(self.draw_skills(domain)) for domain in domains]
+        else:
+            # Tirage déterministe par offre : fonction de (identifiant, titre, graine)
+            posting_ids = df.loc[missing, id_col].tolist() if id_col in df.columns else [None] * len(domains)
+            df.loc[missing, skills_col] = [
+                ', '.join(self.draw_skills(domain, rng=self.posting_rng(posting_id, title.lower())))
+                for domain, posting_id, title in zip(domains, posting_ids, job_titles)
+            ]
         
         return df
 
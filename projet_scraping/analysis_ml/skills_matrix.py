@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from collections import Counter
+from scipy import sparse
+from data_store import SKILLS_LIST_COLUMN, get_derived, get_row_positions
+
+
+def _first_ranks(rows, codes, shape):
+    """Rang (à partir de 1) de la première occurrence de chaque compétence dans son offre"""
+    ranks = pd.Series(rows).groupby(rows).cumcount().to_numpy() + 1
+    first = pd.DataFrame({'row': rows, 'col': codes, 'rank': ranks}).drop_duplicates(['row', 'col'])
+    return sparse.csr_matrix(
+        (first['rank'].to_numpy(dtype=np.int64), (first['row'].to_numpy(), first['col'].to_numpy())),
+        shape=shape
+    )
+
+
+class SkillsMatrix:
+    """Matrice d'incidence creuse offres × compétences (format CSR)
+
+    Les colonnes suivent l'ordre de première apparition des compétences ; `first_ranks`
+    conserve la place de chaque compétence dans son offre, pour départager les égalités
+    dans l'ordre d'apparition d'un sous-ensemble de lignes (comme un Counter)."""
+
+    def __init__(self, matrix, vocabulary, first_ranks=None):
+        self.matrix = matrix.tocsr()
+        self.vocabulary = list(vocabulary)
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocabulary)}
+        # Sans rangs connus, les compétences d'une même offre sont ordonnées par colonne
+        self.first_ranks = first_ranks.tocsr() if first_ranks is not None else (self.matrix > 0).astype(np.int64)
+        self.max_rank = int(self.first_ranks.data.max()) if self.first_ranks.nnz else 0
+        # Fréquences globales précalculées (cas le plus fréquent : aucun filtre)
+        self.total_counts = np.asarray(self.matrix.sum(axis=0)).ravel()
+
+    @classmethod
+    def from_skills(cls, skills):
+        """Construit la matrice à partir d'une série de chaînes 'compétence1, compétence2, ...'"""
+        skills = pd.Series(skills).reset_index(drop=True)
+        tokens = skills[skills.map(lambda s: isinstance(s, str))].str.split(',').explode().str.strip()
+
+        codes, vocabulary = pd.factorize(tokens, sort=False)
+        rows = tokens.index.to_numpy(dtype=np.int64)
+        data = np.ones(len(codes), dtype=np.int32)
+
+        # Les doublons (même compétence répétée dans une offre) sont additionnés comme avec Counter
+        matrix = sparse.coo_matrix(
+            (data, (rows, codes)),
+            shape=(len(skills), len(vocabulary))
+        ).tocsr()
+        return cls(matrix, vocabulary, _first_ranks(rows, codes, matrix.shape))
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists):
+        """Construit la matrice à partir d'une série de listes de compétences déjà découpées"""
+        lengths = np.fromiter((len(skills) for skills in skill_lists), dtype=np.int64, count=len(skill_lists))
+        rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+        tokens = [skill for skills in skill_lists for skill in skills]
+
+        codes, vocabulary = pd.factorize(pd.Series(tokens, dtype=object), sort=False)
+        matrix = sparse.coo_matrix(
+            (np.ones(len(codes), dtype=np.int32), (rows, codes)),
+            shape=(len(lengths), len(vocabulary))
+        ).tocsr()
+        return cls(matrix, vocabulary, _first_ranks(rows, codes, matrix.shape))
+
+    @classmethod
+    def from_frame(cls, df, skills_col='Competences'):
+        """Construit la matrice à partir de la colonne des compétences d'un DataFrame
+
+        La colonne déjà découpée du magasin colonnaire est utilisée si elle est présente."""
+        if skills_col == 'Competences' and SKILLS_LIST_COLUMN in df.columns:
+            return cls.from_skill_lists(df[SKILLS_LIST_COLUMN])
+        return cls.from_skills(df[skills_col])
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @staticmethod
+    def _rows(rows):
+        rows = np.asarray(rows)
+        return np.flatnonzero(rows) if rows.dtype == bool else rows
+
+    def counts(self, rows=None):
+        """Retourne le vecteur des fréquences de compétences pour un sous-ensemble de lignes"""
+        if rows is None:
+            return self.total_counts
+        return np.asarray(self.matrix[self._rows(rows)].sum(axis=0)).ravel()
+
+    def first_appearance(self, rows=None):
+        """Clé d'ordre de première apparition de chaque compétence dans un sous-ensemble de lignes
+
+        Les lignes sont parcourues dans l'ordre donné ; les compétences absentes ont la clé maximale."""
+        if rows is None:
+            return np.arange(len(self.vocabulary), dtype=np.int64)
+        ranks = self.first_ranks[self._rows(rows)].tocoo()
+        keys = ranks.row.astype(np.int64) * (self.max_rank + 1) + ranks.data
+        first = np.full(len(self.vocabulary), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, ranks.col, keys)
+        return first
+
+    def counter(self, rows=None):
+        """Retourne les fréquences de compétences sous forme de Counter (ordre d'apparition)"""
+        counts = self.counts(rows)
+        nonzero = np.flatnonzero(counts)
+        if rows is not None:
+            nonzero = nonzero[np.argsort(self.first_appearance(rows)[nonzero], kind='stable')]
+        return Counter({self.vocabulary[i]: int(counts[i]) for i in nonzero})
+
+    def most_common(self, n=None, rows=None):
+        """Retourne les n compétences les plus fréquentes pour un sous-ensemble de lignes
+
+        À égalité, les compétences sont classées par première apparition dans ces lignes,
+        comme avec Counter.most_common."""
+        counts = self.counts(rows)
+        nonzero = np.flatnonzero(counts)
+        if n is not None and n < len(nonzero):
+            # Sélection partielle : seules les compétences au moins aussi fréquentes que la n-ième sont triées
+            top = nonzero[np.argpartition(-counts[nonzero], n - 1)[:n]]
+            threshold = counts[top].min()
+            nonzero = nonzero[counts[nonzero] >= threshold]
+        first = self.first_appearance(rows)[nonzero]
+        order = nonzero[np.lexsort((first, -counts[nonzero]))]
+        if n is not None:
+            order = order[:n]
+        return [(self.vocabulary[i], int(counts[i])) for i in order]
+
+
+def get_skills_matrix(df):
+    """Retourne la matrice de compétences d'un DataFrame et les positions de ses lignes
+
+    Pour un sous-ensemble du jeu de données partagé, la matrice complète est calculée une
+    seule fois par version et les lignes sont retrouvées par leur position."""
+    positions = get_row_positions(df)
+    if positions is not None:
+        matrix = get_derived(df, 'skills_matrix', SkillsMatrix.from_frame)
+        if matrix is not None:
+            return matrix, positions
+    return SkillsMatrix.from_frame(df), None
+
+
+def count_skills(df):
+    """Compte la fréquence de chaque compétence dans un DataFrame"""
+    matrix, positions = get_skills_matrix(df)
+    if positions is not None and len(positions) == matrix.shape[0]:
+        positions = None if np.array_equal(positions, np.arange(matrix.shape[0])) else positions
+    return matrix.counter(positions)
+
+
+def top_skills(df, n=10):
+    """Retourne les n compétences les plus demandées d'un DataFrame sous forme de liste (compétence, nombre)"""
+    matrix, positions = get_skills_matrix(df)
+    return matrix.most_common(n, positions)
+
+
+def grouped_skill_counts(df, by, name=None):
+    """Compte les compétences par groupe en une seule passe et retourne une table longue
+
+    `by` est un nom de colonne ou une série alignée sur `df` (tranche d'expérience, année...).
+    Le résultat contient une ligne par (groupe, compétence) avec le nombre d'offres."""
+    keys = df[by] if isinstance(by, str) else pd.Series(by, index=df.index)
+    name = name or (by if isinstance(by, str) else keys.name) or 'Groupe'
+
+    codes, groups = pd.factorize(keys, sort=False)
+    matrix, positions = get_skills_matrix(df)
+    job_skills = matrix.matrix if positions is None else matrix.matrix[positions]
+    job_ranks = matrix.first_ranks if positions is None else matrix.first_ranks[positions]
+
+    # Matrice indicatrice groupes × offres (les clés manquantes, codées -1, sont ignorées)
+    valid = codes >= 0
+    indicator = sparse.csr_matrix(
+        (np.ones(valid.sum(), dtype=np.int32), (codes[valid], np.flatnonzero(valid))),
+        shape=(len(groups), len(codes))
+    )
+    grouped = (indicator @ job_skills).tocoo()
+
+    # Première apparition de chaque compétence dans chaque groupe (ordre des égalités, comme un Counter)
+    ranks = job_ranks.tocoo()
+    in_group = valid[ranks.row]
+    first = pd.Series(
+        ranks.row[in_group].astype(np.int64) * (matrix.max_rank + 1) + ranks.data[in_group]
+    ).groupby([codes[ranks.row[in_group]], ranks.col[in_group]]).min()
+    first = first.reindex(pd.MultiIndex.from_arrays([grouped.row, grouped.col])).to_numpy()
+
+    table = pd.DataFrame({
+        name: np.asarray(groups)[grouped.row],
+        'Compétence': np.asarray(matrix.vocabulary, dtype=object)[grouped.col],
+        'Nombre': grouped.data.astype(np.int64),
+        '_groupe': grouped.row,
+        '_ordre': first
+    })
+    table = table[table['Nombre'] > 0]
+    table = table.sort_values(['_groupe', 'Nombre', '_ordre'], ascending=[True, False, True], kind='stable')
+    return table.drop(columns=['_groupe', '_ordre']).reset_index(drop=True)
+
+
+def counters_by_group(table, name):
+    """Convertit une table longue (groupe, compétence, nombre) en dictionnaire de Counter par groupe"""
+    result = {}
+    for group, skill, count in zip(table[name], table['Compétence'], table['Nombre']):
+        result.setdefault(group, Counter())[skill] = int(count)
+    return result
@@ -1,247 +1,63 @@
-import pandas as pd
 import numpy as np
-from collections import Counter
+from scipy import sparse
+from ranking import binary_skill_matrix, top_n_items, top_n_rows
+from catalog import load_catalog, attach_shared_state
 
 class UniversityRecommender:
     def __init__(self):
-        # Définition des filières universitaires avec leurs modules et compétences associées
-        self.university_programs = {
-            'Master en Data Science': {
-                'description': 'Formation avancée en science des données, combinant statistiques, informatique et expertise métier.',
-                'modules': [
-                    'Fondamentaux de la Data Science',
-                    'Programmation Python pour l\'analyse de données',
-                    'Machine Learning et Deep Learning',
-                    'Statistiques avancées',
-                    'Big Data et technologies associées',
-                    'Visualisation de données',
-                    'Projet Data Science appliqué'
-                ],
-                'skills_developed': [
-                    'Python', 'R', 'Machine Learning', 'Deep Learning', 'SQL', 'Big Data', 
-                    'Data Visualization', 'Statistical Analysis', 'NLP', 'Data Mining'
-                ],
-                'career_prospects': [
-                    'Data Scientist', 'Data Analyst', 'Machine Learning Engineer', 
-                    'AI Researcher', 'Business Intelligence Analyst'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Développement Web': {
-                'description': 'Formation spécialisée dans la conception et le développement d\'applications web modernes.',
-                'modules': [
-                    'Développement Front-end (HTML/CSS/JavaScript)',
-                    'Frameworks modernes (React, Angular, Vue)',
-                    'Développement Back-end (Node.js, Django, Laravel)',
-                    'Architecture web et API',
-                    'UX/UI Design',
-                    'Sécurité web',
-                    'Projet de développement web full stack'
-                ],
-                'skills_developed': [
-                    'JavaScript', 'HTML', 'CSS', 'React', 'Angular', 'Node.js', 'REST API',
-                    'SQL', 'NoSQL', 'Git', 'Responsive Design', 'Web Security'
-                ],
-                'career_prospects': [
-                    'Développeur Full Stack', 'Développeur Frontend', 'Développeur Backend',
-                    'Architecte Web', 'Lead Developer'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Cybersécurité': {
-                'description': 'Formation spécialisée dans la protection des systèmes d\'information et la gestion des risques informatiques.',
-                'modules': [
-                    'Fondamentaux de la cybersécurité',
-                    'Sécurité des réseaux',
-                    'Cryptographie appliquée',
-                    'Analyse des vulnérabilités',
-                    'Réponse aux incidents',
-                    'Sécurité offensive (ethical hacking)',
-                    'Gouvernance et conformité'
-                ],
-                'skills_developed': [
-                    'Network Security', 'Penetration Testing', 'SIEM', 'Cryptography',
-                    'Risk Assessment', 'Incident Response', 'Security Auditing', 'Ethical Hacking'
-                ],
-                'career_prospects': [
-                    'Analyste en Cybersécurité', 'Pentester', 'Consultant en Sécurité',
-                    'Architecte Sécurité', 'RSSI'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Cloud Computing': {
-                'description': 'Formation spécialisée dans les technologies cloud, la virtualisation et les infrastructures distribuées.',
-                'modules': [
-                    'Fondamentaux du Cloud Computing',
-                    'Services AWS/Azure/GCP',
-                    'Conteneurisation et orchestration (Docker, Kubernetes)',
-                    'Infrastructure as Code',
-                    'DevOps et CI/CD',
-                    'Sécurité dans le cloud',
-                    'Projet d\'architecture cloud'
-                ],
-                'skills_developed': [
-                    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform',
-                    'CI/CD', 'IaC', 'Microservices', 'Serverless'
-                ],
-                'career_prospects': [
-                    'Ingénieur DevOps', 'Architecte Cloud', 'SRE',
-                    'Cloud Solutions Architect', 'DevSecOps Engineer'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Intelligence Artificielle': {
-                'description': 'Formation de pointe en intelligence artificielle, couvrant les aspects théoriques et pratiques.',
-                'modules': [
-                    'Fondements de l\'intelligence artificielle',
-                    'Apprentissage profond avancé',
-                    'Vision par ordinateur',
-                    'Traitement du langage naturel',
-                    'Systèmes multi-agents',
-                    'Robotique et systèmes autonomes',
-                    'Éthique et IA responsable',
-                    'Projet de recherche en IA'
-                ],
-                'skills_developed': [
-                    'Python', 'TensorFlow', 'PyTorch', 'Deep Learning', 'NLP',
-                    'Computer Vision', 'Reinforcement Learning', 'AI Ethics'
-                ],
-                'career_prospects': [
-                    'Ingénieur IA', 'Chercheur en ML/DL', 'Data Scientist',
-                    'Computer Vision Engineer', 'NLP Specialist'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Business Intelligence': {
-                'description': 'Formation spécialisée dans l\'analyse des données d\'entreprise pour la prise de décision stratégique.',
-                'modules': [
-                    'Conception de Data Warehouse',
-                    'Outils de BI (Tableau, Power BI)',
-                    'SQL avancé',
-                    'ETL et intégration de données',
-                    'Analyse décisionnelle',
-                    'Reporting et dashboarding',
-                    'Projet BI en entreprise'
-                ],
-                'skills_developed': [
-                    'SQL', 'Tableau', 'Power BI', 'ETL', 'Data Modeling',
-                    'Data Warehouse', 'OLAP', 'Business Analytics'
-                ],
-                'career_prospects': [
-                    'Analyste BI', 'Consultant BI', 'Data Analyst',
-                    'ETL Developer', 'Data Warehouse Architect'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Génie Logiciel': {
-                'description': 'Formation avancée en conception, développement et maintenance de logiciels complexes.',
-                'modules': [
-                    'Programmation orientée objet avancée',
-                    'Architecture logicielle',
-                    'Design patterns',
-                    'Tests et qualité logicielle',
-                    'Développement Agile',
-                    'DevOps et CI/CD',
-                    'Projet de développement logiciel'
-                ],
-                'skills_developed': [
-                    'Java', 'C#', 'Python', 'OOP', 'Design Patterns', 'Unit Testing',
-                    'CI/CD', 'Agile', 'Scrum', 'Software Architecture'
-                ],
-                'career_prospects': [
-                    'Ingénieur Logiciel', 'Architecte Logiciel', 'Tech Lead',
-                    'DevOps Engineer', 'Quality Assurance Engineer'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Finance Quantitative': {
-                'description': 'Formation spécialisée à l\'intersection de la finance, des mathématiques et de l\'informatique.',
-                'modules': [
-                    'Finance quantitative',
-                    'Analyse financière',
-                    'Gestion des risques',
-                    'Technologies financières (FinTech)',
-                    'Modélisation financière',
-                    'Programmation pour la finance (Python, R)',
-                    'Projet de recherche en finance'
-                ],
-                'skills_developed': [
-                    'Financial Modeling', 'Risk Assessment', 'Python', 'R',
-                    'Statistical Analysis', 'Financial Analysis', 'Algorithmic Trading'
-                ],
-                'career_prospects': [
-                    'Analyste Quantitatif', 'Risk Manager', 'Trader Algorithmique',
-                    'Consultant FinTech', 'Analyste Financier'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en FinTech': {
-                'description': 'Formation spécialisée dans les technologies financières innovantes et la transformation digitale du secteur financier.',
-                'modules': [
-                    'Introduction aux FinTech',
-                    'Blockchain et cryptomonnaies',
-                    'Paiements digitaux et banque mobile',
-                    'API bancaires et Open Banking',
-                    'Réglementation financière et conformité',
-                    'Développement d\'applications financières',
-                    'Intelligence artificielle pour la finance',
-                    'Projet FinTech innovant'
-                ],
-                'skills_developed': [
-                    'Blockchain', 'API Development', 'Mobile Banking', 'Payment Systems',
-                    'Regulatory Compliance', 'JavaScript', 'Python', 'Smart Contracts'
-                ],
-                'career_prospects': [
-                    'FinTech Product Manager', 'Blockchain Developer', 'Consultant FinTech',
-                    'Digital Banking Specialist', 'Regulatory Technology Expert'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Gestion des Risques Financiers': {
-                'description': 'Formation spécialisée dans l\'identification, l\'analyse et la gestion des risques financiers et opérationnels.',
-                'modules': [
-                    'Fondamentaux de la gestion des risques',
-                    'Risques de marché et de crédit',
-                    'Risques opérationnels et de conformité',
-                    'Modélisation des risques',
-                    'Stress testing et scénarios',
-                    'Réglementation prudentielle (Bâle, Solvabilité)',
-                    'Technologies pour la gestion des risques',
-                    'Projet de gestion des risques'
-                ],
-                'skills_developed': [
-                    'Risk Modeling', 'VaR', 'Stress Testing', 'Regulatory Compliance',
-                    'Credit Scoring', 'Excel Avancé', 'Python/R', 'Financial Analysis'
-                ],
-                'career_prospects': [
-                    'Risk Manager', 'Analyste des Risques', 'Consultant en Risques',
-                    'Responsable Conformité', 'Auditeur Interne'
-                ],
-                'duration': '2 ans'
-            },
-            'Master en Data Science pour la Finance': {
-                'description': 'Formation hybride combinant science des données et expertise financière pour l\'analyse et la prise de décision dans le secteur financier.',
-                'modules': [
-                    'Fondamentaux de la data science',
-                    'Finance quantitative',
-                    'Machine learning pour la finance',
-                    'Analyse prédictive des marchés financiers',
-                    'Détection de fraude et anomalies',
-                    'Analyse de sentiment et alternative data',
-                    'Big data en finance',
-                    'Projet d\'application data science en finance'
-                ],
-                'skills_developed': [
-                    'Python', 'R', 'Machine Learning', 'Financial Analysis',
-                    'Time Series Analysis', 'NLP', 'Big Data', 'Fraud Detection'
-                ],
-                'career_prospects': [
-                    'Data Scientist Finance', 'Analyste Quantitatif', 'Spécialiste en IA Financière',
-                    'Analyste de Risque', 'Consultant en Data Finance'
-                ],
-                'duration': '2 ans'
-            }
+        # Filières universitaires chargées depuis le catalogue compilé (catalogs/university_programs.json)
+        catalog = load_catalog('university_programs')
+        self.university_programs = catalog.copy_data()
+        
+        # Index construits une seule fois par version du catalogue et partagés entre instances
+        attach_shared_state(self, catalog, self._build_indexes)
+    
+    def _build_indexes(self, catalog):
+        """Construit la matrice creuse compétences × filières utilisée pour le calcul en lot"""
+        self._program_names = list(self.university_programs)
+        self._program_order = {name: i for i, name in enumerate(self._program_names)}
+        self._skill_ids = catalog.skill_ids
+        rows, cols = [], []
+        for program_idx, skill_ids in enumerate(catalog.entry_skill_ids.values()):
+            rows.extend(skill_ids.tolist())
+            cols.extend([program_idx] * len(skill_ids))
+        self._skill_program_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self._skill_ids), len(self._program_names))
+        )
+        
+        # Index inversé compétence → modules des filières qui développent cette compétence
+        self._module_names = []
+        module_ids = {}
+        skill_modules = {}
+        for program_data in self.university_programs.values():
+            program_module_ids = [
+                module_ids.setdefault(module, len(module_ids)) for module in program_data['modules']
+            ]
+            for skill in set(skill.lower() for skill in program_data['skills_developed']):
+                skill_modules.setdefault(skill, set()).update(program_module_ids)
+        self._module_names = list(module_ids)
+        self._module_ids = module_ids
+        self._skill_modules = {
+            skill: np.array(sorted(ids), dtype=np.int64) for skill, ids in skill_modules.items()
         }
+        
+        # Texte des compétences de toutes les filières, concaténé pour la recherche de tendances
+        # (une tendance correspond à une filière si elle apparaît dans le texte de ses compétences)
+        program_texts = [
+            ' '.join(skill.lower() for skill in program_data['skills_developed'])
+            for program_data in self.university_programs.values()
+        ]
+        self._skills_corpus = '\n'.join(program_texts)
+        self._program_starts = np.cumsum([0] + [len(text) + 1 for text in program_texts[:-1]])
+        self._trend_matches = {}
+        self._trend_matrices = {}
+        
+        # Perspectives de carrière en minuscules, par filière
+        self._career_prospects = [
+            [prospect.lower() for prospect in program_data['career_prospects']]
+            for program_data in self.university_programs.values()
+        ]
     
     def get_all_programs(self):
         """Retourne toutes les filières universitaires disponibles"""
@@ -277,58 +93,119 @@ class UniversityRecommender:
             
             scores[program_name] = score
         
-        # Trier les filières par score et prendre les top_n
-        sorted_programs = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        top_programs = [program for program, score in sorted_programs[:top_n] if score > 0]
+        # Sélectionner les top_n filières (à égalité, ordre du catalogue) sans trier tous les scores
+        top_programs = top_n_items(scores, top_n, self._program_order)
         
         # Si aucune filière n'a un score positif, retourner les 3 filières les plus populaires
         if not top_programs:
-            top_programs = list(self.university_programs.keys())[:top_n]
+            top_programs = self._program_names[:top_n]
         
         return top_programs
     
-    def recommend_modules(self, skills=None, program=None):
-        """Recommande des modules spécifiques basés sur les compétences et la filière"""
+    def recommend_programs_batch(self, skills_lists, career_goal=None, top_n=3, batch_size=4096):
+        """Recommande des filières pour de nombreux candidats à la fois (produit de matrices creuses)
+        
+        Retourne une liste de recommandations par candidat, identique à recommend_programs."""
+        # Points liés à l'objectif de carrière, communs à tous les candidats
+        context = np.zeros(len(self._program_names), dtype=np.int64)
+        if career_goal:
+            career_goal_lower = career_goal.lower()
+            for program_idx, career_prospects in enumerate(self._career_prospects):
+                if any(career_goal_lower in prospect for prospect in career_prospects):
+                    context[program_idx] = 3
+        
+        fallback = self._program_names[:top_n]
+        results = []
+        for start in range(0, len(skills_lists), batch_size):
+            candidates = binary_skill_matrix(skills_lists[start:start + batch_size], self._skill_ids)
+            scores = 2 * (candidates @ self._skill_program_matrix).toarray() + context
+            for top in top_n_rows(scores, top_n):
+                results.append([self._program_names[i] for i in top] if top else list(fallback))
+        
+        return results
+    
+    def recommend_modules(self, skills=None, program=None, with_scores=False):
+        """Recommande des modules spécifiques basés sur les compétences et la filière
+        
+        Les modules sont classés par pertinence : nombre de compétences demandées qui y mènent
+        (à égalité, ordre du catalogue). Avec with_scores=True, retourne des couples (module, pertinence),
+        y compris pour les modules d'une filière donnée (dans l'ordre de la filière)."""
+        relevance = np.zeros(len(self._module_names), dtype=np.int64)
+        
+        if skills:
+            for skill in set(skill.lower() for skill in skills):
+                module_ids = self._skill_modules.get(skill)
+                if module_ids is not None:
+                    relevance[module_ids] += 1
+        
         if program and program in self.university_programs:
             # Si une filière est spécifiée, retourner ses modules
-            return self.university_programs[program]['modules']
+            modules = self.university_programs[program]['modules']
+            if with_scores:
+                return [(module, int(relevance[self._module_ids[module]])) for module in modules]
+            return modules
         
         # Sinon, recommander des modules basés sur les compétences
-        recommended_modules = set()
+        ranked = np.argsort(-relevance, kind='stable')
+        ranked = ranked[relevance[ranked] > 0]
         
-        if skills:
-            skills_lower = [skill.lower() for skill in skills]
-            
-            for program_name, program_data in self.university_programs.items():
-                program_skills = [skill.lower() for skill in program_data['skills_developed']]
-                
-                # Si au moins une compétence correspond, ajouter les modules de cette filière
-                if any(skill in program_skills for skill in skills_lower):
-                    recommended_modules.update(program_data['modules'])
-        
-        return list(recommended_modules)
+        if with_scores:
+            return [(self._module_names[i], int(relevance[i])) for i in ranked]
+        return [self._module_names[i] for i in ranked]
+    
+    def _programs_matching(self, trend):
+        """Retourne les indices des filières dont les compétences contiennent une tendance (mémorisé)"""
+        trend = trend.lower()
+        matches = self._trend_matches.get(trend)
+        if matches is None:
+            if not trend:
+                matches = np.arange(len(self._program_names))
+            else:
+                # Toutes les occurrences dans le texte concaténé, ramenées à leur filière
+                positions = []
+                position = self._skills_corpus.find(trend)
+                while position != -1:
+                    positions.append(position)
+                    position = self._skills_corpus.find(trend, position + 1)
+                matches = np.unique(np.searchsorted(self._program_starts, positions, side='right') - 1)
+            if len(self._trend_matches) >= 4096:
+                self._trend_matches.clear()
+            self._trend_matches[trend] = matches
+        return matches
+    
+    def _trend_matrix(self, trends):
+        """Retourne la matrice creuse tendances × filières pour une liste de tendances (mémorisée)"""
+        key = tuple(trends)
+        matrix = self._trend_matrices.get(key)
+        if matrix is None:
+            rows, cols = [], []
+            for row, trend in enumerate(trends):
+                matches = self._programs_matching(trend)
+                rows.extend([row] * len(matches))
+                cols.extend(matches.tolist())
+            matrix = sparse.csr_matrix(
+                (np.ones(len(rows)), (rows, cols)),
+                shape=(len(trends), len(self._program_names))
+            )
+            if len(self._trend_matrices) >= 64:
+                self._trend_matrices.clear()
+            self._trend_matrices[key] = matrix
+        return matrix
     
     def get_market_aligned_programs(self, market_trends):
         """Identifie les filières les mieux alignées avec les tendances du marché"""
         if not market_trends:
             return list(self.university_programs.keys())[:3]
         
-        scores = {}
-        
-        for program_name, program_data in self.university_programs.items():
-            score = 0
-            program_skills = [skill.lower() for skill in program_data['skills_developed']]
-            
-            for trend, weight in market_trends.items():
-                if trend.lower() in ' '.join(program_skills).lower():
-                    score += weight
-            
-            scores[program_name] = score
+        # Score de chaque filière = somme des poids des tendances qu'elle couvre (calcul vectoriel)
+        trends = list(market_trends)
+        weights = np.fromiter(market_trends.values(), dtype=float, count=len(trends))
+        scores = self._trend_matrix(trends).T @ weights
         
-        # Trier les filières par score
-        sorted_programs = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        # Trier les filières par score (à égalité, ordre du catalogue)
+        top_programs = np.argsort(-scores, kind='stable')[:3]
         
-        return [program for program, _ in sorted_programs[:3]]
+        return [self._program_names[i] for i in top_programs]
 
 # Test du module
 if __name__ == "__main__":
@@ -2,16 +2,24 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
-from collections import Counter
 import re
 import numpy as np
+from data_store import load_store, get_dataset
+from skills_matrix import count_skills
+
+# Chemins des données d'offres d'emploi
+DATA_PATH = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_with_skills.csv"
+ORIGINAL_DATA_PATH = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_cleaned.csv"
 
 def load_data():
+    """Retourne le jeu de données partagé des offres avec les compétences générées"""
+    return get_dataset(DATA_PATH, loader=_load_or_generate_data)
+
+def _load_or_generate_data(path):
     """Charge les données avec les compétences générées"""
     try:
-        # Essayer d'abord de charger les données enrichies avec compétences
-        path = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_with_skills.csv"
-        df = pd.read_csv(path)
+        # Essayer d'abord de charger les données enrichies depuis le magasin colonnaire
+        df = load_store(path)
         if 'Competences' not in df.columns:
             raise FileNotFoundError("Le fichier existe mais ne contient pas de compétences")
     except FileNotFoundError:
@@ -20,8 +28,7 @@ def load_data():
         from skills_generator import SkillsGenerator
         
         # Charger les données originales
-        path_orig = r"C:\Users\ThinkPad\OneDrive\Desktop\Master Big Data\S1 MASTER\BASE DE DONNEES ORACLE\PROJECTS\projet_scraping\projet_scraping\output\final_jobs_data_cleaned.csv"
-        df = pd.read_csv(path_orig)
+        df = pd.read_csv(ORIGINAL_DATA_PATH)
         
         # Générer les compétences
         skills_gen = SkillsGenerator()
@@ -30,27 +37,16 @@ def load_data():
         # Sauvegarder pour utilisation future
         df.to_csv(path, index=False)
         print("Compétences générées et sauvegardées.")
-    
-    # Prétraitement des données
-    df['Experience'] = pd.to_numeric(df['Experience'], errors='coerce')
-    df['Date_De_Publication'] = pd.to_datetime(df['Date_De_Publication'], errors='coerce')
-    df['Annee'] = df['Date_De_Publication'].dt.year
+        
+        # Construire le magasin colonnaire typé (dates, catégories, compétences découpées)
+        df = load_store(path)
     
     return df
 
 def extract_all_skills(df):
     """Extrait toutes les compétences du DataFrame et compte leur fréquence"""
-    all_skills = []
-    
-    for skills_str in df['Competences'].dropna():
-        # Diviser la chaîne de compétences et nettoyer
-        skills = [skill.strip() for skill in skills_str.split(',')]
-        all_skills.extend(skills)
-    
-    # Compter les occurrences
-    skills_counter = Counter(all_skills)
-    
-    return skills_counter
+    # Somme des colonnes de la matrice creuse offres × compétences (calculée une seule fois)
+    return count_skills(df)
 
 def get_market_trends(df):
     """Analyse les tendances du marché basées sur les données d'offres d'emploi"""
@@ -76,44 +72,34 @@ def get_market_trends(df):
 
 def predict_job_growth(df, sector, target_year=2025):
     """Prédit la croissance des offres d'emploi pour un secteur donné"""
-    from sklearn.linear_model import LinearRegression
+    from forecasting import forecast_sectors, forecast_version, get_forecast_cache
     
-    # Regrouper les données par année et secteur
-    annonces_par_annee = df.groupby(['Annee', 'Secteur']).size().reset_index(name='Nb_Annonces')
+    # Prévision déjà calculée pour cette version des données
+    cache = get_forecast_cache()
+    version = forecast_version(df)
+    if version is not None:
+        cached = cache.get(version, sector, target_year, 'linear')
+        if cached is not None:
+            return cached
     
-    # Filtrer pour le secteur spécifié
-    data_sec = annonces_par_annee[annonces_par_annee['Secteur'] == sector]
+    # Tendances de tous les secteurs en un seul passage, puis lecture du secteur demandé
+    forecasts = forecast_sectors(df, [target_year])
+    prediction_col = f'Prediction_{int(target_year)}'
+    
+    if version is not None:
+        # Une seule régression groupée remplit le cache pour tous les secteurs
+        for name, prediction, growth_rate in zip(forecasts.index, forecasts[prediction_col], forecasts['Taux_Croissance']):
+            cache.put(version, name, target_year, 'linear', (int(prediction), float(growth_rate)))
+        if sector not in forecasts.index:
+            cache.put(version, sector, target_year, 'linear', (None, None))
     
     # Vérifier s'il y a assez de données
-    if len(data_sec) < 2:
+    if sector not in forecasts.index:
         return None, None
     
-    # Préparer les données pour la régression
-    X = data_sec[['Annee']]
-    y = data_sec['Nb_Annonces']
-    
-    # Créer et entraîner le modèle
-    model = LinearRegression()
-    model.fit(X, y)
-    
-    # Prédire pour l'année cible
-    prediction = int(model.predict([[target_year]])[0])
-    
-    # Calculer le taux de croissance
-    years = sorted(data_sec['Annee'].unique())
-    if len(years) >= 2:
-        first_year = years[0]
-        last_year = years[-1]
-        first_count = data_sec[data_sec['Annee'] == first_year]['Nb_Annonces'].values[0]
-        last_count = data_sec[data_sec['Annee'] == last_year]['Nb_Annonces'].values[0]
-        
-        # Calculer le taux de croissance annuel moyen
-        if first_count > 0 and last_year > first_year:
-            growth_rate = ((last_count / first_count) ** (1 / (last_year - first_year)) - 1) * 100
-        else:
-            growth_rate = 0
-    else:
-        growth_rate = 0
+    forecast = forecasts.loc[sector]
+    prediction = int(forecast[prediction_col])
+    growth_rate = float(forecast['Taux_Croissance'])
     
     return prediction, growth_rate
 
@@ -0,0 +1,78 @@
+import asyncio
+import aiohttp
+from politeness import RETRY_STATUSES, get_scheduler
+from http_cache import CachedResponse
+
+# Connexions simultanées : au total et par site
+MAX_CONNECTIONS = 20
+MAX_PER_HOST = 4
+
+
+class AsyncFetcher:
+    """Téléchargement asynchrone de pages : pool de connexions partagé, nombre de requêtes
+    simultanées borné par site, délais d'expiration et nouvelles tentatives sur 429/5xx et
+    erreurs réseau
+
+    Chaque requête passe par le limiteur de débit (`PolitenessScheduler`) : les erreurs
+    ralentissent le site et espacent les nouvelles tentatives. Avec un `HttpCache`, les copies
+    fraîches sont servies sans réseau et les autres pages sont revalidées (ETag / Last-Modified).
+
+    À utiliser comme contexte asynchrone :
+        async with AsyncFetcher(cache=cache) as fetcher:
+            page = await fetcher.fetch(url)"""
+
+    def __init__(self, scheduler=None, cache=None, per_host=MAX_PER_HOST, limit=MAX_CONNECTIONS,
+                 timeout=30, retries=3, headers=None):
+        self.scheduler = scheduler or get_scheduler()
+        self.cache = cache
+        self.per_host = per_host
+        self.limit = limit
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = headers or {"User-Agent": "Mozilla/5.0"}
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.per_host)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+
+    async def _get(self, url, params=None, headers=None):
+        """GET soumis au limiteur de débit, avec nouvelles tentatives : (code, contenu, en-têtes)"""
+        for attempt in range(self.retries + 1):
+            delay = self.scheduler.delay(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                async with self.session.get(url, params=params, headers=headers) as response:
+                    content = await response.read()
+                    status, response_headers = response.status, response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.scheduler.report(url, None)
+                if attempt == self.retries:
+                    raise
+                continue
+
+            self.scheduler.report(url, status, response_headers.get("Retry-After"))
+            if status not in RETRY_STATUSES or attempt == self.retries:
+                return status, content, response_headers
+
+    async def fetch(self, url, params=None):
+        """Télécharge une page (via le cache s'il est fourni) et retourne une `CachedResponse`"""
+        if self.cache is None:
+            status, content, _ = await self._get(url, params)
+            return CachedResponse(url, status, content, None, False, True)
+
+        cached, headers = self.cache.prepare(url, params)
+        if cached is not None:
+            return cached
+        status, content, response_headers = await self._get(url, params, headers)
+        return self.cache.complete(url, params, status, content, response_headers)
@@ -0,0 +1,128 @@
+import os
+import re
+import time
+import argparse
+import contextlib
+import pandas as pd
+from politeness import host_of
+from http_cache import get_http_cache
+from parsers import BACKENDS, SITES, parse_page
+
+# Pages de référence : un sous-dossier par site (emploi.ma, rekrute, glassdoor) contenant des pages .html
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output", "parser_fixtures")
+
+# Site associé à chaque hôte (export des pages du cache HTTP)
+SITE_HOSTS = {
+    "www.emploi.ma": "emploi.ma",
+    "www.rekrute.com": "rekrute",
+    "www.glassdoor.com": "glassdoor",
+}
+
+# Contexte transmis à la construction des lignes de chaque site
+SITE_CONTEXT = {
+    "emploi.ma": {"secteur": "IT"},
+    "rekrute": {"secteur": "Informatique"},
+    "glassdoor": {},
+}
+
+
+def export_fixtures(fixtures_dir=FIXTURES_DIR, cache=None):
+    """Enregistre les pages du cache HTTP comme pages de référence, par site"""
+    cache = cache or get_http_cache()
+    count = 0
+    for url, content in cache.pages():
+        site = SITE_HOSTS.get(host_of(url))
+        if site is None:
+            continue
+        site_dir = os.path.join(fixtures_dir, site)
+        os.makedirs(site_dir, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', url.split("://", 1)[-1])[:150]
+        with open(os.path.join(site_dir, name + ".html"), "wb") as f:
+            f.write(content)
+        count += 1
+    return count
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """Charge les pages de référence : {site: [(nom, contenu)]}"""
+    fixtures = {}
+    for site in SITES:
+        site_dir = os.path.join(fixtures_dir, site)
+        if not os.path.isdir(site_dir):
+            continue
+        for name in sorted(os.listdir(site_dir)):
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(site_dir, name), "rb") as f:
+                    fixtures.setdefault(site, []).append((name, f.read()))
+    return fixtures
+
+
+def benchmark(fixtures, backends=BACKENDS, repeat=5):
+    """Mesure le temps d'analyse de chaque page pour chaque backend (meilleur de `repeat` essais)
+
+    Retourne un DataFrame avec une ligne par page et par backend : temps (ms), nombre d'offres
+    et concordance des offres extraites avec le premier backend."""
+    rows = []
+    for site, pages in fixtures.items():
+        context = SITE_CONTEXT.get(site, {})
+        for name, content in pages:
+            reference = None
+            for backend in backends:
+                timings = []
+                # Messages des offres illisibles masqués pendant les mesures
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        offers = parse_page(site, content, backend, **context)
+                        timings.append(time.perf_counter() - start)
+
+                if reference is None:
+                    reference = offers
+                rows.append({
+                    "Site": site,
+                    "Page": name,
+                    "Backend": backend,
+                    "Temps_ms": min(timings) * 1000,
+                    "Offres": len(offers),
+                    "Identique": offers == reference,
+                })
+    return pd.DataFrame(rows)
+
+
+def summarize(results):
+    """Temps moyen et médian par page, pour chaque site et backend, et gain par rapport à bs4"""
+    summary = results.groupby(["Site", "Backend"]).agg(
+        Pages=("Page", "count"),
+        Moyenne_ms=("Temps_ms", "mean"),
+        Mediane_ms=("Temps_ms", "median"),
+        Offres_par_page=("Offres", "mean"),
+        Identique=("Identique", "all"),
+    ).reset_index()
+    bs4_means = summary[summary["Backend"] == "bs4"].set_index("Site")["Moyenne_ms"]
+    summary["Gain_vs_bs4"] = summary["Site"].map(bs4_means) / summary["Moyenne_ms"]
+    return summary.round(3)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps d'analyse des pages de résultats par backend")
+    parser.add_argument("fixtures_dir", nargs="?", default=FIXTURES_DIR,
+                        help="dossier des pages de référence (un sous-dossier par site)")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre d'essais par page")
+    parser.add_argument("--export-cache", action="store_true",
+                        help="enregistre d'abord les pages du cache HTTP dans le dossier")
+    parser.add_argument("--details", action="store_true", help="affiche le temps de chaque page")
+    args = parser.parse_args()
+
+    if args.export_cache:
+        print(f"📥 {export_fixtures(args.fixtures_dir)} pages exportées depuis le cache HTTP")
+
+    fixtures = load_fixtures(args.fixtures_dir)
+    if not fixtures:
+        print(f"❌ Aucune page de référence dans {args.fixtures_dir}")
+    else:
+        results = benchmark(fixtures, repeat=args.repeat)
+        if args.details:
+            print(results.to_string(index=False))
+        print(summarize(results).to_string(index=False))
+        if not results["Identique"].all():
+            print("⚠️ Certaines pages donnent des offres différentes selon le backend")
@@ -1,59 +1,50 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
-import random
+from politeness import get_scheduler
+from http_cache import get_http_cache
+from seen_store import get_seen_store, new_offers
+from parsers import DEFAULT_BACKEND, parse_page, pipelined_pages
 
 class GlassdoorScraper:
-    def __init__(self):
+    def __init__(self, backend: str = DEFAULT_BACKEND):
         self.base_url = "https://www.glassdoor.com"
         self.session = requests.Session()
+        # Limiteur de débit par site partagé (remplace la pause fixe entre les pages)
+        self.scheduler = get_scheduler()
+        # Cache HTTP partagé : seules les pages modifiées sont retéléchargées et ré-analysées
+        self.cache = get_http_cache()
+        # Offres déjà collectées lors des exécutions précédentes
+        self.seen = get_seen_store()
+        # Backend d'analyse HTML ('lxml' : sélecteurs XPath précompilés, 'bs4' : html.parser)
+        self.backend = backend
 
-    def search_jobs(self, keyword: str, location: str = "France", max_pages: int = 3):
-        jobs = []
-        for page in range(1, max_pages + 1):
+    def search_jobs(self, keyword: str, location: str = "France", max_pages: int = 3, incremental: bool = False):
+        # Mode incrémental : seules les nouvelles offres sont retournées et la pagination
+        # s'arrête à la première page ne contenant que des offres déjà vues
+        def fetch(page):
             url = f"{self.base_url}/Emplois/{keyword}-emplois-SRCH_KO0,{len(keyword)}.htm?locId=96&locT=N&page={page}"
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            job_elements = soup.find_all('li', class_='jl')
-            for job_element in job_elements:
-                try:
-                    job_data = self.extract_job_details(job_element)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    print(f"Erreur lors de l'extraction d'une offre: {e}")
-                    continue
-            
-            time.sleep(random.uniform(2, 4))  # Délai entre les pages pour éviter le blocage
+            return self.cache.fetch(self.session, url, scheduler=self.scheduler, timeout=30)
+
+        # Chaque page est analysée dans le pool d'analyse pendant le téléchargement de la suivante
+        jobs = []
+        for page, page_jobs, error in pipelined_pages(fetch, range(1, max_pages + 1), 'glassdoor',
+                                                      self.cache, self.backend):
+            if error is not None:
+                raise error
+            new_jobs = new_offers(self.seen, 'glassdoor', page_jobs)
+            jobs.extend(new_jobs if incremental else page_jobs)
+            if incremental and page_jobs and not new_jobs:
+                print(f"Page {page} : aucune nouvelle offre pour '{keyword}', arrêt")
+                break
         return jobs
 
-    def extract_job_details(self, job_element):
-        try:
-            title = job_element.find('a', class_='jobLink').text.strip()
-            company = job_element.find('div', class_='jobInfoItem').text.strip()
-            location = job_element.find('span', class_='subtle loc').text.strip()
-            job_link = self.base_url + job_element.find('a', class_='jobLink')['href']
-            
-            return {
-                'id': job_link.split('/')[-1],
-                'Secteur': 'Finance',  # Exemple, ajustez selon les données réelles
-                'Poste': title,
-                'Entreprise': company,
-                'Ville': location,
-                'Date_de_publication': '2025-06-16',  # Vous pouvez ajuster cette date
-                'Lien': job_link,
-                'Experience': '50k - 70k € par an',
-                'Contrat': 'CDI',
-                'Niveau_etude': 'Bac+5'
-            }
-        except Exception as e:
-            print(f"Erreur lors de l'extraction des détails: {e}")
-            return None
+    def parse_page(self, content):
+        return parse_page('glassdoor', content, self.backend)
 
     def save_jobs_to_csv(self, jobs, filename="glassdoor_jobs.csv"):
         output_path = r"C:\Users\HP\OneDrive\Nouveau dossier\OneDrive\Desktop\projet_scraping\output"
         df = pd.DataFrame(jobs)
         df.to_csv(f'{output_path}\\{filename}', index=False, encoding='utf-8-sig')
+        # Offres marquées comme vues seulement une fois exportées
+        self.seen.save()
         print(f"Fichier sauvegardé sous: {output_path}\\{filename}")
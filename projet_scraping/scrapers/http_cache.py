@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlencode
+from politeness import get_scheduler, polite_get
+
+# Dossier du cache partagé par tous les scrapers
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output", "http_cache")
+
+
+class CachedResponse:
+    """Réponse servie par le cache ou par le réseau (`changed` : contenu différent de la copie en cache)"""
+
+    def __init__(self, url, status_code, content, digest, from_cache, changed):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.digest = digest
+        self.from_cache = from_cache
+        self.changed = changed
+
+
+class HttpCache:
+    """Cache disque des pages téléchargées : contenus compressés et adressés par leur empreinte,
+    index SQLite, requêtes conditionnelles (ETag / Last-Modified), durée de validité et taille
+    maximale (éviction des pages les moins récemment utilisées)"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=3600, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(cache_dir, "blobs"), exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, digest TEXT NOT NULL, etag TEXT, "
+            "last_modified TEXT, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_digest ON responses (digest)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            "digest TEXT NOT NULL, parser TEXT NOT NULL, payload BLOB NOT NULL, "
+            "PRIMARY KEY (digest, parser))"
+        )
+        self._conn.commit()
+
+        # Compteurs d'une exécution : pages servies sans transfert, revalidées (304) et téléchargées
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+
+    @staticmethod
+    def request_key(url, params=None):
+        """Clé d'une requête GET (URL et paramètres triés)"""
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()))}"
+        return hashlib.sha1(url.encode("utf-8")).hexdigest(), url
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest + ".z")
+
+    def _read_blob(self, digest):
+        try:
+            with open(self._blob_path(digest), "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def _write_blob(self, content):
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            # Contenu adressé par son empreinte : deux pages identiques partagent le même fichier
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = zlib.compress(content, 6)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._conn.execute("INSERT OR REPLACE INTO blobs (digest, size) VALUES (?, ?)", (digest, len(data)))
+        return digest
+
+    def fetch(self, session, url, params=None, scheduler=None, **kwargs):
+        """Télécharge une page via le cache : copie fraîche servie sans réseau, sinon requête
+        conditionnelle (304 : la copie en cache est réutilisée sans transfert du contenu)"""
+        cached, headers = self.prepare(url, params, kwargs.pop("headers", None))
+        if cached is not None:
+            return cached
+        response = polite_get(session, url, scheduler or get_scheduler(), params=params, headers=headers, **kwargs)
+        return self.complete(url, params, response.status_code, response.content, response.headers)
+
+    def prepare(self, url, params=None, headers=None):
+        """Première étape d'un téléchargement : retourne (copie fraîche ou None, en-têtes de la requête)
+
+        Les en-têtes contiennent les conditions ETag / Last-Modified de la copie en cache.
+        Utilisé directement par les clients HTTP asynchrones, avec `complete` une fois la réponse reçue."""
+        key, full_url = self.request_key(url, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        cached = self._read_blob(row[0]) if row else None
+
+        if cached is not None and now - row[3] < self.ttl:
+            with self._lock:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.fresh_hits += 1
+            return CachedResponse(full_url, 200, cached, row[0], True, False), None
+
+        headers = dict(headers or {})
+        if cached is not None:
+            if row[1]:
+                headers["If-None-Match"] = row[1]
+            if row[2]:
+                headers["If-Modified-Since"] = row[2]
+        return None, headers
+
+    def complete(self, url, params, status_code, content, headers):
+        """Seconde étape d'un téléchargement : enregistre la réponse reçue et retourne la page"""
+        key, full_url = self.request_key(url, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM responses WHERE key = ?", (key,)).fetchone()
+        cached = self._read_blob(row[0]) if row else None
+
+        if status_code == 304 and cached is not None:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+                )
+                self._conn.commit()
+                self.revalidated += 1
+            return CachedResponse(full_url, 200, cached, row[0], True, False)
+
+        if status_code != 200:
+            # Les erreurs ne sont pas mises en cache
+            return CachedResponse(full_url, status_code, content, None, False, True)
+
+        with self._lock:
+            digest = self._write_blob(content)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, digest, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, full_url, digest, headers.get("ETag"), headers.get("Last-Modified"), now, now)
+            )
+            self._conn.commit()
+            self.downloads += 1
+        self.evict()
+        return CachedResponse(full_url, 200, content, digest, False, row is None or digest != row[0])
+
+    def parsed(self, response, parser, parse):
+        """Retourne le résultat de `parse(contenu)` pour une page, analysée une seule fois par contenu
+
+        Le résultat (sérialisable en JSON) est conservé par empreinte du contenu et nom du
+        parseur : une page inchangée n'est pas ré-analysée lors des exécutions suivantes."""
+        if response.digest is None:
+            return parse(response.content)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM parsed WHERE digest = ? AND parser = ?", (response.digest, parser)
+            ).fetchone()
+        if row is not None:
+            return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+        result = parse(response.content)
+        payload = zlib.compress(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed (digest, parser, payload) VALUES (?, ?, ?)",
+                (response.digest, parser, payload)
+            )
+            self._conn.commit()
+        return result
+
+    def _delete_blob(self, digest):
+        """Supprime un contenu et ses résultats d'analyse, retourne la taille libérée"""
+        size = self._conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._conn.execute("DELETE FROM parsed WHERE digest = ?", (digest,))
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+        return size[0] if size else 0
+
+    def evict(self):
+        """Supprime les pages les moins récemment utilisées tant que le cache dépasse sa taille maximale"""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            # D'abord les anciennes versions de pages, qui ne sont plus référencées
+            orphans = self._conn.execute(
+                "SELECT digest FROM blobs WHERE digest NOT IN (SELECT digest FROM responses)"
+            ).fetchall()
+            for (digest,) in orphans:
+                total -= self._delete_blob(digest)
+
+            rows = self._conn.execute("SELECT key, digest FROM responses ORDER BY accessed_at").fetchall()
+            for key, digest in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                # Un contenu n'est supprimé que si plus aucune page ne le référence
+                if not self._conn.execute("SELECT 1 FROM responses WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                    total -= self._delete_blob(digest)
+            self._conn.commit()
+
+    def pages(self):
+        """Parcourt les pages en cache : (url, contenu)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT url, digest FROM responses ORDER BY url").fetchall()
+        for url, digest in rows:
+            content = self._read_blob(digest)
+            if content is not None:
+                yield url, content
+
+    def stats(self):
+        """Retourne les compteurs de l'exécution en cours"""
+        return {"fresh_hits": self.fresh_hits, "revalidated": self.revalidated, "downloads": self.downloads}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Cache partagé par tous les scrapers du processus
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Retourne le cache HTTP du processus"""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache()
+        return _http_cache
@@ -0,0 +1,430 @@
+import os
+import re
+import hashlib
+import random
+import threading
+import uuid
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from bs4 import BeautifulSoup, UnicodeDammit
+
+try:
+    import lxml.html
+    from lxml import etree
+    DEFAULT_BACKEND = "lxml"
+except ImportError:
+    # Sans lxml, on se rabat sur BeautifulSoup (html.parser, plus lent)
+    etree = None
+    DEFAULT_BACKEND = "bs4"
+
+# Colonnes des offres extraites (ordre de l'export emploi.ma)
+COLUMNS = ["id", "Secteur", "Poste", "Entreprise", "Ville", "Date_de_publication",
+           "Contrat", "Experience", "Niveau_etude", "Lien"]
+
+EMPLOI_MA_URL = "https://www.emploi.ma"
+REKRUTE_URL = "https://www.rekrute.com"
+GLASSDOOR_URL = "https://www.glassdoor.com"
+
+# Version des règles d'extraction : empreinte de ce fichier, incluse dans la clé des résultats
+# mis en cache (toute modification des sélecteurs ou de la construction des lignes les invalide)
+with open(os.path.abspath(__file__), "rb") as _source:
+    PARSER_VERSION = hashlib.sha1(_source.read()).hexdigest()[:12]
+
+# Nombre de pages analysées en parallèle (lxml libère le GIL pendant l'analyse)
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def extract_id(url):
+    """Extrait l'ID d'une offre emploi.ma depuis son URL"""
+    match = re.search(r'(\d+)(?:\.html)?$', url)
+    return match.group(1) if match else "N/A"
+
+
+def offer_rng(key):
+    """Générateur aléatoire propre à une offre : mêmes valeurs simulées à chaque analyse de la page"""
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def simulated_date(key=None):
+    """Date simulée entre 2023 et 2025 quand la date de publication est absente ou invalide
+
+    Avec une clé (lien de l'offre), la date ne dépend que de l'offre : le résultat mis en cache
+    est identique à une nouvelle analyse."""
+    rng = random if key is None else offer_rng(key)
+    year = rng.choice([2023, 2024, 2025])
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    return f"{year}-{month:02d}-{day:02d}"
+
+
+# ---------------------------------------------------------------------------
+# Construction des lignes à partir des champs bruts (commune aux deux backends)
+# ---------------------------------------------------------------------------
+
+def build_emploi_ma(fields, secteur):
+    """Ligne d'une offre emploi.ma"""
+    full_url = EMPLOI_MA_URL + fields["link"] if fields["link"] else "N/A"
+
+    details = {
+        "Ville": "N/A", "Contrat": "N/A",
+        "Experience": "N/A", "Niveau_etude": "N/A"
+    }
+    for txt, val in fields["items"]:
+        txt = txt.lower()
+        if "ville" in txt:
+            details["Ville"] = val
+        elif "contrat" in txt:
+            details["Contrat"] = val
+        elif "expérience" in txt:
+            details["Experience"] = val
+        elif "étude" in txt:
+            details["Niveau_etude"] = val
+
+    return {
+        "id": extract_id(full_url),
+        "Secteur": secteur,
+        "Poste": fields["title"],
+        "Entreprise": fields["company"],
+        "Ville": details["Ville"],
+        "Date_de_publication": fields["date"] or simulated_date(full_url + fields["title"]),
+        "Contrat": details["Contrat"],
+        "Experience": details["Experience"],
+        "Niveau_etude": details["Niveau_etude"],
+        "Lien": full_url
+    }
+
+
+def build_rekrute(fields, secteur):
+    """Ligne d'une offre Rekrute"""
+    titre = fields["title"]
+    poste = titre.split("|")[0].strip() if "|" in titre else titre
+    lien = REKRUTE_URL + fields["href"] if fields["has_title"] else ""
+    # Clé de l'offre pour l'identifiant et la date simulée (déterministes)
+    cle = lien or f"{titre}|{fields['company']}"
+
+    try:
+        date_pub = datetime.strptime(fields["date"], "%d/%m/%Y").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        date_pub = simulated_date(cle)
+
+    details = {"Secteur": "", "Experience": "", "Niveau_etude": "", "Contrat": ""}
+    for txt, link_text in fields["items"]:
+        if "Secteur d'activité" in txt:
+            details["Secteur"] = link_text if link_text is not None else secteur
+        elif "Expérience requise" in txt:
+            details["Experience"] = link_text or ""
+        elif "Niveau d'étude demandé" in txt:
+            details["Niveau_etude"] = link_text or ""
+        elif "Type de contrat proposé" in txt:
+            details["Contrat"] = link_text or ""
+
+    return {
+        "id": str(uuid.uuid5(uuid.NAMESPACE_URL, cle)),
+        "Secteur": details["Secteur"] or secteur,
+        "Poste": poste,
+        "Entreprise": fields["company"],
+        "Ville": titre.split("|")[-1].strip(" )(") if "|" in titre else "",
+        "Date_de_publication": date_pub,
+        "Lien": lien,
+        "Experience": details["Experience"],
+        "Contrat": details["Contrat"],
+        "Niveau_etude": details["Niveau_etude"]
+    }
+
+
+def build_glassdoor(fields):
+    """Ligne d'une offre Glassdoor"""
+    job_link = GLASSDOOR_URL + fields["href"]
+    return {
+        'id': job_link.split('/')[-1],
+        'Secteur': 'Finance',  # Exemple, ajustez selon les données réelles
+        'Poste': fields["title"],
+        'Entreprise': fields["company"],
+        'Ville': fields["location"],
+        'Date_de_publication': '2025-06-16',  # Vous pouvez ajuster cette date
+        'Lien': job_link,
+        'Experience': '50k - 70k € par an',
+        'Contrat': 'CDI',
+        'Niveau_etude': 'Bac+5'
+    }
+
+
+# ---------------------------------------------------------------------------
+# Backend BeautifulSoup (html.parser)
+# ---------------------------------------------------------------------------
+
+def _emploi_ma_bs4(job):
+    h3 = job.find("h3")
+    company = job.find("a", class_="company-name")
+    date = job.find("time")
+    items = []
+    for li in job.find_all("li"):
+        strong = li.find("strong")
+        items.append((li.get_text(strip=True), strong.get_text(strip=True) if strong else "N/A"))
+    return {
+        "link": job.get("data-href", ""),
+        "title": h3.get_text(strip=True) if h3 else "N/A",
+        "company": company.get_text(strip=True) if company else "N/A",
+        "items": items,
+        "date": date.get("datetime") if date else None,
+    }
+
+
+def _rekrute_bs4(offre):
+    bloc_titre = offre.find("a", class_="titreJob")
+    date_tag = offre.find("em", class_="date")
+    spans = date_tag.find_all("span") if date_tag else []
+    entreprise = offre.find("img", class_="photo")
+    items = []
+    for li in offre.find_all("li"):
+        a_tag = li.find("a")
+        items.append((li.text, a_tag.text.strip() if a_tag else None))
+    return {
+        "title": bloc_titre.text.strip() if bloc_titre else "",
+        "has_title": bloc_titre is not None,
+        "href": bloc_titre["href"] if bloc_titre else None,
+        "date": spans[0].text.strip() if spans else None,
+        "company": entreprise.get("title", "").strip() if entreprise else "",
+        "items": items,
+    }
+
+
+def _glassdoor_bs4(job):
+    return {
+        "title": job.find('a', class_='jobLink').text.strip(),
+        "company": job.find('div', class_='jobInfoItem').text.strip(),
+        "location": job.find('span', class_='subtle loc').text.strip(),
+        "href": job.find('a', class_='jobLink')['href'],
+    }
+
+
+def _bs4_offers(content, tag, css_class):
+    return BeautifulSoup(content, "html.parser").find_all(tag, class_=css_class)
+
+
+# ---------------------------------------------------------------------------
+# Backend lxml : sélecteurs XPath compilés une seule fois par site
+# ---------------------------------------------------------------------------
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if etree is not None:
+    # Texte visible d'un élément (comme BeautifulSoup : sans commentaires ni scripts)
+    _TEXT = etree.XPath(".//text()[not(parent::script or parent::style or parent::template)]")
+
+    _EMPLOI_MA = {
+        "offers": etree.XPath(f"//div[{_has_class('card-job')}]"),
+        "title": etree.XPath("(.//h3)[1]"),
+        "company": etree.XPath(f"(.//a[{_has_class('company-name')}])[1]"),
+        "date": etree.XPath("(.//time)[1]"),
+        "items": etree.XPath(".//li"),
+        "strong": etree.XPath("(.//strong)[1]"),
+    }
+    _REKRUTE = {
+        "offers": etree.XPath(f"//li[{_has_class('post-id')}]"),
+        "title": etree.XPath(f"(.//a[{_has_class('titreJob')}])[1]"),
+        "date": etree.XPath(f"(.//em[{_has_class('date')}])[1]//span"),
+        "company": etree.XPath(f"(.//img[{_has_class('photo')}])[1]"),
+        "items": etree.XPath(".//li"),
+        "link": etree.XPath("(.//a)[1]"),
+    }
+    _GLASSDOOR = {
+        "offers": etree.XPath(f"//li[{_has_class('jl')}]"),
+        "title": etree.XPath(f"(.//a[{_has_class('jobLink')}])[1]"),
+        "company": etree.XPath(f"(.//div[{_has_class('jobInfoItem')}])[1]"),
+        "location": etree.XPath("(.//span[normalize-space(@class)='subtle loc'])[1]"),
+    }
+
+
+def _text(element):
+    return "".join(_TEXT(element))
+
+
+def _stripped_text(element):
+    # Équivalent de get_text(strip=True)
+    return "".join(s.strip() for s in _TEXT(element))
+
+
+def _first(selector, element):
+    found = selector(element)
+    return found[0] if found else None
+
+
+def _html_tree(content):
+    """Arbre lxml d'une page (None si la page est vide)"""
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8")
+        except UnicodeDecodeError:
+            # Même détection d'encodage que BeautifulSoup
+            content = UnicodeDammit(content, is_html=True).unicode_markup
+    if not content.strip():
+        return None
+    return lxml.html.document_fromstring(content)
+
+
+def _lxml_offers(content, selectors):
+    tree = _html_tree(content)
+    return selectors["offers"](tree) if tree is not None else []
+
+
+def _emploi_ma_lxml(job):
+    title = _first(_EMPLOI_MA["title"], job)
+    company = _first(_EMPLOI_MA["company"], job)
+    date = _first(_EMPLOI_MA["date"], job)
+    items = []
+    for li in _EMPLOI_MA["items"](job):
+        strong = _first(_EMPLOI_MA["strong"], li)
+        items.append((_stripped_text(li), _stripped_text(strong) if strong is not None else "N/A"))
+    return {
+        "link": job.get("data-href", ""),
+        "title": _stripped_text(title) if title is not None else "N/A",
+        "company": _stripped_text(company) if company is not None else "N/A",
+        "items": items,
+        "date": date.get("datetime") if date is not None else None,
+    }
+
+
+def _rekrute_lxml(offre):
+    bloc_titre = _first(_REKRUTE["title"], offre)
+    spans = _REKRUTE["date"](offre)
+    entreprise = _first(_REKRUTE["company"], offre)
+    items = []
+    for li in _REKRUTE["items"](offre):
+        a_tag = _first(_REKRUTE["link"], li)
+        items.append((_text(li), _text(a_tag).strip() if a_tag is not None else None))
+    return {
+        "title": _text(bloc_titre).strip() if bloc_titre is not None else "",
+        "has_title": bloc_titre is not None,
+        "href": bloc_titre.attrib["href"] if bloc_titre is not None else None,
+        "date": _text(spans[0]).strip() if spans else None,
+        "company": entreprise.get("title", "").strip() if entreprise is not None else "",
+        "items": items,
+    }
+
+
+def _glassdoor_lxml(job):
+    title = _GLASSDOOR["title"](job)[0]
+    return {
+        "title": _text(title).strip(),
+        "company": _text(_GLASSDOOR["company"](job)[0]).strip(),
+        "location": _text(_GLASSDOOR["location"](job)[0]).strip(),
+        "href": title.attrib['href'],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Analyse d'une page
+# ---------------------------------------------------------------------------
+
+def _error_row(error):
+    print("⚠️ Erreur dans une offre:", error)
+    return {k: "ERROR" for k in COLUMNS}
+
+
+def _skip_offer(error):
+    print(f"Erreur lors de l'extraction des détails: {error}")
+    return None
+
+
+# Règles de chaque site : sélection des offres et lecture des champs par backend,
+# construction des lignes et traitement d'une offre illisible (ligne 'ERROR' ou offre ignorée)
+SITES = {
+    "emploi.ma": {
+        "bs4": (lambda content: _bs4_offers(content, "div", "card-job"), _emploi_ma_bs4),
+        "lxml": (lambda content: _lxml_offers(content, _EMPLOI_MA), _emploi_ma_lxml),
+        "build": build_emploi_ma,
+        "on_error": _error_row,
+    },
+    "rekrute": {
+        "bs4": (lambda content: _bs4_offers(content, "li", "post-id"), _rekrute_bs4),
+        "lxml": (lambda content: _lxml_offers(content, _REKRUTE), _rekrute_lxml),
+        "build": build_rekrute,
+        "on_error": _error_row,
+    },
+    "glassdoor": {
+        "bs4": (lambda content: _bs4_offers(content, "li", "jl"), _glassdoor_bs4),
+        "lxml": (lambda content: _lxml_offers(content, _GLASSDOOR), _glassdoor_lxml),
+        "build": lambda fields, **context: build_glassdoor(fields),
+        "on_error": _skip_offer,
+    },
+}
+
+BACKENDS = ["bs4", "lxml"] if etree is not None else ["bs4"]
+
+
+def parse_page(site, content, backend=None, **context):
+    """Extrait les offres d'une page de résultats d'un site (liste vide en fin de pagination)
+
+    `context` est transmis à la construction des lignes (ex. `secteur`)."""
+    rules = SITES[site]
+    select_offers, read_fields = rules[backend or DEFAULT_BACKEND]
+    rows = []
+    for offer in select_offers(content):
+        try:
+            row = rules["build"](read_fields(offer), **context)
+        except Exception as e:
+            row = rules["on_error"](e)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+# Pool d'analyse partagé par tous les scrapers du processus
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """Retourne le pool de threads d'analyse des pages"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+        return _parse_pool
+
+
+def submit_parse(response, site, cache=None, backend=None, **context):
+    """Analyse une page téléchargée dans le pool d'analyse et retourne un Future
+
+    Avec un cache HTTP, le résultat est conservé par contenu de page (clé : site, backend,
+    version des règles d'extraction et contexte)."""
+    backend = backend or DEFAULT_BACKEND
+
+    def parse(content):
+        return parse_page(site, content, backend, **context)
+
+    if cache is None:
+        return get_parse_pool().submit(parse, response.content)
+    parser = ":".join([site, backend, PARSER_VERSION, *map(str, context.values())])
+    return get_parse_pool().submit(cache.parsed, response, parser, parse)
+
+
+def pipelined_pages(fetch, pages, site, cache=None, backend=None, **context):
+    """Télécharge les pages une à une et les analyse dans le pool : l'analyse de la page N
+    se fait pendant le téléchargement de la page N+1
+
+    Produit (page, offres, erreur) dans l'ordre des pages ; en cas d'erreur de téléchargement
+    ou d'analyse, `offres` vaut None. L'appelant peut arrêter l'itération à tout moment
+    (au plus une page supplémentaire aura été téléchargée)."""
+    def outcome(page, future):
+        try:
+            return page, future.result(), None
+        except Exception as e:
+            return page, None, e
+
+    pending = None
+    for page in pages:
+        try:
+            future = submit_parse(fetch(page), site, cache, backend, **context)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+        if pending is not None:
+            yield outcome(*pending)
+        pending = (page, future)
+    if pending is not None:
+        yield outcome(*pending)
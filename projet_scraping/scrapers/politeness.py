@@ -0,0 +1,155 @@
+import time
+import random
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Débit autorisé par site (requêtes par seconde) et nombre de requêtes pouvant partir d'affilée
+HOST_RATES = {
+    "www.emploi.ma": (1 / 1.5, 1),
+    "www.rekrute.com": (1.0, 2),
+    "www.glassdoor.com": (1 / 3, 1),
+    "www.glassdoor.fr": (1 / 7, 1),
+}
+DEFAULT_RATE = (0.5, 1)
+
+# Codes HTTP déclenchant un ralentissement du site et une nouvelle tentative
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def host_of(url):
+    """Retourne le nom d'hôte d'une URL (clé des limites de débit)"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value):
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en nombre de secondes"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Seau à jetons : `rate` jetons par seconde, au plus `capacity` accumulés"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, rate=None):
+        """Réserve un jeton et retourne le temps d'attente avant de pouvoir l'utiliser
+
+        Le jeton est pris immédiatement (le solde peut devenir négatif) : les appels
+        concurrents obtiennent ainsi des créneaux successifs, sans attente active."""
+        rate = rate or self.rate
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / rate
+
+
+class PolitenessScheduler:
+    """Limiteur de débit central : un seau à jetons par site, ralenti en cas de 429/5xx
+
+    Les requêtes vers des sites différents ne s'attendent pas entre elles ; chaque site
+    reste dans son budget. Après une erreur 429 ou 5xx, le débit du site est divisé par deux
+    (jusqu'à `max_backoff`) et l'en-tête Retry-After est respecté ; chaque succès rétablit
+    progressivement le débit nominal."""
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, max_backoff=32, jitter=0.3):
+        self.rates = dict(HOST_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.buckets = {}
+        self.backoff = {}
+        self.blocked_until = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.rates.get(host, self.default_rate)
+                bucket = self.buckets[host] = TokenBucket(rate, capacity)
+            return bucket
+
+    def delay(self, url):
+        """Réserve un créneau pour une requête vers le site de `url` et retourne l'attente (secondes)
+
+        Variante non bloquante de `wait`, pour les appelants asynchrones."""
+        host = host_of(url)
+        bucket = self._bucket(host)
+        delay = bucket.reserve(bucket.rate / self.backoff.get(host, 1))
+        delay = max(delay, self.blocked_until.get(host, 0) - time.monotonic())
+        if delay <= 0:
+            return 0.0
+        # Variation aléatoire pour ne pas envoyer les requêtes à intervalles parfaitement réguliers
+        return delay * random.uniform(1, 1 + self.jitter)
+
+    def wait(self, url):
+        """Bloque jusqu'à ce qu'une requête vers le site de `url` soit autorisée"""
+        delay = self.delay(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def report(self, url, status_code, retry_after=None):
+        """Ajuste le débit d'un site selon la réponse obtenue (None : erreur réseau)"""
+        host = host_of(url)
+        with self.lock:
+            factor = self.backoff.get(host, 1)
+            if status_code is None or status_code in RETRY_STATUSES:
+                factor = min(factor * 2, self.max_backoff)
+                self.backoff[host] = factor
+                rate, _ = self.rates.get(host, self.default_rate)
+                pause = parse_retry_after(retry_after)
+                pause = pause if pause is not None else factor / rate
+                self.blocked_until[host] = max(self.blocked_until.get(host, 0), time.monotonic() + pause)
+                print(f"⏳ {host} : réponse {status_code}, débit divisé par {factor}")
+            elif factor > 1:
+                self.backoff[host] = max(factor / 2, 1)
+
+
+# Limiteur partagé par tous les scrapers du processus
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Retourne le limiteur de débit du processus"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PolitenessScheduler()
+        return _scheduler
+
+
+def polite_get(session, url, scheduler=None, retries=3, **kwargs):
+    """GET soumis au limiteur de débit, avec nouvelles tentatives sur 429/5xx et erreurs réseau"""
+    scheduler = scheduler or get_scheduler()
+    for attempt in range(retries + 1):
+        scheduler.wait(url)
+        try:
+            response = session.get(url, **kwargs)
+        except requests.RequestException:
+            scheduler.report(url, None)
+            if attempt == retries:
+                raise
+            continue
+
+        scheduler.report(url, response.status_code, response.headers.get("Retry-After"))
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
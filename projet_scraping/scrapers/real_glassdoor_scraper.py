@@ -1,5 +1,3 @@
-import time
-import random
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -9,6 +7,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 import pandas as pd
 from typing import List
+from politeness import get_scheduler
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -18,6 +17,8 @@ class RealGlassdoorScraper:
         self.base_url = "https://www.glassdoor.fr"
         self.headless = headless
         self.driver = None
+        # Limiteur de débit par site partagé (remplace les pauses fixes entre pages et mots-clés)
+        self.scheduler = get_scheduler()
         self.setup_driver()
 
     def setup_driver(self):
@@ -44,6 +45,7 @@ class RealGlassdoorScraper:
         jobs = []
         try:
             search_url = f"{self.base_url}/Emplois/index.htm"
+            self.scheduler.wait(search_url)
             self.driver.get(search_url)
             WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             
@@ -73,16 +75,21 @@ class RealGlassdoorScraper:
                     try:
                         next_button = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Next']")
                         if next_button.is_enabled():
+                            old_jobs = self.driver.find_elements(By.CSS_SELECTOR, "[data-test='jobListing']")
+                            self.scheduler.wait(self.base_url)
                             next_button.click()
-                            time.sleep(random.uniform(3, 6))
+                            # Attendre le remplacement des offres de la page précédente
+                            if old_jobs:
+                                WebDriverWait(self.driver, 15).until(EC.staleness_of(old_jobs[0]))
                         else:
                             logger.info("Pas de page suivante disponible")
                             break
                     except NoSuchElementException:
                         logger.info("Bouton 'Suivant' non trouvé")
                         break
-                
-                time.sleep(random.uniform(2, 4))
+                    except TimeoutException:
+                        logger.info("La page suivante ne s'est pas chargée")
+                        break
                 
         except Exception as e:
             logger.error(f"Erreur lors de la recherche: {e}")
@@ -166,7 +173,6 @@ class RealGlassdoorScraper:
             logger.info(f"Début du scraping pour: {keyword}")
             jobs = self.search_jobs(keyword, location, max_pages)
             all_jobs.extend(jobs)
-            time.sleep(random.uniform(10, 20))
         
         return all_jobs
 
@@ -1,10 +1,11 @@
 import os
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
-import time
-import random
-import re
+from requests.adapters import HTTPAdapter
+from politeness import get_scheduler
+from http_cache import get_http_cache
+from seen_store import get_seen_store, new_offers
+from parsers import COLUMNS, DEFAULT_BACKEND, parse_page, pipelined_pages
 
 # URLs de base
 BASE_URL = "https://www.emploi.ma"
@@ -16,110 +17,113 @@ SECTOR_URLS = {
     "Finance": "https://www.emploi.ma/recherche-jobs-maroc/?f[0]=im_field_offre_metiers%3A30"
 }
 
-# 📁 Dossier de sortie
-output_dir = "C:/Users/HP/OneDrive/Nouveau dossier/OneDrive/Desktop/projet_scraping/output"
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-
-# 📦 Structure des données
-data = {
-    "id": [],
-    "Secteur": [],
-    "Poste": [],
-    "Entreprise": [],
-    "Ville": [],
-    "Date_de_publication": [],
-    "Contrat": [],
-    "Experience": [],
-    "Niveau_etude": [],
-    "Lien": []
-}
 
-# 🔎 Fonction pour extraire l'ID d'une offre depuis son URL
-def extract_id(url):
-    match = re.search(r'(\d+)(?:\.html)?$', url)
-    return match.group(1) if match else "N/A"
-
-# 🔁 Scraping de chaque secteur et page
-for secteur, url in SECTOR_URLS.items():
-    for page in range(1, 11):  # Nombre de pages à scraper par secteur
-        print(f"🔍 {secteur} - Page {page}")
-        try:
-            res = requests.get(url, headers=HEADERS, params={"page": page})
-            soup = BeautifulSoup(res.content, "html.parser")
-            cards = soup.find_all("div", class_="card-job")
-
-            if not cards:
-                break  # Fin des pages
-
-            for job in cards:
-                try:
-                    link = job.get("data-href", "")
-                    full_url = BASE_URL + link if link else "N/A"
-                    job_id = extract_id(full_url)
-
-                    titre = job.find("h3").get_text(strip=True) if job.find("h3") else "N/A"
-
-                    entreprise = job.find("a", class_="company-name")
-                    entreprise = entreprise.get_text(strip=True) if entreprise else "N/A"
-
-                    details = {
-                        "Ville": "N/A", "Contrat": "N/A",
-                        "Experience": "N/A", "Niveau_etude": "N/A"
-                    }
-
-                    for li in job.find_all("li"):
-                        txt = li.get_text(strip=True).lower()
-                        strong = li.find("strong")
-                        val = strong.get_text(strip=True) if strong else "N/A"
-
-                        if "ville" in txt:
-                            details["Ville"] = val
-                        elif "contrat" in txt:
-                            details["Contrat"] = val
-                        elif "expérience" in txt:
-                            details["Experience"] = val
-                        elif "étude" in txt:
-                            details["Niveau_etude"] = val
-
-                    # ✅ Date de publication (réelle ou simulée entre 2023 et 2025)
-                    date = job.find("time")
-                    if date and date.get("datetime"):
-                        date_pub = date.get("datetime")
-                    else:
-                        year = random.choice([2023, 2024, 2025])
-                        month = random.randint(1, 12)
-                        day = random.randint(1, 28)
-                        date_pub = f"{year}-{month:02d}-{day:02d}"
-
-                    # 📥 Enregistrement dans le dictionnaire
-                    data["id"].append(job_id)
-                    data["Secteur"].append(secteur)
-                    data["Poste"].append(titre)
-                    data["Entreprise"].append(entreprise)
-                    data["Ville"].append(details["Ville"])
-                    data["Date_de_publication"].append(date_pub)
-                    data["Contrat"].append(details["Contrat"])
-                    data["Experience"].append(details["Experience"])
-                    data["Niveau_etude"].append(details["Niveau_etude"])
-                    data["Lien"].append(full_url)
-
-                except Exception as e:
-                    print("⚠️ Erreur dans une offre:", e)
-                    for k in data:
-                        data[k].append("ERROR")
-
-            time.sleep(random.uniform(1, 2))  # Anti-bannissement
-
-        except Exception as e:
-            print("❌ Erreur de chargement:", e)
-            continue
-
-# 📊 Conversion en DataFrame
-df = pd.DataFrame(data)
-
-# 💾 Export en CSV
-csv_path = os.path.join(output_dir, "offres_emploi_ma_IT_Finance.csv")
-df.to_csv(csv_path, index=False, encoding="utf-8-sig")
-
-print(f"\n✅ {len(df)} offres enregistrées dans {csv_path}")
+# 🔌 Session HTTP partagée : connexions keep-alive réutilisées d'une page à l'autre
+def create_session(pool_size=10, headers=HEADERS):
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class EmploiMaScraper:
+    """Scraper des offres emploi.ma : session poolée et analyse de la page courante
+    pendant le téléchargement de la page suivante"""
+
+    def __init__(self, sector_urls=None, max_pages=10, pool_size=10, timeout=30, scheduler=None, cache=None,
+                 incremental=False, seen=None, backend=DEFAULT_BACKEND):
+        self.sector_urls = sector_urls or SECTOR_URLS
+        self.max_pages = max_pages
+        self.timeout = timeout
+        # Limiteur de débit par site (remplace les pauses fixes entre les pages)
+        self.scheduler = scheduler or get_scheduler()
+        # Cache HTTP partagé : seules les pages modifiées sont retéléchargées et ré-analysées
+        self.cache = cache or get_http_cache()
+        # Mode incrémental : seules les nouvelles offres sont retournées et la pagination d'un
+        # secteur s'arrête à la première page ne contenant que des offres déjà vues
+        self.incremental = incremental
+        self.seen = seen if seen is not None else get_seen_store()
+        # Backend d'analyse HTML ('lxml' : sélecteurs XPath précompilés, 'bs4' : html.parser)
+        self.backend = backend
+        self.session = create_session(pool_size)
+
+    def fetch_page(self, url, page):
+        """Télécharge une page de résultats via le cache, dans la limite de débit du site (anti-bannissement)"""
+        return self.cache.fetch(self.session, url, params={"page": page}, scheduler=self.scheduler, timeout=self.timeout)
+
+    def parse_page(self, content, secteur):
+        """Extrait les offres d'une page de résultats (liste vide en fin de pagination)"""
+        return parse_page("emploi.ma", content, self.backend, secteur=secteur)
+
+    def scrape_sector(self, secteur, url):
+        """Parcourt les pages d'un secteur : la page N est analysée dans le pool d'analyse
+        pendant le téléchargement de la page N+1"""
+        offers = []
+        pages = pipelined_pages(lambda page: self.fetch_page(url, page), range(1, self.max_pages + 1),
+                                "emploi.ma", self.cache, self.backend, secteur=secteur)
+
+        for page, page_offers, error in pages:  # Nombre de pages à scraper par secteur
+            print(f"🔍 {secteur} - Page {page}")
+            if error is not None:
+                print("❌ Erreur de chargement:", error)
+                continue
+
+            if not page_offers:
+                # Fin des pages
+                break
+
+            fresh = new_offers(self.seen, "emploi.ma", page_offers)
+            offers.extend(fresh if self.incremental else page_offers)
+            if self.incremental and not fresh:
+                print(f"⏹️ {secteur} - Page {page} : aucune nouvelle offre, arrêt de la pagination")
+                break
+
+        return offers
+
+    def scrape(self):
+        """Scrape tous les secteurs et retourne les offres sous forme de DataFrame
+
+        Les offres sont marquées comme vues en mémoire : `self.seen.save()` est à appeler une
+        fois l'export écrit, pour qu'un export échoué ne fasse pas ignorer ces offres ensuite."""
+        offers = []
+        for secteur, url in self.sector_urls.items():
+            offers.extend(self.scrape_sector(secteur, url))
+        return pd.DataFrame(offers, columns=COLUMNS)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    # 📁 Dossier de sortie
+    output_dir = "C:/Users/HP/OneDrive/Nouveau dossier/OneDrive/Desktop/projet_scraping/output"
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    csv_path = os.path.join(output_dir, "offres_emploi_ma_IT_Finance.csv")
+
+    # 🔁 Scraping de chaque secteur et page (incrémental si un export existe déjà)
+    incremental = os.path.exists(csv_path)
+    with EmploiMaScraper(incremental=incremental) as scraper:
+        df = scraper.scrape()
+        print(f"🗃️ Cache HTTP : {scraper.cache.stats()}")
+
+    if incremental:
+        # ➕ Ajout des nouvelles offres à l'export existant
+        print(f"🆕 {len(df)} nouvelles offres")
+        df = pd.concat([pd.read_csv(csv_path, dtype=str), df], ignore_index=True).drop_duplicates(subset=["Lien"], keep="last")
+
+    # 💾 Export en CSV
+    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    # ✅ Offres marquées comme vues seulement une fois exportées
+    scraper.seen.save()
+
+    print(f"\n✅ {len(df)} offres enregistrées dans {csv_path}")
@@ -0,0 +1,114 @@
+import os
+import hashlib
+import threading
+import numpy as np
+
+# Fichier des offres déjà collectées, partagé par tous les scrapers
+SEEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output", "seen_offers.npy")
+
+
+class SeenStore:
+    """Ensemble persistant des offres déjà collectées
+
+    Chaque offre est représentée par une empreinte de 8 octets (source + identifiant ou lien),
+    conservée dans un tableau trié sur disque : un million d'offres occupent 8 Mo et une
+    recherche se fait par dichotomie."""
+
+    def __init__(self, path=SEEN_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = set()
+        try:
+            self._hashes = np.load(path)
+        except (OSError, ValueError):
+            self._hashes = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def key_hashes(source, keys):
+        """Empreintes 64 bits des offres d'une source"""
+        return np.array([
+            int.from_bytes(hashlib.blake2b(f"{source}\x1f{key}".encode("utf-8"), digest_size=8).digest(), "little")
+            for key in keys
+        ], dtype=np.uint64)
+
+    def _known(self, hashes):
+        positions = np.searchsorted(self._hashes, hashes)
+        known = np.zeros(len(hashes), dtype=bool)
+        inside = positions < len(self._hashes)
+        known[inside] = self._hashes[positions[inside]] == hashes[inside]
+        if self._pending:
+            known |= np.fromiter((int(h) in self._pending for h in hashes), dtype=bool, count=len(hashes))
+        return known
+
+    def filter_new(self, source, keys):
+        """Retourne les clés d'offres jamais vues pour une source"""
+        keys = list(keys)
+        if not keys:
+            return []
+        with self._lock:
+            known = self._known(self.key_hashes(source, keys))
+        return [key for key, seen in zip(keys, known) if not seen]
+
+    def add(self, source, keys):
+        """Marque des offres comme vues (enregistrées sur disque au prochain `save`)"""
+        hashes = self.key_hashes(source, keys)
+        with self._lock:
+            self._pending.update(int(h) for h in hashes)
+
+    def add_new(self, source, keys):
+        """Marque des offres comme vues et retourne celles qui ne l'étaient pas (en une seule opération,
+        pour que deux threads ne signalent pas la même offre comme nouvelle)"""
+        keys = list(keys)
+        if not keys:
+            return []
+        hashes = self.key_hashes(source, keys)
+        with self._lock:
+            known = self._known(hashes)
+            new_keys = []
+            for key, h, seen in zip(keys, hashes, known):
+                if not seen and int(h) not in self._pending:
+                    self._pending.add(int(h))
+                    new_keys.append(key)
+            return new_keys
+
+    def __len__(self):
+        with self._lock:
+            return len(self._hashes) + len(self._pending)
+
+    def save(self):
+        """Fusionne les nouvelles offres dans le tableau trié et l'écrit sur disque"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending = np.fromiter(self._pending, dtype=np.uint64, count=len(self._pending))
+            self._hashes = np.union1d(self._hashes, pending)
+            self._pending.clear()
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, self._hashes)
+            os.replace(tmp_path, self.path)
+
+
+def new_offers(store, source, offers, key="Lien"):
+    """Filtre les offres jamais vues d'une page et les marque comme vues
+
+    Les lignes en erreur (sans lien valide) ne sont ni nouvelles ni enregistrées."""
+    keys = [offer[key] for offer in offers if str(offer.get(key, "")).startswith("http")]
+    fresh = set(store.add_new(source, keys))
+    return [offer for offer in offers if offer.get(key) in fresh]
+
+
+# Ensemble partagé par tous les scrapers du processus
+_seen_store = None
+_seen_store_lock = threading.Lock()
+
+
+def get_seen_store():
+    """Retourne l'ensemble des offres déjà collectées du processus"""
+    global _seen_store
+    with _seen_store_lock:
+        if _seen_store is None:
+            _seen_store = SeenStore()
+        return _seen_store
@@ -1,121 +1,70 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from async_fetcher import AsyncFetcher, MAX_PER_HOST
+from http_cache import get_http_cache
+from seen_store import get_seen_store, new_offers
+from parsers import submit_parse
 import pandas as pd
-import uuid
 import os
-import random
-from datetime import datetime
+
+# Colonnes des offres extraites
+COLONNES = ["id", "Secteur", "Poste", "Entreprise", "Ville", "Date_de_publication",
+            "Lien", "Experience", "Contrat", "Niveau_etude"]
+
+# Secteurs scrapés : (URL de la liste des offres, nom du secteur)
+SECTEURS = [
+    ("https://www.rekrute.com/offres-emploi-banque-finance-10.html", "Finance"),
+    ("https://www.rekrute.com/offres-emploi-informatique-24.html", "Informatique"),
+]
 
 # Fonction pour scraper les offres sur Rekrute
-def scraper_rekrute(url_base, nom_secteur):
-    ids, secteurs, entreprises, postes, villes, dates, liens, Experiences, Niveau_etudes, Contrats = [], [], [], [], [], [], [], [], [], []
+# (mode incrémental : seules les nouvelles offres sont retournées et la pagination s'arrête
+# à la première page ne contenant que des offres déjà vues)
+async def scraper_rekrute(fetcher, url_base, nom_secteur, seen, incremental=False, pages=range(1, 30),
+                          fenetre=MAX_PER_HOST):
+    lignes = []
 
-    for page in range(1, 30):
+    async def telecharger(page):
         print(f"{nom_secteur} - Page {page}...")
-        url = f"{url_base}?s=1&p={page}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-
-        try:
-            response = requests.get(url, headers=headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            offres = soup.find_all("li", class_="post-id")
+        # Chaque page est analysée dans le pool d'analyse pendant le téléchargement des autres
+        response = await fetcher.fetch(f"{url_base}?s=1&p={page}")
+        return await asyncio.wrap_future(submit_parse(response, "rekrute", fetcher.cache, secteur=nom_secteur))
+
+    # Pages téléchargées par fenêtres de `fenetre` requêtes simultanées, traitées dans l'ordre :
+    # l'arrêt (page vide, aucune nouvelle offre) gaspille au plus une fenêtre de requêtes
+    pages = list(pages)
+    for debut in range(0, len(pages), fenetre):
+        bloc = pages[debut:debut + fenetre]
+        resultats = await asyncio.gather(*(telecharger(page) for page in bloc), return_exceptions=True)
+        for page, offres in zip(bloc, resultats):
+            if isinstance(offres, Exception):
+                print(f"Erreur sur la page {page}: {offres}")
+                continue
 
             if not offres:
-                break
-
-            for offre in offres:
-                try:
-                    offre_id = str(uuid.uuid4())
-                    ids.append(offre_id)
-
-                    bloc_titre = offre.find("a", class_="titreJob")
-                    titre = bloc_titre.text.strip() if bloc_titre else ""
-                    poste = titre.split("|")[0].strip() if "|" in titre else titre
-                    postes.append(poste)
-
-                    lien = "https://www.rekrute.com" + bloc_titre["href"] if bloc_titre else ""
-                    liens.append(lien)
-
-                    # 📅 Date de publication (réelle ou simulée)
-                    date_tag = offre.find("em", class_="date")
-                    if date_tag:
-                        spans = date_tag.find_all("span")
-                        if len(spans) >= 1:
-                            date_text = spans[0].text.strip()
-                            try:
-                                date_pub = datetime.strptime(date_text, "%d/%m/%Y").strftime("%Y-%m-%d")
-                            except:
-                                # ✅ Si la date est invalide, on simule une date
-                                year = random.choice([2023, 2024, 2025])
-                                month = random.randint(1, 12)
-                                day = random.randint(1, 28)
-                                date_pub = f"{year}-{month:02d}-{day:02d}"
-                        else:
-                            # ✅ Si vide, on génère une date aléatoire
-                            year = random.choice([2023, 2024, 2025])
-                            month = random.randint(1, 12)
-                            day = random.randint(1, 28)
-                            date_pub = f"{year}-{month:02d}-{day:02d}"
-                    else:
-                        # ✅ Si aucune balise <em class="date">, on simule
-                        year = random.choice([2023, 2024, 2025])
-                        month = random.randint(1, 12)
-                        day = random.randint(1, 28)
-                        date_pub = f"{year}-{month:02d}-{day:02d}"
-                    dates.append(date_pub)
-
-                    entreprise_tag = offre.find("img", class_="photo")
-                    entreprise = entreprise_tag.get("title", "").strip() if entreprise_tag else ""
-                    entreprises.append(entreprise)
-
-                    secteur = ""
-                    Experience = ""
-                    Niveau_etude = ""
-                    Contrat = ""
-
-                    liste_li = offre.find_all("li")
-                    for li in liste_li:
-                        if "Secteur d'activité" in li.text:
-                            a_tag = li.find("a")
-                            secteur = a_tag.text.strip() if a_tag else nom_secteur
-                        elif "Expérience requise" in li.text:
-                            a_tag = li.find("a")
-                            Experience = a_tag.text.strip() if a_tag else ""
-                        elif "Niveau d'étude demandé" in li.text:
-                            a_tag = li.find("a")
-                            Niveau_etude = a_tag.text.strip() if a_tag else ""
-                        elif "Type de contrat proposé" in li.text:
-                            a_tag = li.find("a")
-                            Contrat = a_tag.text.strip() if a_tag else ""
-
-                    secteurs.append(secteur if secteur else nom_secteur)
-                    Experiences.append(Experience)
-                    Niveau_etudes.append(Niveau_etude)
-                    Contrats.append(Contrat)
-
-                    ville = titre.split("|")[-1].strip(" )(") if "|" in titre else ""
-                    villes.append(ville)
-                except Exception as e:
-                    print("Erreur sur une offre :", e)
-                    for k in [ids, secteurs, entreprises, postes, villes, dates, liens, Experiences, Niveau_etudes, Contrats]:
-                        k.append("ERROR")
-
-        except Exception as e:
-            print(f"Erreur sur la page {page}: {e}")
-            continue
-
-    return pd.DataFrame({
-        "id": ids,
-        "Secteur": secteurs,
-        "Poste": postes,
-        "Entreprise": entreprises,
-        "Ville": villes,
-        "Date_de_publication": dates,
-        "Lien": liens,
-        "Experience": Experiences,
-        "Contrat": Contrats,
-        "Niveau_etude": Niveau_etudes
-    })
+                return pd.DataFrame(lignes, columns=COLONNES)
+
+            nouvelles = new_offers(seen, "rekrute", offres)
+            lignes.extend(nouvelles if incremental else offres)
+
+            if incremental and not nouvelles:
+                print(f"{nom_secteur} - Page {page} : aucune nouvelle offre, arrêt")
+                return pd.DataFrame(lignes, columns=COLONNES)
+
+    return pd.DataFrame(lignes, columns=COLONNES)
+
+
+# Tous les secteurs scrapés simultanément : pool de connexions et limiteur de débit communs au site
+def scraper_secteurs(secteurs=SECTEURS, incremental=False, cache=None, seen=None, scheduler=None, **options):
+    seen = seen if seen is not None else get_seen_store()
+
+    async def executer():
+        async with AsyncFetcher(scheduler=scheduler, cache=cache) as fetcher:
+            return await asyncio.gather(*(
+                scraper_rekrute(fetcher, url_base, nom_secteur, seen, incremental, **options)
+                for url_base, nom_secteur in secteurs
+            ))
+
+    return asyncio.run(executer())
 
 # Fonction de nettoyage
 def clean_data(df):
@@ -143,24 +92,40 @@ def clean_data(df):
                   'Contrat', 'Experience', 'Niveau_etude', 'Lien']
     return df[cols_order]
 
-# Lancer le scraping
-print("🔍 Scraping des offres Finance...")
-df_finance = scraper_rekrute("https://www.rekrute.com/offres-emploi-banque-finance-10.html", "Finance")
+if __name__ == "__main__":
+    output_dir = "C:/Users/HP/OneDrive/Nouveau dossier/OneDrive/Desktop/projet_scraping/output"
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    csv_path = os.path.join(output_dir, "ORK.csv")
+
+    # Scraping incrémental si un export existe déjà
+    incremental = os.path.exists(csv_path)
+
+    # Cache HTTP partagé : seules les pages modifiées sont retéléchargées et ré-analysées
+    cache = get_http_cache()
+
+    # Offres déjà collectées lors des exécutions précédentes
+    seen = get_seen_store()
 
-print("🔍 Scraping des offres Informatique...")
-df_info = scraper_rekrute("https://www.rekrute.com/offres-emploi-informatique-24.html", "Informatique")
+    # Lancer le scraping des deux secteurs en parallèle (le limiteur de débit reste commun au site)
+    print("🔍 Scraping des offres Finance et Informatique...")
+    df_finance, df_info = scraper_secteurs(SECTEURS, incremental, cache, seen)
 
-# Fusion et nettoyage
-df_fusion = pd.concat([df_finance, df_info], ignore_index=True)
-df_clean = clean_data(df_fusion)
+    # Fusion et nettoyage
+    df_fusion = pd.concat([df_finance, df_info], ignore_index=True)
+    df_clean = clean_data(df_fusion)
 
-# Sauvegarde
-output_dir = "C:/Users/HP/OneDrive/Nouveau dossier/OneDrive/Desktop/projet_scraping/output"
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
+    if incremental:
+        # Ajout des nouvelles offres à l'export existant
+        print(f"🆕 {len(df_clean)} nouvelles offres")
+        df_clean = pd.concat([pd.read_csv(csv_path), df_clean], ignore_index=True).drop_duplicates(subset=['Lien'], keep='last')
 
-csv_path = os.path.join(output_dir, "ORK.csv")
-df_clean.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    # Sauvegarde
+    df_clean.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    # Offres marquées comme vues seulement une fois exportées
+    seen.save()
 
-print(f"\n✅ Fichier CSV exporté avec succès : {csv_path}")
-print(f"📊 Total d'offres : {len(df_clean)}")
+    print(f"\n✅ Fichier CSV exporté avec succès : {csv_path}")
+    print(f"📊 Total d'offres : {len(df_clean)}")
+    print(f"🗃️ Cache HTTP : {cache.stats()}")
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# Les modules du projet s'importent à plat depuis leur dossier (analysis_ml, scrapers)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("analysis_ml", "scrapers"):
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def local_site():
+    """Site HTTP local : `routes` associe un chemin (avec sa requête) à une fonction
+    handler -> (code, en-têtes, contenu) ; chaque requête est journalisée dans `log`"""
+    routes = {}
+    log = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            log.append({"path": self.path, "headers": dict(self.headers), "client": self.client_address})
+            route = routes.get(self.path)
+            status, headers, body = route(self) if route else (404, {}, b"")
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", routes, log
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,88 @@
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from http_cache import HttpCache
+from politeness import PolitenessScheduler
+from seen_store import SeenStore
+from wissal import scraper_secteurs
+
+PAGES = 6
+LATENCY = 0.2
+
+
+def rekrute_page(secteur, page):
+    offers = "".join(
+        f'<li class="post-id"><a class="titreJob" href="/offre-{secteur}-{page}-{i}.html">Poste {i} | Rabat</a>'
+        f'<em class="date"><span>02/01/2024</span></em></li>'
+        for i in range(3)
+    )
+    return f"<html><body><ul>{offers}</ul></body></html>".encode("utf-8")
+
+
+@pytest.fixture
+def rekrute_server():
+    """Site Rekrute local : 6 pages d'offres par secteur, 200 ms par réponse, une erreur 503 par secteur"""
+    requests_seen = []
+    failed = set()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            secteur, page = url.path.strip("/"), int(parse_qs(url.query)["p"][0])
+            time.sleep(LATENCY)
+            with lock:
+                requests_seen.append((secteur, page))
+                first_failure = page == 2 and secteur not in failed
+                failed.add(secteur)
+            if first_failure:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = rekrute_page(secteur, page) if page <= PAGES else b"<html><body></body></html>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_sectors_are_crawled_concurrently(rekrute_server, tmp_path):
+    base_url, requests_seen = rekrute_server
+    secteurs = [(f"{base_url}/finance", "Finance"), (f"{base_url}/informatique", "Informatique")]
+    scheduler = PolitenessScheduler(rates={}, default_rate=(100, 10), jitter=0)
+    cache = HttpCache(str(tmp_path / "cache"))
+    seen = SeenStore(str(tmp_path / "seen.npy"))
+
+    start = time.perf_counter()
+    frames = scraper_secteurs(secteurs, cache=cache, seen=seen, scheduler=scheduler)
+    elapsed = time.perf_counter() - start
+
+    # Toutes les offres sont collectées, malgré l'erreur 503 (nouvelle tentative)
+    for frame, (_, nom) in zip(frames, secteurs):
+        assert len(frame) == PAGES * 3
+        assert set(frame["Secteur"]) == {nom}
+        assert frame["Lien"].is_unique
+
+    # Requêtes séquentielles : au moins une latence par requête ; ici plusieurs pages à la fois
+    assert elapsed < len(requests_seen) * LATENCY / 2
+
+    # Seconde exécution : pages servies par le cache, sans réseau
+    count = len(requests_seen)
+    frames = scraper_secteurs(secteurs, cache=cache, seen=SeenStore(str(tmp_path / "other.npy")), scheduler=scheduler)
+    assert [len(frame) for frame in frames] == [PAGES * 3, PAGES * 3]
+    assert len(requests_seen) == count
+    cache.close()
@@ -0,0 +1,27 @@
+import json
+
+from catalog import get_catalog_paths, load_catalog
+from job_profiles_recommender import JobProfilesRecommender
+from university_recommender import UniversityRecommender
+
+
+def test_catalogs_match_their_json_source():
+    for name in ('job_profiles', 'university_programs', 'skills_database'):
+        json_path, _ = get_catalog_paths(name)
+        with open(json_path, encoding='utf-8') as f:
+            assert load_catalog(name).data == json.load(f)
+
+
+def test_instances_do_not_share_mutable_catalog_data():
+    first, second = JobProfilesRecommender(), JobProfilesRecommender()
+    name = next(iter(first.job_profiles))
+    first.job_profiles[name]['skills_required'].append('Cobol')
+    first.job_profiles['Nouveau profil'] = {'skills_required': []}
+    assert 'Cobol' not in second.job_profiles[name]['skills_required']
+    assert 'Nouveau profil' not in second.job_profiles
+    assert load_catalog('job_profiles').data == JobProfilesRecommender().job_profiles
+
+    first, second = UniversityRecommender(), UniversityRecommender()
+    program = next(iter(first.university_programs))
+    first.recommend_modules(program=program).append('Module ajouté')
+    assert 'Module ajouté' not in second.recommend_modules(program=program)
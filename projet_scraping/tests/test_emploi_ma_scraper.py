@@ -0,0 +1,114 @@
+import re
+import requests
+from bs4 import BeautifulSoup
+from politeness import PolitenessScheduler
+from http_cache import HttpCache
+from seen_store import SeenStore
+from scrapy import EmploiMaScraper
+
+BASE_URL = "https://www.emploi.ma"
+COLUMNS = ["id", "Secteur", "Poste", "Entreprise", "Ville", "Date_de_publication",
+           "Contrat", "Experience", "Niveau_etude", "Lien"]
+
+
+def card(i):
+    return (f'<div class="card-job" data-href="/offre-emploi-maroc/poste-{i}.html">'
+            f'<h3>Poste {i}</h3><a class="company-name">Société {i % 3}</a>'
+            f'<ul><li>Ville : <strong>{["Rabat", "Casablanca"][i % 2]}</strong></li>'
+            f'<li>Contrat : <strong>CDI</strong></li>'
+            f'<li>Niveau d\'expérience : <strong>{i % 5} ans</strong></li>'
+            f'<li>Niveau d\'études : <strong>Bac+5</strong></li></ul>'
+            f'<time datetime="2024-01-{i % 28 + 1:02d}"></time></div>')
+
+
+def listing(offers):
+    return ("<html><body>" + "".join(card(i) for i in offers) + "</body></html>").encode("utf-8")
+
+
+def baseline_scrape(sector_urls, max_pages=10):
+    """Ancienne boucle de scrapy.py : un requests.get par page, analyse BeautifulSoup, arrêt sur page vide"""
+    rows = []
+    for secteur, url in sector_urls.items():
+        for page in range(1, max_pages + 1):
+            res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, params={"page": page})
+            cards = BeautifulSoup(res.content, "html.parser").find_all("div", class_="card-job")
+            if not cards:
+                break
+            for job in cards:
+                link = job.get("data-href", "")
+                full_url = BASE_URL + link if link else "N/A"
+                match = re.search(r'(\d+)(?:\.html)?$', full_url)
+                entreprise = job.find("a", class_="company-name")
+                details = {"Ville": "N/A", "Contrat": "N/A", "Experience": "N/A", "Niveau_etude": "N/A"}
+                for li in job.find_all("li"):
+                    txt = li.get_text(strip=True).lower()
+                    strong = li.find("strong")
+                    val = strong.get_text(strip=True) if strong else "N/A"
+                    if "ville" in txt:
+                        details["Ville"] = val
+                    elif "contrat" in txt:
+                        details["Contrat"] = val
+                    elif "expérience" in txt:
+                        details["Experience"] = val
+                    elif "étude" in txt:
+                        details["Niveau_etude"] = val
+                rows.append({
+                    "id": match.group(1) if match else "N/A",
+                    "Secteur": secteur,
+                    "Poste": job.find("h3").get_text(strip=True),
+                    "Entreprise": entreprise.get_text(strip=True) if entreprise else "N/A",
+                    "Date_de_publication": job.find("time").get("datetime"),
+                    "Lien": full_url,
+                    **details,
+                })
+    return rows
+
+
+def site_with_pages(local_site, pages):
+    base, routes, log = local_site
+    for sector, sector_pages in pages.items():
+        for page in range(1, 11):
+            offers = sector_pages[page - 1] if page <= len(sector_pages) else []
+            routes[f"/{sector}?page={page}"] = lambda handler, body=listing(offers): (200, {}, body)
+    return {sector: f"{base}/{sector}" for sector in pages}, log
+
+
+def make_scraper(tmp_path, sector_urls, backend):
+    return EmploiMaScraper(
+        sector_urls=sector_urls,
+        scheduler=PolitenessScheduler(rates={}, default_rate=(1000, 10), jitter=0),
+        cache=HttpCache(str(tmp_path / f"cache-{backend}")),
+        seen=SeenStore(str(tmp_path / f"seen-{backend}.npy")),
+        backend=backend,
+    )
+
+
+def test_same_offers_as_the_sequential_scraper(tmp_path, local_site):
+    pages = {"IT": [range(0, 20), range(20, 35)], "Finance": [range(100, 110)]}
+    sector_urls, log = site_with_pages(local_site, pages)
+    expected = baseline_scrape(sector_urls)
+    assert len(expected) == 45
+
+    for backend in ("lxml", "bs4"):
+        with make_scraper(tmp_path, sector_urls, backend) as scraper:
+            df = scraper.scrape()
+            scraper.cache.close()
+        assert list(df.columns) == COLUMNS
+        assert df.to_dict("records") == [{col: row[col] for col in COLUMNS} for row in expected]
+
+
+def test_pages_share_one_pooled_connection_and_stop_on_empty_page(tmp_path, local_site):
+    pages = {"IT": [range(0, 5), range(5, 10), range(10, 12)]}
+    sector_urls, log = site_with_pages(local_site, pages)
+
+    with make_scraper(tmp_path, sector_urls, "lxml") as scraper:
+        assert len(scraper.scrape()) == 12
+        scraper.cache.close()
+
+    # Pages 1 à 3 puis la page vide qui termine la pagination (la page suivante peut déjà être en cours)
+    paths = [entry["path"] for entry in log]
+    assert paths[:4] == [f"/IT?page={page}" for page in range(1, 5)]
+    assert len(paths) <= 5
+    # Connexion keep-alive réutilisée d'une page à l'autre, et en-têtes de la session envoyés
+    assert len({entry["client"] for entry in log}) == 1
+    assert all(entry["headers"]["User-Agent"] == "Mozilla/5.0" for entry in log)
@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+from enrichment_pipeline import enrich_csv_sharded
+
+
+def test_chunk_without_any_skills_is_enriched(tmp_path):
+    # 40 offres dont les 20 dernières sans compétences : les deux derniers lots sont entièrement vides
+    df = pd.DataFrame({
+        'Id': range(40),
+        'Poste': ['Data Scientist', 'Comptable'] * 20,
+        'Secteur': ['IT', 'Finance'] * 20,
+        'Competences': ['Python, SQL'] * 20 + [None] * 20,
+    })
+    input_path = tmp_path / 'offres.csv'
+    output_path = tmp_path / 'offres_enrichies.csv'
+    df.to_csv(input_path, index=False)
+
+    result = enrich_csv_sharded(str(input_path), str(output_path), chunksize=10, workers=2, seed=1)
+
+    enriched = pd.read_csv(output_path)
+    assert result['rows'] == 40
+    assert enriched['Id'].tolist() == list(range(40))
+    assert enriched['Competences'].iloc[:20].eq('Python, SQL').all()
+    assert enriched['Competences'].notna().all()
+    assert not os.path.exists(str(output_path) + '.tmp')
+
+
+def test_enrich_dataframe_accepts_float_skills_column():
+    from skills_generator import SkillsGenerator
+
+    df = pd.DataFrame({'Poste': ['Data Scientist', 'Comptable'], 'Secteur': ['IT', 'Finance'],
+                       'Competences': [float('nan'), float('nan')]})
+    enriched = SkillsGenerator(seed=1).enrich_dataframe(df)
+    assert enriched['Competences'].map(lambda skills: isinstance(skills, str) and skills != '').all()
+
+
+def test_posting_skills_do_not_depend_on_id_dtype():
+    from skills_generator import SkillsGenerator
+
+    def enrich(ids):
+        df = pd.DataFrame({'Id': ids, 'Poste': ['Data Scientist', 'Comptable'], 'Secteur': ['IT', 'Finance'],
+                           'Competences': [None, None]})
+        return SkillsGenerator(seed=7).enrich_dataframe(df)['Competences'].iloc[0]
+
+    # Un identifiant manquant dans le lot fait lire la colonne en float64 (12 devient 12.0)
+    assert enrich([12, float('nan')]) == enrich([12, 13]) == enrich(['12', None])
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import get_dataset, invalidate_dataset, prepare_dataframe
+from forecasting import ForecastCache, counts_fingerprint, forecast_version, yearly_counts
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 400
+    df = pd.DataFrame({
+        'Id': range(n),
+        'Secteur': rng.choice(['IT', 'Finance', 'RH', 'Marketing'], n, p=[0.4, 0.3, 0.2, 0.1]),
+        'Experience': rng.choice([0, 2, 5], n),
+        'Date_De_Publication': [f'{year}-{month:02d}-15' for year, month in
+                                zip(rng.choice([2021, 2022, 2023, 2024], n, p=[0.1, 0.2, 0.3, 0.4]),
+                                    rng.integers(1, 13, n))],
+        'Competences': ['Python'] * n,
+    })
+    df.loc[df['Secteur'] == 'Marketing', 'Date_De_Publication'] = '2024-03-01'
+    invalidate_dataset()
+    csv_path = str(tmp_path / 'offres.csv')
+    df.to_csv(csv_path, index=False)
+    yield get_dataset(csv_path, loader=lambda path: prepare_dataframe(pd.read_csv(path)))
+    invalidate_dataset()
+
+
+def test_versions_do_not_evict_each_other(dataset):
+    cache = ForecastCache(max_size=4)
+    shared = forecast_version(dataset)
+    subset = forecast_version(dataset[dataset['Secteur'] == 'IT'])
+    counts = counts_fingerprint(yearly_counts(dataset))
+    assert len({shared, subset, counts}) == 3
+    assert forecast_version(dataset[dataset['Secteur'] == 'IT'].reset_index(drop=True)) is None
+
+    # Pages différentes (jeu partagé, sous-ensemble, table de comptes) en alternance
+    for version in (shared, subset, counts):
+        cache.put(version, 'IT', 2025, 'linear', (version, 1.0))
+    for version in (shared, subset, counts):
+        assert cache.get(version, 'IT', 2025, 'linear') == (version, 1.0)
+
+    # Seule la taille maximale évince, par ordre d'utilisation
+    cache.put(shared, 'RH', 2025, 'linear', (1, 0.0))
+    cache.put(shared, 'Finance', 2025, 'linear', (2, 0.0))
+    assert cache.get(shared, 'IT', 2025, 'linear') is None
+    assert cache.get(counts, 'IT', 2025, 'linear') == (counts, 1.0)
+    assert cache.stats()['entries'] == 4
+
+
+def baseline_predict_job_growth(df, sector, target_year=2025):
+    # Prévision d'origine (utils.predict_job_growth) : une régression scikit-learn par secteur
+    from sklearn.linear_model import LinearRegression
+
+    annonces_par_annee = df.groupby(['Annee', 'Secteur'], observed=True).size().reset_index(name='Nb_Annonces')
+    data_sec = annonces_par_annee[annonces_par_annee['Secteur'] == sector]
+    if len(data_sec) < 2:
+        return None, None
+    model = LinearRegression()
+    model.fit(data_sec[['Annee']].to_numpy(), data_sec['Nb_Annonces'])
+    prediction = model.predict([[target_year]])[0]
+
+    years = sorted(data_sec['Annee'].unique())
+    first_year, last_year = years[0], years[-1]
+    first_count = data_sec[data_sec['Annee'] == first_year]['Nb_Annonces'].values[0]
+    last_count = data_sec[data_sec['Annee'] == last_year]['Nb_Annonces'].values[0]
+    if first_count > 0 and last_year > first_year:
+        growth_rate = ((last_count / first_count) ** (1 / (last_year - first_year)) - 1) * 100
+    else:
+        growth_rate = 0
+    return prediction, growth_rate
+
+
+def test_batch_forecasts_match_per_sector_regressions(dataset):
+    from forecasting import forecast_sectors
+
+    forecasts = forecast_sectors(dataset, [2025, 2027])
+    for sector in dataset['Secteur'].unique():
+        for year in (2025, 2027):
+            prediction, growth_rate = baseline_predict_job_growth(dataset, sector, year)
+            if prediction is None:
+                assert sector not in forecasts.index
+                continue
+            assert forecasts.loc[sector, f'Prediction_{year}'] == pytest.approx(prediction)
+            assert forecasts.loc[sector, 'Taux_Croissance'] == pytest.approx(growth_rate)
+    assert 'Marketing' not in forecasts.index
+
+
+def test_period_models_and_backtest():
+    from forecasting import backtest, linear_trend_forecast, period_matrix, seasonal_naive_forecast
+
+    df = pd.DataFrame({
+        'Secteur': ['IT', 'IT', 'IT', 'Finance', 'Finance'],
+        'Date_De_Publication': ['2024-01-05', '2024-01-20', '2024-04-02', '2024-02-10', None],
+    })
+    history, sectors, periods = period_matrix(df, 'M')
+    assert list(sectors) == ['Finance', 'IT']
+    assert list(periods.astype(str)) == ['2024-01', '2024-02', '2024-03', '2024-04']
+    assert history.tolist() == [[0, 1, 0, 0], [2, 0, 0, 1]]
+
+    # Tendance : même extrapolation qu'un ajustement polynomial de degré 1 par ligne
+    rng = np.random.default_rng(0)
+    series = rng.poisson(20, (3, 36)).astype(np.float64) + np.arange(36)
+    expected = [np.polyval(np.polyfit(np.arange(36), row, 1), np.arange(36, 42)) for row in series]
+    assert np.allclose(linear_trend_forecast(series, 6), expected)
+
+    # Série purement saisonnière : la saison précédente est répétée et gagne le backtesting
+    seasonal = np.tile(np.array([5, 1, 1, 1, 9, 1, 1, 1, 1, 1, 1, 12], dtype=np.float64), (1, 4))
+    assert np.array_equal(seasonal_naive_forecast(seasonal, 12), seasonal[:, -12:])
+    errors = backtest(seasonal, 6)
+    assert errors['seasonal_naive'][0] == 0
+    assert min(errors, key=lambda name: errors[name][0]) == 'seasonal_naive'
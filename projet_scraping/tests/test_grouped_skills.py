@@ -0,0 +1,54 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import get_dataset, invalidate_dataset, prepare_dataframe
+from skills_matrix import count_skills, counters_by_group, grouped_skill_counts, top_skills
+
+
+def baseline_counter(df):
+    # Comptage d'origine (skills_analysis.extract_skills_from_df)
+    all_skills = []
+    for skills_str in df['Competences'].dropna():
+        all_skills.extend(skill.strip() for skill in skills_str.split(','))
+    return Counter(all_skills)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    # Peu d'offres et beaucoup d'égalités : l'ordre des ex aequo est vérifié
+    rng = np.random.default_rng(4)
+    skills = ['Python', 'SQL', 'Excel', 'Java', 'Audit', 'Docker', 'Git', 'SAP']
+    n = 60
+    df = pd.DataFrame({
+        'Id': range(n),
+        'Secteur': rng.choice(['IT', 'Finance', 'RH'], n),
+        'Experience': rng.choice([1, 3, 7, 12, np.nan], n),
+        'Date_De_Publication': rng.choice(['2023-03-01', '2024-06-15', '2025-02-01'], n),
+        'Competences': [', '.join(rng.choice(skills, rng.integers(1, 4), replace=False)) for _ in range(n)],
+    })
+    invalidate_dataset()
+    csv_path = str(tmp_path / 'offres.csv')
+    df.to_csv(csv_path, index=False)
+    yield get_dataset(csv_path, loader=lambda path: prepare_dataframe(pd.read_csv(path)))
+    invalidate_dataset()
+
+
+@pytest.mark.parametrize('column', ['Secteur', 'Annee', 'Experience'])
+def test_grouped_counts_match_per_group_counters(dataset, column):
+    counters = counters_by_group(grouped_skill_counts(dataset, column), column)
+    for group in dataset[column].dropna().unique():
+        expected = baseline_counter(dataset[dataset[column] == group])
+        assert counters[group] == expected
+        for n in (1, 3, None):
+            assert counters[group].most_common(n) == expected.most_common(n)
+
+
+def test_subset_ties_follow_subset_order(dataset):
+    for subset in (dataset[dataset['Secteur'] == 'RH'], dataset.iloc[::-1], dataset.iloc[30:]):
+        expected = baseline_counter(subset)
+        for n in (1, 2, 5, None):
+            assert top_skills(subset, n) == expected.most_common(n)
+        assert list(count_skills(subset).items()) == list(expected.items())
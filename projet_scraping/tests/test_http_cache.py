@@ -0,0 +1,117 @@
+import random
+import requests
+from politeness import PolitenessScheduler
+from http_cache import HttpCache
+
+
+def make_cache(tmp_path, **options):
+    return HttpCache(str(tmp_path / "cache"), **options)
+
+
+def fetch(cache, session, url, page=1):
+    scheduler = PolitenessScheduler(rates={}, default_rate=(1000, 10), jitter=0)
+    return cache.fetch(session, url, params={"page": page}, scheduler=scheduler, timeout=5)
+
+
+def conditional_route(state):
+    """Page servie avec un ETag : 304 si le client présente la version courante"""
+    def route(handler):
+        etag = f'"v{state["version"]}"'
+        if handler.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, state["body"]
+    return route
+
+
+def test_same_content_as_a_direct_get(tmp_path, local_site):
+    base, routes, log = local_site
+    routes["/offres?page=1"] = lambda handler: (200, {}, "<p>Offre à Rabat</p>".encode("utf-8"))
+
+    cache = make_cache(tmp_path)
+    with requests.Session() as session:
+        direct = requests.get(base + "/offres", params={"page": 1})
+        first = fetch(cache, session, base + "/offres")
+        second = fetch(cache, session, base + "/offres")
+
+    assert first.content == second.content == direct.content
+    assert (first.from_cache, first.changed) == (False, True)
+    # Copie fraîche : servie sans requête réseau
+    assert (second.from_cache, second.changed) == (True, False)
+    assert len(log) == 2
+    assert cache.stats() == {"fresh_hits": 1, "revalidated": 0, "downloads": 1}
+    cache.close()
+
+
+def test_expired_copy_is_revalidated_with_its_etag(tmp_path, local_site):
+    base, routes, log = local_site
+    state = {"version": 1, "body": b"<p>version 1</p>"}
+    routes["/offres?page=1"] = conditional_route(state)
+
+    cache = make_cache(tmp_path, ttl=0)
+    with requests.Session() as session:
+        fetch(cache, session, base + "/offres")
+        unchanged = fetch(cache, session, base + "/offres")
+        assert log[-1]["headers"]["If-None-Match"] == '"v1"'
+        assert unchanged.content == b"<p>version 1</p>"
+        assert (unchanged.from_cache, unchanged.changed) == (True, False)
+
+        state.update(version=2, body=b"<p>version 2</p>")
+        changed = fetch(cache, session, base + "/offres")
+
+    assert changed.content == b"<p>version 2</p>"
+    assert (changed.from_cache, changed.changed) == (False, True)
+    assert cache.stats() == {"fresh_hits": 0, "revalidated": 1, "downloads": 2}
+    cache.close()
+
+
+def test_last_modified_is_sent_back(tmp_path, local_site):
+    base, routes, log = local_site
+    date = "Wed, 03 Jan 2024 10:00:00 GMT"
+    routes["/offres?page=1"] = lambda handler: (
+        (304, {}, b"") if handler.headers.get("If-Modified-Since") == date
+        else (200, {"Last-Modified": date}, b"<p>page</p>")
+    )
+
+    cache = make_cache(tmp_path, ttl=0)
+    with requests.Session() as session:
+        fetch(cache, session, base + "/offres")
+        response = fetch(cache, session, base + "/offres")
+
+    assert response.content == b"<p>page</p>" and response.from_cache
+    assert cache.revalidated == 1
+    cache.close()
+
+
+def test_errors_are_not_cached(tmp_path, local_site):
+    base, routes, log = local_site
+    routes["/offres?page=1"] = lambda handler: (404, {}, b"introuvable")
+
+    cache = make_cache(tmp_path)
+    with requests.Session() as session:
+        responses = [fetch(cache, session, base + "/offres") for _ in range(2)]
+
+    assert [response.status_code for response in responses] == [404, 404]
+    assert not any(response.from_cache for response in responses)
+    assert len(log) == 2
+    assert list(cache.pages()) == []
+    cache.close()
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path, local_site):
+    base, routes, log = local_site
+    for page in range(1, 5):
+        # Contenus aléatoires : peu compressibles, environ 4 Ko chacun sur disque
+        routes[f"/offres?page={page}"] = lambda handler, body=random.Random(page).randbytes(4000): (200, {}, body)
+
+    cache = make_cache(tmp_path, max_bytes=3 * 4096)
+    with requests.Session() as session:
+        for page in (1, 2, 3):
+            fetch(cache, session, base + "/offres", page)
+        # La page 1 est relue : la page 2 devient la moins récemment utilisée
+        fetch(cache, session, base + "/offres", 1)
+        fetch(cache, session, base + "/offres", 4)
+
+    urls = [url for url, _ in cache.pages()]
+    assert base + "/offres?page=2" not in urls
+    assert base + "/offres?page=1" in urls and base + "/offres?page=4" in urls
+    cache.close()
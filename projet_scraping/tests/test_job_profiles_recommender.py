@@ -0,0 +1,75 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from job_profiles_recommender import JobProfilesRecommender
+
+
+def baseline_recommend_profiles(job_profiles, skills=None, sector=None, experience_level=None, top_n=3):
+    # Recommandation d'origine : score de chaque profil par parcours complet du catalogue
+    scores = {}
+    for profile_name, profile_data in job_profiles.items():
+        score = 0
+        if skills:
+            skills_list = [skill.lower() for skill in skills]
+            profile_skills = [skill.lower() for skill in profile_data['skills_required']]
+            score += len(set(skills_list).intersection(set(profile_skills))) * 2
+        if sector:
+            sector_lower = sector.lower()
+            if 'sector' in profile_data and any(s.lower() == sector_lower for s in profile_data['sector']):
+                score += 3
+            elif sector_lower in profile_name.lower() or sector_lower in profile_data['description'].lower():
+                score += 1
+        if experience_level:
+            exp_level = experience_level.lower()
+            career = ' '.join(profile_data['career_path']).lower()
+            if exp_level == 'junior' and 'junior' in career:
+                score += 1
+            elif exp_level == 'senior' and 'senior' in career:
+                score += 1
+            elif exp_level == 'manager' and any(role in career for role in ['manager', 'lead', 'head', 'chief']):
+                score += 1
+        scores[profile_name] = score
+
+    sorted_profiles = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    top_profiles = [profile for profile, score in sorted_profiles[:top_n] if score > 0]
+    return top_profiles or list(job_profiles.keys())[:top_n]
+
+
+@pytest.fixture(scope='module')
+def recommender():
+    return JobProfilesRecommender()
+
+
+def candidate_skills(recommender):
+    profiles = list(recommender.job_profiles.values())
+    return [
+        None,
+        ['Python', 'SQL', 'Machine Learning'],
+        profiles[0]['skills_required'][:2] + profiles[-1]['skills_required'][:1],
+        ['excel', 'COMPTABILITÉ', 'Inconnue'],
+        [skill.upper() for skill in profiles[len(profiles) // 2]['skills_required']],
+    ]
+
+
+def test_recommendations_match_baseline(recommender):
+    sectors = [None, 'IT', 'Finance', 'data', 'banque']
+    levels = [None, 'junior', 'senior', 'manager']
+    for skills, sector, level, top_n in itertools.product(candidate_skills(recommender), sectors, levels, [1, 3, 5]):
+        expected = baseline_recommend_profiles(recommender.job_profiles, skills, sector, level, top_n)
+        assert recommender.recommend_profiles(skills, sector, level, top_n) == expected
+
+
+def test_batch_recommendations_match_single_calls(recommender):
+    skills_lists = candidate_skills(recommender) * 3
+    for sector, level in [(None, None), ('Finance', 'senior'), ('IT', 'junior')]:
+        batch = recommender.recommend_profiles_batch(skills_lists, sector, level, top_n=4, batch_size=4)
+        assert batch == [recommender.recommend_profiles(skills, sector, level, 4) for skills in skills_lists]
+
+
+def test_sector_mentions_under_concurrent_eviction(recommender):
+    sectors = [f'secteur {i}' for i in range(3000)] + ['data', 'finance']
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(recommender._profiles_mentioning, sectors * 2))
+    assert all(isinstance(profiles, list) for profiles in results)
@@ -0,0 +1,97 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import market_cube
+from data_store import get_dataset, invalidate_dataset, prepare_dataframe
+from market_cube import MarketCube, build_market_cube, get_market_cube
+
+
+def offers(n, seed=0):
+    rng = np.random.default_rng(seed)
+    skills = ['Python', 'SQL', 'Excel', 'Java', 'Comptabilité']
+    return pd.DataFrame({
+        'Id': range(n),
+        'Secteur': rng.choice(['IT', 'Finance', 'RH'], n),
+        'Ville': rng.choice(['Rabat', 'Casablanca', None], n),
+        'Contrat': rng.choice(['CDI', 'CDD', 'Stage'], n),
+        'Experience': rng.choice([0, 1, 2, 5, np.nan], n),
+        'Date_De_Publication': rng.choice(['2023-03-01', '2024-06-15', '2025-01-10', None], n),
+        'Competences': [', '.join(rng.choice(skills, 2, replace=False)) for _ in range(n)],
+    })
+
+
+def load(csv_path):
+    return prepare_dataframe(pd.read_csv(csv_path))
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    invalidate_dataset()
+    market_cube._cubes.clear()
+    csv_path = str(tmp_path / 'offres.csv')
+    offers(300).to_csv(csv_path, index=False)
+    yield csv_path
+    invalidate_dataset()
+    market_cube._cubes.clear()
+
+
+def test_cube_matches_filtered_frame(dataset):
+    df = get_dataset(dataset, loader=load)
+    cube = get_market_cube(df)
+
+    for secteur in [None, 'IT', 'Finance']:
+        for annee in [None, 2024]:
+            filtered = df
+            if secteur is not None:
+                filtered = filtered[filtered['Secteur'] == secteur]
+            if annee is not None:
+                filtered = filtered[filtered['Annee'] == annee]
+            cells = cube.select(Secteur=secteur, Annee=annee)
+
+            assert cube.total(cells) == len(filtered)
+            assert cube.mean_experience(cells) == pytest.approx(filtered['Experience'].mean())
+            expected = filtered['Ville'].value_counts()
+            assert cube.value_counts('Ville', cells).to_dict() == expected[expected > 0].to_dict()
+            counter = Counter(s.strip() for skills in filtered['Competences'] for s in skills.split(','))
+            assert dict(cube.top_skills(10, cells)) == dict(counter.most_common(10))
+
+
+def test_filtered_subset_gets_its_own_cube(dataset):
+    df = get_dataset(dataset, loader=load)
+    full = get_market_cube(df)
+    subset = df[df['Secteur'] == 'IT']
+
+    cube = get_market_cube(subset)
+    assert cube is not full
+    assert cube.total() == len(subset)
+    assert get_market_cube(df.reset_index(drop=True)) is full
+    assert get_market_cube(df.iloc[::-1]).total() == len(df)
+
+
+def test_only_appended_rows_extend_the_cube(dataset):
+    df = load(dataset)
+    df.attrs['dataset_version'] = f'{dataset}:1:1'
+    cube = build_market_cube(df)
+
+    longer = pd.concat([offers(300), offers(20, seed=1)], ignore_index=True)
+    assert cube.extends(prepare_dataframe(longer.copy()))
+
+    for edit in (lambda d: d.drop(index=150), lambda d: d.iloc[[1, 0] + list(range(2, len(d)))]):
+        assert not cube.extends(prepare_dataframe(edit(longer).reset_index(drop=True)))
+
+    edited = longer.copy()
+    edited.loc[150, 'Contrat'] = 'Freelance'
+    assert not cube.extends(prepare_dataframe(edited))
+
+    # Nouvelle version : seules les offres ajoutées sont agrégées, avec le même résultat
+    prepared = prepare_dataframe(longer.copy())
+    prepared.attrs['dataset_version'] = f'{dataset}:2:2'
+    updated = build_market_cube(prepared)
+    rebuilt = MarketCube.from_frame(prepared)
+    assert updated.n_rows == len(longer)
+    assert updated.value_counts('Contrat').to_dict() == rebuilt.value_counts('Contrat').to_dict()
+    assert updated.top_skills(5) == rebuilt.top_skills(5)
+    assert cube.n_rows == 300
@@ -0,0 +1,59 @@
+from http_cache import HttpCache, CachedResponse
+from parsers import BACKENDS, submit_parse
+
+PAGE = ('<html><body><div class="card-job" data-href="/offre-emploi-maroc/dev-42.html">'
+        '<h3>Développeur</h3><ul><li>Ville : <strong>Rabat</strong></li></ul>'
+        '<time datetime="2024-01-02"></time></div></body></html>').encode("utf-8")
+
+
+def test_parsed_results_are_cached_per_backend(tmp_path, monkeypatch):
+    cache = HttpCache(str(tmp_path / "cache"))
+    response = CachedResponse("https://www.emploi.ma/?page=1", 200, PAGE, "digest", False, True)
+    calls = []
+
+    import parsers
+    parse_page = parsers.parse_page
+    monkeypatch.setattr(parsers, "parse_page",
+                        lambda site, content, backend, **context: calls.append(backend) or
+                        parse_page(site, content, backend, **context))
+
+    for backend in BACKENDS * 2:
+        offers = submit_parse(response, "emploi.ma", cache, backend, secteur="IT").result()
+        assert offers[0]["Lien"] == "https://www.emploi.ma/offre-emploi-maroc/dev-42.html"
+        assert offers[0]["Ville"] == "Rabat"
+    cache.close()
+
+    # Chaque backend analyse la page une fois, puis son propre résultat est servi par le cache
+    assert calls == list(BACKENDS)
+
+
+def test_parser_version_is_part_of_the_cache_key(tmp_path, monkeypatch):
+    import parsers
+
+    cache = HttpCache(str(tmp_path / "cache"))
+    response = CachedResponse("https://www.emploi.ma/?page=1", 200, PAGE, "digest", False, True)
+    stale = [{"Lien": "ancienne règle"}]
+    monkeypatch.setattr(parsers, "PARSER_VERSION", "ancienne")
+    monkeypatch.setattr(parsers, "parse_page", lambda site, content, backend, **context: stale)
+    assert submit_parse(response, "emploi.ma", cache, "lxml", secteur="IT").result() == stale
+
+    # Règles modifiées : le résultat de l'ancienne version n'est pas réutilisé
+    monkeypatch.undo()
+    offers = submit_parse(response, "emploi.ma", cache, "lxml", secteur="IT").result()
+    cache.close()
+    assert offers[0]["Lien"] == "https://www.emploi.ma/offre-emploi-maroc/dev-42.html"
+
+
+def test_rekrute_ids_and_simulated_dates_are_stable():
+    from parsers import parse_page
+
+    page = ('<html><body><ul>'
+            '<li class="post-id"><a class="titreJob" href="/offre-1.html">Analyste | Casablanca</a></li>'
+            '<li class="post-id"><a class="titreJob" href="/offre-2.html">Auditeur | Rabat</a>'
+            '<em class="date"><span>02/01/2024</span></em></li>'
+            '</ul></body></html>').encode("utf-8")
+
+    runs = [parse_page("rekrute", page, backend, secteur="Finance") for backend in BACKENDS * 2]
+    assert all(run == runs[0] for run in runs)
+    assert runs[0][0]["id"] != runs[0][1]["id"]
+    assert runs[0][1]["Date_de_publication"] == "2024-01-02"
@@ -0,0 +1,80 @@
+import time
+import requests
+from politeness import PolitenessScheduler, parse_retry_after, polite_get
+
+
+def timed_waits(scheduler, urls):
+    start = time.monotonic()
+    for url in urls:
+        scheduler.wait(url)
+    return time.monotonic() - start
+
+
+def test_requests_are_spaced_per_host():
+    scheduler = PolitenessScheduler(rates={"a.test": (20, 2)}, default_rate=(20, 1), jitter=0)
+
+    # Rafale de 2 requêtes, puis une requête toutes les 50 ms
+    elapsed = timed_waits(scheduler, ["https://a.test/page"] * 8)
+    assert 0.28 <= elapsed < 0.6
+
+    # Deux sites différents ne partagent pas leur budget : l'ancienne pause fixe après
+    # chaque page les aurait ralentis ensemble
+    scheduler = PolitenessScheduler(rates={}, default_rate=(10, 1), jitter=0)
+    elapsed = timed_waits(scheduler, ["https://a.test/", "https://b.test/"] * 4)
+    assert 0.28 <= elapsed < 0.5
+
+
+def test_errors_slow_the_host_down_and_success_restores_the_rate():
+    scheduler = PolitenessScheduler(rates={"a.test": (10, 1)}, jitter=0)
+    scheduler.wait("https://a.test/")
+
+    scheduler.report("https://a.test/", 429, "0.3")
+    assert scheduler.backoff["a.test"] == 2
+    assert scheduler.delay("https://a.test/") >= 0.25
+    # Un autre site n'est pas bloqué
+    assert scheduler.delay("https://b.test/") == 0
+
+    scheduler.report("https://a.test/", 503)
+    assert scheduler.backoff["a.test"] == 4
+    scheduler.report("https://a.test/", 200)
+    scheduler.report("https://a.test/", 200)
+    assert scheduler.backoff["a.test"] == 1
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("n'importe quoi") is None
+    assert parse_retry_after(None) is None
+
+
+def test_polite_get_retries_where_the_single_get_gave_up(local_site):
+    base, routes, log = local_site
+    error = (503, {"Retry-After": "0.2"}, b"indisponible")
+    answers = iter([error, error, (200, {}, b"page")])
+    routes["/offres"] = lambda handler: next(answers)
+
+    # Ancien comportement : un seul requests.get, la page d'erreur est analysée telle quelle
+    assert requests.get(base + "/offres").status_code == 503
+
+    scheduler = PolitenessScheduler(rates={}, default_rate=(100, 1), jitter=0)
+    with requests.Session() as session:
+        start = time.monotonic()
+        response = polite_get(session, base + "/offres", scheduler, timeout=5)
+        elapsed = time.monotonic() - start
+
+    assert response.status_code == 200 and response.content == b"page"
+    assert elapsed >= 0.2
+    assert len(log) == 3
+
+
+def test_polite_get_returns_the_last_error_after_all_retries(local_site):
+    base, routes, log = local_site
+    routes["/offres"] = lambda handler: (502, {"Retry-After": "0"}, b"")
+
+    scheduler = PolitenessScheduler(rates={}, default_rate=(100, 1), jitter=0)
+    with requests.Session() as session:
+        response = polite_get(session, base + "/offres", scheduler, retries=2, timeout=5)
+
+    assert response.status_code == 502
+    assert len(log) == 3
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from search_index import SearchIndex, get_search_index
+
+TITLES = ['Développeur Java', 'Data Analyst', 'Chef de projet IT', 'Analyste financier', 'Data Engineer',
+          'Développeur Web Senior', 'Comptable', 'Chef de projet digital', None, 'Auditeur interne']
+
+
+def offers(n=200, seed=8):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Poste': rng.choice(np.array(TITLES, dtype=object), n),
+        'Entreprise': rng.choice(['Attijariwafa', 'OCP', 'Capgemini', None], n),
+        'Competences': rng.choice(['Python, SQL', 'Excel, Audit', 'Java, Spring', 'Data visualisation'], n),
+    })
+
+
+def baseline_search(df, term):
+    # Recherche d'origine (annalyse.py) : sous-chaîne de l'intitulé du poste, sans tenir compte de la casse
+    return set(np.flatnonzero(df['Poste'].str.contains(term, case=False, na=False)))
+
+
+def test_title_search_matches_substring_filter():
+    df = offers()
+    index = SearchIndex.from_frame(df, {'Poste': 1.0})
+    for term in ['Data', 'développeur', 'Analyst', 'chef de projet', 'Comptable', 'Senior', 'introuvable']:
+        assert set(index.search_all(term).tolist()) == baseline_search(df, term)
+
+    # Accents ignorés : 'developpeur' trouve aussi 'Développeur'
+    assert set(index.search_all('developpeur').tolist()) == baseline_search(df, 'développeur')
+
+
+def test_ranking_and_pages():
+    df = offers()
+    index = get_search_index(df)
+    assert get_search_index(df.copy()) is index
+
+    # Tous les champs sont indexés ; l'intitulé pèse plus que les compétences
+    results = index.search_all('data')
+    expected = set(np.flatnonzero(df['Poste'].str.contains('data', case=False, na=False)
+                                  | df['Competences'].str.contains('data', case=False)))
+    assert set(results.tolist()) == expected
+    in_title = df['Poste'].iloc[results].str.contains('Data', na=False).to_numpy()
+    assert in_title[:in_title.sum()].all()
+
+    pages = [index.search('data', page=page, per_page=7)[0] for page in range(1, len(results) // 7 + 2)]
+    assert np.concatenate(pages).tolist() == results.tolist()
+    assert index.search('data', page=1, per_page=7)[2] == len(results)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import get_dataset, invalidate_dataset, prepare_dataframe
+from sector_classifier import SECTOR_KEYWORDS, classify_sectors, get_sector_flags
+
+
+def baseline_is_in_sector(row, keywords):
+    # Classification d'origine (show_comparative_analysis) : une ligne à la fois avec df.apply
+    secteur = str(row['Secteur']).lower()
+    poste = str(row['Poste']).lower() if 'Poste' in row else ''
+    description = str(row['Description_Poste']).lower() if 'Description_Poste' in row else ''
+    for keyword in keywords:
+        if keyword.lower() in secteur or keyword.lower() in poste or keyword.lower() in description:
+            return True
+    return False
+
+
+def baseline_flags(df):
+    return pd.DataFrame({
+        flag: df.apply(lambda row: baseline_is_in_sector(row, keywords), axis=1).astype(bool)
+        for flag, keywords in SECTOR_KEYWORDS.items()
+    })
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(6)
+    n = 300
+    df = pd.DataFrame({
+        'Id': range(n),
+        'Secteur': rng.choice(['Informatique', 'Banque / Assurance', 'BTP', 'Santé', None], n),
+        'Poste': rng.choice(['Développeur Web', 'Auditeur interne', 'Chef de chantier', 'Data Analyst',
+                             'Infirmier', 'Digital Marketing', None], n),
+        'Description_Poste': rng.choice(['Travail sur le cloud', 'Trading de produits', '', None], n),
+        'Experience': rng.choice([0, 3], n),
+        'Date_De_Publication': ['2024-01-01'] * n,
+        'Competences': ['Python'] * n,
+    })
+    invalidate_dataset()
+    csv_path = str(tmp_path / 'offres.csv')
+    df.to_csv(csv_path, index=False)
+    yield get_dataset(csv_path, loader=lambda path: prepare_dataframe(pd.read_csv(path)))
+    invalidate_dataset()
+
+
+def test_flags_match_row_by_row_classification(dataset):
+    expected = baseline_flags(dataset)
+    assert classify_sectors(dataset).equals(expected)
+    assert get_sector_flags(dataset).equals(expected)
+
+    subset = dataset[dataset['Experience'] == 3]
+    assert get_sector_flags(subset).equals(expected.loc[subset.index])
+    relabelled = subset.reset_index(drop=True)
+    assert get_sector_flags(relabelled).equals(baseline_flags(relabelled))
+
+    without_description = dataset.drop(columns=['Description_Poste']).astype({'Secteur': object})
+    assert classify_sectors(without_description).equals(baseline_flags(without_description))
@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+from seen_store import SeenStore, new_offers
+
+
+def test_offer_listed_in_two_sectors_is_new_only_once(tmp_path):
+    store = SeenStore(str(tmp_path / "seen.npy"))
+    offers = [{"Lien": f"https://www.rekrute.com/offre-{i}.html"} for i in range(2000)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(lambda _: new_offers(store, "rekrute", offers), range(2)))
+
+    assert sum(len(fresh) for fresh in results) == len(offers)
+    assert new_offers(store, "rekrute", offers) == []
+
+
+def test_save_and_reload(tmp_path):
+    path = str(tmp_path / "seen.npy")
+    store = SeenStore(path)
+    offers = [{"Lien": "https://www.emploi.ma/offre-1.html"}, {"Lien": "ERROR"}]
+    assert new_offers(store, "emploi.ma", offers) == offers[:1]
+    store.save()
+
+    reloaded = SeenStore(path)
+    assert len(reloaded) == 1
+    assert new_offers(reloaded, "emploi.ma", offers) == []
+    assert new_offers(reloaded, "rekrute", offers) == offers[:1]
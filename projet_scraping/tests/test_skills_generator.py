@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from skills_generator import SkillsGenerator
+
+TITLES = ['Data Scientist', 'Développeur Java', 'Comptable', 'Ingénieur Cloud AWS', 'Auditeur financier',
+          'Responsable sécurité', 'Chef de projet', 'Software Engineer', 'Analyste crédit', '',
+          'Machine Learning Engineer', 'Contrôleur de gestion', 'Data Scientist']
+
+GENERIC_SKILLS = {'Communication', 'Problem Solving', 'Teamwork', 'Analytical Thinking',
+                  'Project Management', 'Time Management', 'Attention to Detail'}
+
+
+def baseline_find_closest_domain(generator, job_title):
+    # Résolution d'origine : un titre à la fois, sans cache
+    job_title = job_title.lower()
+    for domain in generator.domains:
+        if domain in job_title:
+            return domain
+    similarities = cosine_similarity(generator.vectorizer.transform([job_title]), generator.domain_matrix).flatten()
+    closest_idx = np.argmax(similarities)
+    if similarities[closest_idx] > 0.2:
+        return generator.domains[closest_idx]
+    return generator._keyword_domain(job_title)
+
+
+def offers():
+    return pd.DataFrame({
+        'Id': range(len(TITLES)),
+        'Poste': TITLES,
+        'Secteur': ['IT', 'IT', 'Finance', 'IT', 'Finance', 'IT', 'Finance', 'IT', 'Finance', 'Finance',
+                    'IT', 'Finance', 'IT'],
+        'Competences': [None, '', 'Excel, SAP'] + [None] * (len(TITLES) - 3),
+    })
+
+
+def test_batch_domains_match_baseline(tmp_path):
+    generator = SkillsGenerator()
+    queries = [title or 'finance' for title in TITLES]
+    assert generator.find_closest_domains(queries) == [baseline_find_closest_domain(generator, q) for q in queries]
+
+    # Cache persistant : une nouvelle instance retrouve les mêmes domaines depuis le disque
+    cache_path = str(tmp_path / 'domains.sqlite')
+    first = SkillsGenerator(cache_path=cache_path).find_closest_domains(queries)
+    reloaded = SkillsGenerator(cache_path=cache_path)
+    assert reloaded.find_closest_domains(queries) == first
+    assert reloaded.domain_cache.stats()['disk_hits'] > 0
+
+
+def test_batch_enrichment_matches_baseline_rules():
+    generator = SkillsGenerator()
+    df = generator.enrich_dataframe(offers())
+
+    assert df.loc[2, 'Competences'] == 'Excel, SAP'
+    for title, sector, skills in zip(df['Poste'], df['Secteur'], df['Competences']):
+        if skills == 'Excel, SAP':
+            continue
+        domain = baseline_find_closest_domain(generator, title or sector)
+        specific = [skill for skill in skills.split(', ') if skill not in GENERIC_SKILLS]
+        assert set(specific) <= set(generator.skills_database[domain]) | GENERIC_SKILLS
+        assert 5 <= len(specific) <= 8
+
+    # Avec une graine, le tirage ne dépend que de l'offre (pas du lot ni de l'ordre des lignes)
+    whole = SkillsGenerator(seed=3).enrich_dataframe(offers())
+    halves = pd.concat([SkillsGenerator(seed=3).enrich_dataframe(part) for part in (offers().iloc[7:], offers().iloc[:7])])
+    assert whole['Competences'].equals(halves.sort_index()['Competences'])
@@ -0,0 +1,65 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import get_dataset, get_row_positions, invalidate_dataset, prepare_dataframe
+from skills_matrix import SkillsMatrix, count_skills, top_skills
+
+
+def baseline_extract_all_skills(df):
+    # Comptage d'origine (utils.extract_all_skills) : une boucle Python par offre
+    all_skills = []
+    for skills_str in df['Competences'].dropna():
+        all_skills.extend(skill.strip() for skill in skills_str.split(','))
+    return Counter(all_skills)
+
+
+def offers(n, seed=0):
+    rng = np.random.default_rng(seed)
+    skills = ['Python', 'SQL', 'Excel', 'Java', 'Comptabilité', 'Audit', 'Docker']
+    return pd.DataFrame({
+        'Id': range(n),
+        'Secteur': rng.choice(['IT', 'Finance'], n),
+        'Experience': rng.choice([0, 2, 5], n),
+        'Date_De_Publication': rng.choice(['2023-03-01', '2024-06-15'], n),
+        'Competences': [', '.join(rng.choice(skills, rng.integers(1, 4), replace=False)) if i % 9 else None
+                        for i in range(n)],
+    })
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    invalidate_dataset()
+    csv_path = str(tmp_path / 'offres.csv')
+    offers(200).to_csv(csv_path, index=False)
+    yield get_dataset(csv_path, loader=lambda path: prepare_dataframe(pd.read_csv(path)))
+    invalidate_dataset()
+
+
+def test_counts_match_baseline(dataset):
+    assert count_skills(dataset) == baseline_extract_all_skills(dataset)
+    subset = dataset[dataset['Secteur'] == 'IT']
+    assert count_skills(subset) == baseline_extract_all_skills(subset)
+    assert dict(top_skills(subset, 3)) == dict(baseline_extract_all_skills(subset).most_common(3))
+
+    raw = offers(50, seed=3)
+    assert SkillsMatrix.from_skills(raw['Competences']).counter() == baseline_extract_all_skills(raw)
+
+
+def test_row_positions_only_for_proven_subsets(dataset):
+    subset = dataset[dataset['Secteur'] == 'IT']
+    assert np.array_equal(get_row_positions(subset), np.flatnonzero(dataset['Secteur'] == 'IT'))
+
+    # Index réinitialisé ou colonnes d'identification absentes : positions inconnues
+    assert get_row_positions(subset.reset_index(drop=True)) is None
+    assert get_row_positions(subset[['Secteur', 'Experience']]) is None
+
+    # Ligne modifiée au milieu du sous-ensemble
+    edited = subset.copy()
+    row = edited.index[len(edited) // 2]
+    edited.loc[row, 'Competences'] = 'Cobol'
+    edited.at[row, 'Competences_Liste'] = ['Cobol']
+    assert get_row_positions(edited) is None
+    assert count_skills(edited) == baseline_extract_all_skills(edited)
@@ -0,0 +1,92 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from ranking import top_n_items, top_n_rows
+from university_recommender import UniversityRecommender
+
+
+@pytest.fixture(scope='module')
+def recommender():
+    return UniversityRecommender()
+
+
+def baseline_top_n(scores, top_n):
+    # Sélection d'origine : tri complet des scores puis filtrage des scores positifs
+    sorted_items = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    return [key for key, score in sorted_items[:top_n] if score > 0]
+
+
+def test_partial_top_n_matches_full_sort(recommender):
+    rng = np.random.default_rng(5)
+    keys = [f'profil {i}' for i in range(40)]
+    order = {key: i for i, key in enumerate(keys)}
+    for _ in range(50):
+        scores = dict(zip(keys, rng.integers(-1, 4, len(keys)).tolist()))
+        matrix = np.array([list(scores.values())])
+        for top_n in (1, 3, 10, 60):
+            assert top_n_items(scores, top_n, order) == baseline_top_n(scores, top_n)
+            assert [keys[i] for i in top_n_rows(matrix, top_n)[0]] == baseline_top_n(scores, top_n)
+
+    programs = recommender.get_all_programs()
+    skills_lists = [None, ['Python', 'SQL'], next(iter(programs.values()))['skills_developed'][:3]]
+    for skills, goal, top_n in itertools.product(skills_lists, [None, 'data', 'analyste'], [1, 3]):
+        assert recommender.recommend_programs(skills, goal, top_n) == \
+            recommender.recommend_programs_batch([skills], goal, top_n)[0]
+
+
+def baseline_market_aligned_programs(programs, market_trends):
+    # Alignement d'origine : recherche de chaque tendance dans les compétences de chaque filière
+    if not market_trends:
+        return list(programs.keys())[:3]
+    scores = {}
+    for program_name, program_data in programs.items():
+        program_skills = ' '.join(skill.lower() for skill in program_data['skills_developed'])
+        scores[program_name] = sum(weight for trend, weight in market_trends.items() if trend.lower() in program_skills)
+    return [program for program, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:3]]
+
+
+def test_market_alignment_matches_baseline(recommender):
+    programs = recommender.get_all_programs()
+    skills = sorted({skill for data in programs.values() for skill in data['skills_developed']})
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        trends = {skill: int(weight) for skill, weight in
+                  zip(rng.choice(skills, 6, replace=False), rng.integers(1, 50, 6))}
+        trends['Python'] = 7
+        trends['inexistante'] = 100
+        assert recommender.get_market_aligned_programs(trends) == baseline_market_aligned_programs(programs, trends)
+    assert recommender.get_market_aligned_programs({}) == baseline_market_aligned_programs(programs, {})
+
+
+def baseline_recommend_modules(programs, skills=None, program=None):
+    # Recommandation d'origine : modules de toutes les filières partageant une compétence
+    if program and program in programs:
+        return programs[program]['modules']
+    recommended_modules = set()
+    if skills:
+        skills_lower = [skill.lower() for skill in skills]
+        for program_data in programs.values():
+            program_skills = [skill.lower() for skill in program_data['skills_developed']]
+            if any(skill in program_skills for skill in skills_lower):
+                recommended_modules.update(program_data['modules'])
+    return list(recommended_modules)
+
+
+def test_module_index_matches_baseline(recommender):
+    programs = recommender.get_all_programs()
+    names = list(programs)
+    skills_lists = [None, [], ['Python'], ['SQL', 'statistiques', 'Inconnue'],
+                    programs[names[0]]['skills_developed'][:2] + programs[names[-1]]['skills_developed'][:1]]
+    for skills in skills_lists:
+        modules = recommender.recommend_modules(skills)
+        assert set(modules) == set(baseline_recommend_modules(programs, skills))
+        assert len(modules) == len(set(modules))
+
+        # Classement par pertinence décroissante
+        scored = recommender.recommend_modules(skills, with_scores=True)
+        assert [module for module, _ in scored] == modules
+        assert [score for _, score in scored] == sorted((score for _, score in scored), reverse=True)
+
+    assert recommender.recommend_modules(['Python'], names[1]) == baseline_recommend_modules(programs, ['Python'], names[1])